@@ -3,12 +3,14 @@ import streamlit as st
 from utils.config import Config
 from utils.corpus_api import CorpusAPI
 from utils.storage import Storage
-from utils.ai_modules import AIModule
-from PIL import Image
+from utils import metrics
 import base64
-from streamlit_folium import st_folium
-import folium
+from contextlib import closing
+import time
 import logging
+# The model and mapping stacks (utils.ai_modules, folium) are imported by the
+# pages that use them, so the auth sidebar renders without loading them; PIL and
+# numpy likewise load on the first image decode or semantic search
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -17,7 +19,16 @@ logger = logging.getLogger(__name__)
 # Initialize modules
 config = Config()
 storage = Storage()
-ai_module = AIModule()
+# Shares the process-wide connection pool with Storage's client
+corpus_api = storage.api or CorpusAPI()
+if config.get_app_config()["metrics_port"]:
+    metrics.serve(config.get_app_config()["metrics_port"])
+
+@st.cache_resource
+def get_ai_module():
+    """Itinerary generator, built on the first planner request and kept across reruns"""
+    from utils.ai_modules import AIModule
+    return AIModule(storage)
 
 def init_session_state():
     """Initialize session state variables"""
@@ -56,8 +67,7 @@ def render_otp_flow():
 def handle_send_otp(contact: str):
     """Handle OTP sending"""
     try:
-        api = CorpusAPI()
-        resp = api.send_otp(contact)
+        resp = corpus_api.send_otp(contact)
         st.session_state.auth["contact"] = contact
         st.sidebar.success("OTP sent — check your SMS/email.")
         logger.info(f"OTP sent to {contact}")
@@ -68,8 +78,7 @@ def handle_send_otp(contact: str):
 def handle_verify_otp(otp: str):
     """Handle OTP verification"""
     try:
-        api = CorpusAPI()
-        resp = api.verify_otp(st.session_state.auth.get("contact"), otp)
+        resp = corpus_api.verify_otp(st.session_state.auth.get("contact"), otp)
         token = resp.get("access_token") or resp.get("token")
         
         if token:
@@ -87,6 +96,74 @@ def handle_verify_otp(otp: str):
         st.sidebar.error(f"Verify failed: {str(e)}")
         logger.error(f"OTP verification failed: {str(e)}")
 
+def render_itinerary(city: str, days: int, interests: list, budget: str, season: str) -> str:
+    """Stream a generated itinerary into the page as chunks arrive"""
+    placeholder = st.empty()
+    text = ""
+    with st.spinner("Planning your trip..."):
+        # A rerun or disconnect raises out of this loop; closing stops generation
+        with closing(get_ai_module().generate_itinerary_stream(city, days, interests, budget, season)) as stream:
+            for chunk in stream:
+                text += chunk
+                placeholder.markdown(text)
+    st.session_state.itinerary.append({
+        "start": city,
+        "days": days,
+        "interests": interests,
+        "budget": budget,
+        "plan": text
+    })
+    return text
+
+def render_place_card(place: dict):
+    """Render a place with its card-sized thumbnail instead of the full upload"""
+    thumbnail = storage.thumbnail_path(place, width=320)
+    if thumbnail is not None:
+        st.image(str(thumbnail), width=320)
+    elif place.get("image_url"):
+        st.image(place["image_url"], width=320)
+    st.subheader(place["name"])
+    st.caption(f"{place.get('category', '')} · {place.get('district', '')}")
+    st.write(place.get("description", ""))
+
+def render_map(south: float, west: float, north: float, east: float, zoom: int):
+    """Render the viewport's places, clustered server-side so the map payload stays bounded"""
+    import folium
+    from streamlit_folium import st_folium
+    view = storage.map_markers(south, west, north, east, zoom)
+    fmap = folium.Map(location=[(south + north) / 2, (west + east) / 2], zoom_start=zoom)
+    for marker in view["markers"]:
+        folium.Marker([marker["lat"], marker["lon"]], tooltip=marker["name"]).add_to(fmap)
+    for cluster in view["clusters"]:
+        folium.CircleMarker(
+            [cluster["lat"], cluster["lon"]],
+            radius=min(30, 6 + cluster["count"] ** 0.5),
+            tooltip=f"{cluster['count']} places",
+            fill=True
+        ).add_to(fmap)
+    return st_folium(fmap, height=500, returned_objects=["bounds", "zoom"])
+
+def render_visitor_stats():
+    """Admin dashboard backed by the precomputed aggregate tables"""
+    stats = storage.visitor_stats()
+    cols = st.columns(3)
+    cols[0].metric("Feedback", stats["feedback_total"])
+    cols[1].metric("Positive", stats["by_sentiment"].get("Positive", 0))
+    cols[2].metric("Itineraries", stats["itinerary_total"])
+    st.subheader("Most reviewed places")
+    st.table(stats["top_places"])
+    st.subheader("Feedback per day")
+    st.bar_chart({d["day"]: d["count"] for d in stats["feedback_per_day"]})
+    st.subheader("Popular interests")
+    st.bar_chart({i["value"]: i["count"] for i in stats["interests"]})
+
+def render_metrics_panel():
+    """Admin view of per-call latency, counts and error rates"""
+    st.subheader("Latency by call site")
+    st.dataframe(metrics.registry.summary(), use_container_width=True)
+    st.download_button("Download Prometheus metrics", metrics.registry.prometheus_text(),
+                       file_name="metrics.prom", mime="text/plain")
+
 # [Rest of the application code with similar improvements...]
 # Each main section (Explore Places, Add Place, etc.) should be
 # broken into separate functions/modules
\ No newline at end of file
@@ -0,0 +1,168 @@
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple, Union
+import streamlit as st
+from utils.storage import Storage
+
+DISTRICTS = ["Hyderabad", "Warangal", "Mulugu", "Nalgonda", "Adilabad", "Khammam", "Nizamabad", "Karimnagar"]
+CATEGORIES = ["Heritage", "Nature", "Religious", "Adventure"]
+SEASONS = ["Winter", "Summer", "Monsoon", "All"]
+BUDGETS = ["Low", "Medium", "High"]
+REMARKS = ["Beautiful and peaceful", "Too crowded on weekends", "Worth the drive", "Dirty but the view was great",
+           "Guides were friendly", "Overpriced tickets", "Stunning at sunset", "Nothing special"]
+WORDS = ("fort temple lake falls museum palace garden hill cave stupa ruins tomb mosque dam "
+         "wildlife sanctuary forest bazaar bridge step well kakatiya qutb shahi nizam").split()
+
+
+def configure_secrets(data_dir: Union[str, Path], **secrets) -> Dict[str, Any]:
+    """Point Config at in-memory secrets and a scratch data directory"""
+    values = {
+        "semantic_search": False,
+        "corpus": {"use_api": False},
+        "ai": {"use_hf_inference": False, "local_fallback": False},
+        # Benchmarks repeat calls far faster than any visitor; limits would only add rejections
+        "rate_limits": {"enabled": False}
+    }
+    values.update(secrets)
+    st.secrets = values
+    os.environ["DATA_DIR"] = str(data_dir)
+    return values
+
+
+def isolated_storage(data_dir: Union[str, Path], **secrets) -> Storage:
+    """Storage backed by a scratch directory, independent of the app's secrets.toml"""
+    configure_secrets(data_dir, **secrets)
+    Storage._cache = None
+    return Storage()
+
+
+def synthetic_places(n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Deterministic fake places spread over Telangana's bounding box"""
+    rng = random.Random(seed)
+    # A long tail of filler words keeps term frequencies closer to real prose
+    filler = ["".join(rng.choice("aeioubdghklmnprstv") for _ in range(rng.randint(4, 9))) for _ in range(5000)]
+    places = []
+    for i in range(n):
+        name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}"
+        places.append({
+            "id": f"place-{i}",
+            "name": name,
+            "district": rng.choice(DISTRICTS),
+            "category": rng.choice(CATEGORIES),
+            "season": rng.choice(SEASONS),
+            "description": " ".join(rng.choice(WORDS) if rng.random() < 0.1 else rng.choice(filler)
+                                    for _ in range(20)),
+            "lat": round(rng.uniform(15.8, 19.9), 6),
+            "lon": round(rng.uniform(77.2, 81.3), 6),
+            "image_url": ""
+        })
+    return places
+
+
+def synthetic_feedback(n: int, places: List[Dict[str, Any]], seed: int = 11) -> List[Dict[str, Any]]:
+    """Deterministic visitor remarks about the given places, spread over the last 90 days"""
+    rng = random.Random(seed)
+    return [{
+        "place": rng.choice(places)["name"],
+        "feedback": f"{rng.choice(REMARKS)} ({i})",
+        "sentiment": rng.choice(["Positive", "Neutral", "Negative"]),
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(time.time() - rng.uniform(0, 90 * 86400)))
+    } for i in range(n)]
+
+
+def synthetic_itineraries(n: int, seed: int = 13) -> List[Dict[str, Any]]:
+    """Deterministic saved trips with comma-joined interests, as the planner stores them"""
+    rng = random.Random(seed)
+    return [{
+        "start": rng.choice(DISTRICTS),
+        "days": rng.randint(1, 7),
+        "interests": ",".join(rng.sample(CATEGORIES, rng.randint(1, 3))),
+        "budget": rng.choice(BUDGETS),
+        "plan": f"Day 1: {rng.choice(WORDS).title()} ({i})",
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(time.time() - rng.uniform(0, 90 * 86400)))
+    } for i in range(n)]
+
+
+def seed_places(storage: Storage, places: List[Dict[str, Any]]):
+    """Bulk-insert places directly, bypassing per-row validation"""
+    columns = ["id", "name", "district", "category", "season", "description", "lat", "lon", "image_url"]
+    with storage.db.connection() as conn, storage.deferred_place_indexing(conn):
+        conn.executemany(
+            f"INSERT OR IGNORE INTO places ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [tuple(p[c] for c in columns) for p in places]
+        )
+    storage._cache.invalidate()
+
+
+def seed_rows(storage: Storage, table: str, rows: List[Dict[str, Any]]):
+    """Bulk-insert feedback or itineraries in one transaction (stats triggers still fire)"""
+    if not rows:
+        return
+    columns = list(rows[0])
+    with storage.db.connection() as conn:
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [tuple(row[c] for c in columns) for row in rows]
+        )
+    storage._cache.invalidate()
+
+
+def stub_corpus(routes: Dict[Tuple[str, str], Tuple[int, Any]], latency_ms: float = 0) -> ThreadingHTTPServer:
+    """Local stand-in for the Corpus API answering JSON after a fixed delay; call shutdown() when done"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body leave in one segment, so Nagle/delayed-ACK stalls do not swamp the injected latency
+        wbufsize = 1 << 16
+        disable_nagle_algorithm = True
+
+        def _dispatch(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            status, body = routes.get((self.command, self.path.split("?")[0]), (404, {"detail": "not found"}))
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = _dispatch
+        do_POST = _dispatch
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def samples(fn: Callable, repeat: int = 5, warmup: int = 1) -> List[float]:
+    """Wall time of each of `repeat` calls in milliseconds, after `warmup` untimed calls"""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def timed(fn: Callable, repeat: int = 5) -> float:
+    """Best-of-N wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
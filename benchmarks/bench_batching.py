@@ -0,0 +1,71 @@
+"""Local-generation throughput (prompts/sec) against caller concurrency, with and without micro-batching.
+
+By default a stub pipeline models a padded batch as a fixed per-call cost
+plus a small per-prompt cost; pass --model to drive the real FLAN-T5 pipeline.
+
+    python -m benchmarks.bench_batching --concurrency 1 4 16 --prompts 64
+"""
+import argparse
+import threading
+import time
+from typing import Any, Dict, Optional
+from utils.local_model import LocalModel
+
+
+def _stub_loader(per_call_ms: float, per_prompt_ms: float):
+    def loader(model_name):
+        def pipeline(prompts, **kwargs):
+            time.sleep((per_call_ms + per_prompt_ms * len(prompts)) / 1000)
+            return [{"generated_text": f"Day 1: {p[:16]}"} for p in prompts]
+        return pipeline
+    return loader
+
+
+def _drive(model: LocalModel, concurrency: int, prompts: int) -> float:
+    per_worker = max(prompts // concurrency, 1)
+
+    def worker(n):
+        for i in range(per_worker):
+            model.generate(f"Plan a {i % 5 + 1}-day trip from city {n}", timeout=600)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return round(per_worker * concurrency / (time.perf_counter() - start), 2)
+
+
+def run(concurrency=(1, 2, 4, 8, 16), prompts: int = 64, max_batch_size: int = 8, max_wait_ms: float = 25,
+        model: Optional[str] = None, per_call_ms: float = 200, per_prompt_ms: float = 15) -> Dict[str, Any]:
+    loader = None if model else _stub_loader(per_call_ms, per_prompt_ms)
+    results = {}
+    for label, batch_size in (("unbatched", 1), ("batched", max_batch_size)):
+        kwargs = {"batch_max_size": batch_size, "batch_max_wait_ms": max_wait_ms, "batch_queue_depth": 1024}
+        if loader:
+            kwargs["loader"] = loader
+        local = LocalModel(model or "stub", **kwargs)
+        local.get()
+        for n in concurrency:
+            results[f"{label}/concurrency={n}"] = {"prompts_per_sec": _drive(local, n, prompts)}
+        results[f"{label}/batching"] = local.batcher.stats()
+        local.batcher.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--prompts", type=int, default=64)
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=25)
+    parser.add_argument("--model", default=None)
+    args = parser.parse_args()
+
+    for name, row in run(args.concurrency, args.prompts, args.max_batch_size, args.max_wait_ms, args.model).items():
+        print(name, " ".join(f"{k}={v}" for k, v in row.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Bulk CSV/JSONL import and export throughput vs. one save_place per row.
+
+    python -m benchmarks.bench_bulk --rows 10000 100000 --baseline-rows 2000
+"""
+import argparse
+import csv
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+from utils.bulk import PLACE_COLUMNS, BulkLoader
+from ._support import isolated_storage, synthetic_places
+
+
+def _write_inputs(tmp: Path, n: int) -> Dict[str, Path]:
+    places = synthetic_places(n)
+    paths = {"csv": tmp / "places.csv", "jsonl": tmp / "places.jsonl"}
+    with open(paths["csv"], "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=PLACE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(places)
+    with open(paths["jsonl"], "w") as f:
+        f.writelines(json.dumps(p) + "\n" for p in places)
+    return paths
+
+
+def run(rows=(10_000, 100_000), baseline_rows: int = 2000) -> Dict[str, Any]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = isolated_storage(Path(tmp) / "baseline")
+        places = synthetic_places(baseline_rows)
+        start = time.perf_counter()
+        for place in places:
+            storage.save_place(dict(place))
+        results[f"save_place/rows={baseline_rows}"] = {
+            "rows_per_sec": round(baseline_rows / (time.perf_counter() - start), 1)
+        }
+        storage.db.close()
+
+    for n in rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            inputs = _write_inputs(Path(tmp), n)
+            for fmt, path in inputs.items():
+                loader = BulkLoader(isolated_storage(Path(tmp) / f"data-{fmt}"))
+                imported = loader.import_file(path)
+                exported = loader.export_file(Path(tmp) / f"export.{fmt}")
+                results[f"{fmt}/rows={n}"] = {
+                    "import_rows_per_sec": imported["rows_per_sec"],
+                    "export_rows_per_sec": exported["rows_per_sec"],
+                    "errors": imported["error_count"]
+                }
+                loader.storage.db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--baseline-rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'case':<28}{'import rows/s':>16}{'export rows/s':>16}")
+    for name, row in run(args.rows, args.baseline_rows).items():
+        print(f"{name:<28}{row.get('import_rows_per_sec', row.get('rows_per_sec')):>16}"
+              f"{row.get('export_rows_per_sec', '-'):>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""CPU-bound throughput and script-thread responsiveness, inline vs. the TaskExecutor process pool.
+
+Each simulated session is a thread that, like a Streamlit script run, submits
+tasks one after another. A heartbeat thread sleeping 5 ms at a time stands in
+for the other sessions' script threads: its lag is how long the GIL kept
+them waiting. Throughput can only scale up to the machine's core count.
+
+    python -m benchmarks.bench_executor --workers 1 2 4 --sessions 8 --tasks 4
+"""
+import argparse
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from utils.executor import TaskExecutor
+from utils.images import render_variants
+from utils.validators import Validators
+from .bench_images import synthetic_photo
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 1)
+
+
+def workloads(megapixels: float) -> Dict[str, Tuple[Callable, tuple]]:
+    """Picklable (fn, args) pairs: thumbnailing an upload and fully decoding one"""
+    photo = synthetic_photo(megapixels)
+    return {
+        f"thumbnails/{megapixels}MP": (render_variants, (photo, (160, 320, 640), ("webp", "jpeg"))),
+        f"decode/{megapixels}MP": (Validators.decode_image, (photo,))
+    }
+
+
+def _heartbeat(stop: threading.Event, lags: List[float], interval: float = 0.005):
+    while not stop.is_set():
+        start = time.perf_counter()
+        time.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+
+def measure(executor: TaskExecutor, fn: Callable, args: tuple, sessions: int, tasks: int) -> Dict[str, Any]:
+    """Run `sessions` threads of `tasks` sequential submissions each"""
+    executor.run(TaskExecutor.CPU, fn, *args)  # start the workers outside the timing
+    latencies: List[float] = []
+    lags: List[float] = []
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(stop, lags), daemon=True)
+
+    def session():
+        for _ in range(tasks):
+            start = time.perf_counter()
+            executor.run(TaskExecutor.CPU, fn, *args)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    heartbeat.start()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    stop.set()
+    heartbeat.join()
+    return {
+        "tasks_per_sec": round(sessions * tasks / seconds, 1),
+        "task_p95_ms": _percentile(latencies, 0.95),
+        "heartbeat_p95_lag_ms": _percentile(lags, 0.95),
+        "heartbeat_max_lag_ms": round(max(lags), 1)
+    }
+
+
+def run(workers: Sequence[int] = (1, 2, 4), sessions: int = 8, tasks: int = 4,
+        megapixels: float = 4) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"cpus": os.cpu_count()}
+    for name, (fn, args) in workloads(megapixels).items():
+        for count in (0, *workers):
+            executor = TaskExecutor(cpu_workers=count, max_pending=sessions * 2)
+            try:
+                label = "inline" if count == 0 else f"pool={count}"
+                results[f"{name}/{label}"] = measure(executor, fn, args, sessions, tasks)
+            finally:
+                executor.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=4, help="tasks each session submits in turn")
+    parser.add_argument("--megapixels", type=float, default=4)
+    args = parser.parse_args()
+
+    results = run(args.workers, args.sessions, args.tasks, args.megapixels)
+    print(f"cpus: {results.pop('cpus')}")
+    print(f"{'case':<30}{'tasks/s':>10}{'task p95 ms':>14}{'lag p95 ms':>12}{'lag max ms':>12}")
+    for name, row in results.items():
+        print(f"{name:<30}{row['tasks_per_sec']:>10}{row['task_p95_ms']:>14}"
+              f"{row['heartbeat_p95_lag_ms']:>12}{row['heartbeat_max_lag_ms']:>12}")
+
+
+if __name__ == "__main__":
+    main()
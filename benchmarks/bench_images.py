@@ -0,0 +1,71 @@
+"""Bytes served per place card and thumbnail cost, original upload vs. pipeline output.
+
+    python -m benchmarks.bench_images --megapixels 1 4 12 --card-width 320
+"""
+import argparse
+import io
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+import numpy as np
+from PIL import Image
+from utils.images import ImagePipeline, render_variants
+from utils.validators import Validators
+from ._support import timed
+
+
+def synthetic_photo(megapixels: float, seed: int = 3) -> bytes:
+    """Smooth gradients plus sensor-like noise, so JPEG sizes resemble real photos"""
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([x * 255 / width, y * 255 / height, (x + y) * 127 / (width + height)], axis=-1)
+    pixels = np.clip(base + rng.normal(0, 12, base.shape), 0, 255).astype(np.uint8)
+    out = io.BytesIO()
+    Image.fromarray(pixels).save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+def _full_decode_thumbnail(data: bytes, width: int) -> bytes:
+    """The pre-pipeline path: validate_image's full RGB decode, then resize"""
+    img = Validators.validate_image(data, max_size=len(data))
+    img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=80)
+    return out.getvalue()
+
+
+def run(megapixels=(1, 4, 12), card_width: int = 320) -> Dict[str, Any]:
+    results = {}
+    for mp in megapixels:
+        data = synthetic_photo(mp)
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = ImagePipeline(Path(tmp), max_size=len(data)).ingest(data)
+        card = f"{min(w for w in manifest['widths'] if w >= card_width)}"
+        results[f"{mp}MP"] = {
+            "original_kb": round(len(data) / 1024, 1),
+            "card_webp_kb": round(manifest["files"][f"{card}.webp"] / 1024, 1),
+            "card_jpeg_kb": round(manifest["files"][f"{card}.jpeg"] / 1024, 1),
+            "full_decode_ms": timed(lambda: _full_decode_thumbnail(data, card_width), repeat=3),
+            "draft_all_variants_ms": timed(
+                lambda: render_variants(data, (160, 320, 640), ("webp", "jpeg")), repeat=3
+            )
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megapixels", type=float, nargs="+", default=[1, 4, 12])
+    parser.add_argument("--card-width", type=int, default=320)
+    args = parser.parse_args()
+
+    print(f"{'image':<8}{'orig KB':>10}{'webp KB':>10}{'jpeg KB':>10}{'full ms':>10}{'draft ms':>10}")
+    for name, row in run(args.megapixels, args.card_width).items():
+        print(f"{name:<8}{row['original_kb']:>10}{row['card_webp_kb']:>10}{row['card_jpeg_kb']:>10}"
+              f"{row['full_decode_ms']:>10}{row['draft_all_variants_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
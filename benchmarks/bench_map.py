@@ -0,0 +1,57 @@
+"""Map rendering: one marker per loaded place vs. viewport-bounded, clustered markers.
+
+    python -m benchmarks.bench_map --rows 1000 10000 100000
+"""
+import argparse
+import json
+import tempfile
+from typing import Any, Dict
+from ._support import isolated_storage, seed_places, synthetic_places, timed
+
+# (name, south, west, north, east, zoom)
+VIEWS = [
+    ("state", 15.8, 77.2, 19.9, 81.3, 7),
+    ("district", 17.2, 78.2, 17.6, 78.7, 10),
+    ("street", 17.36, 78.46, 17.38, 78.49, 15),
+]
+
+
+def run(rows=(1000, 10_000, 100_000)) -> Dict[str, Any]:
+    results = {}
+    for n in rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = isolated_storage(tmp)
+            seed_places(storage, synthetic_places(n))
+
+            def load_all():
+                return [{"lat": p["lat"], "lon": p["lon"], "name": p["name"]}
+                        for p in storage._load_local_places() if p.get("lat") is not None]
+
+            baseline_bytes = len(json.dumps(load_all()))
+            baseline_ms = timed(load_all, repeat=3)
+            for name, *bbox, zoom in VIEWS:
+                view = storage.map_markers(*bbox, zoom)
+                results[f"rows={n}/{name}"] = {
+                    "load_all_ms": baseline_ms,
+                    "viewport_ms": timed(lambda: storage.map_markers(*bbox, zoom)),
+                    "load_all_kb": round(baseline_bytes / 1024, 1),
+                    "viewport_kb": round(len(json.dumps(view)) / 1024, 1),
+                    "points": len(view["markers"]) + len(view["clusters"])
+                }
+            storage.db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'case':<24}{'load-all ms':>13}{'viewport ms':>13}{'load-all KB':>13}{'viewport KB':>13}{'points':>8}")
+    for name, row in run(args.rows).items():
+        print(f"{name:<24}{row['load_all_ms']:>13}{row['viewport_ms']:>13}{row['load_all_kb']:>13}"
+              f"{row['viewport_kb']:>13}{row['points']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Instrumentation overhead: per-thread histogram shards vs. one lock-guarded histogram.
+
+    python -m benchmarks.bench_metrics --calls 200000 --threads 1 4
+"""
+import argparse
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict
+from utils.metrics import BUCKETS, MetricsRegistry
+
+
+class LockedHistogram:
+    """Baseline: a single shared histogram behind a lock"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+
+    def observe(self, name: str, seconds: float, **labels):
+        with self.lock:
+            self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+            self.count += 1
+
+
+def _per_call_ns(record: Callable[[], None], calls: int, threads: int) -> float:
+    def work():
+        for _ in range(calls // threads):
+            record()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return round((time.perf_counter() - start) / calls * 1e9, 1)
+
+
+def run(calls: int = 200_000, threads=(1, 4)) -> Dict[str, Any]:
+    results = {}
+    for n in threads:
+        registry = MetricsRegistry()
+        locked = LockedHistogram()
+        noop = registry.timed("noop", op="load", source="sqlite")(lambda: None)
+
+        def with_timer():
+            with registry.timer("noop", op="load", source="sqlite"):
+                pass
+
+        results[f"threads={n}"] = {
+            "bare_ns": _per_call_ns(lambda: None, calls, n),
+            "observe_ns": _per_call_ns(lambda: registry.observe("noop", 0.001, op="load"), calls, n),
+            "locked_ns": _per_call_ns(lambda: locked.observe("noop", 0.001, op="load"), calls, n),
+            "timed_ns": _per_call_ns(noop, calls, n),
+            "timer_ns": _per_call_ns(with_timer, calls, n)
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    print(f"{'case':<12}{'bare ns':>10}{'observe ns':>12}{'locked ns':>12}{'@timed ns':>12}{'timer() ns':>12}")
+    for name, row in run(args.calls, args.threads).items():
+        print(f"{name:<12}{row['bare_ns']:>10}{row['observe_ns']:>12}{row['locked_ns']:>12}"
+              f"{row['timed_ns']:>12}{row['timer_ns']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Startup time and resident memory of AIModule with the lazily loaded local model.
+
+Run in a fresh interpreter so import and RSS figures are not polluted:
+
+    python -m benchmarks.bench_model_load --model google/flan-t5-small
+"""
+import argparse
+import tempfile
+import time
+from typing import Any, Dict
+from utils.local_model import _rss_mb
+from ._support import configure_secrets
+
+
+def run(model: str = "google/flan-t5-small", warm_up: bool = False) -> Dict[str, Any]:
+    results = {"rss_start_mb": _rss_mb()}
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_secrets(tmp, ai={"local_fallback": True, "model_name": model, "warm_up": warm_up})
+
+        start = time.perf_counter()
+        from utils.ai_modules import AIModule
+        results["import_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+        start = time.perf_counter()
+        ai = AIModule()
+        results["construct_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        results["rss_after_construct_mb"] = _rss_mb()
+
+        start = time.perf_counter()
+        ai.generate_itinerary("Hyderabad", 2, ["Heritage"], "Medium", "Winter")
+        results["first_generation_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+        start = time.perf_counter()
+        ai.generate_itinerary("Warangal", 1, ["Nature"], "Low", "Monsoon")
+        results["second_generation_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+        results["model"] = ai.local.stats()
+        ai.local.unload()
+        results["rss_after_unload_mb"] = _rss_mb()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="google/flan-t5-small")
+    parser.add_argument("--warm-up", action="store_true")
+    args = parser.parse_args()
+
+    for key, value in run(args.model, args.warm_up).items():
+        print(f"{key:<24}{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Rate limiter cost per check and memory under floods of distinct keys.
+
+    python -m benchmarks.bench_ratelimit --keys 100000 1000000 --max-keys 100000
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict
+from utils.db import ConnectionManager
+from utils.decorators import MemoryBucketStore, SQLiteBucketStore
+
+
+def _per_take_us(store, calls: int, distinct: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        store.take(f"otp_send:contact:{i % distinct}", 200.0, 600.0)
+    return round((time.perf_counter() - start) / calls * 1e6, 2)
+
+
+def _flood(keys: int, max_keys: int) -> Dict[str, Any]:
+    """Memory held after `keys` distinct callers each make one request"""
+    tracemalloc.start()
+    store = MemoryBucketStore(max_keys=max_keys)
+    start = time.perf_counter()
+    for i in range(keys):
+        store.take(f"otp_send:contact:{9000000000 + i}", 200.0, 600.0)
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"live_keys": len(store), "evicted": store.evicted, "current_mb": round(current / 2**20, 1),
+            "peak_mb": round(peak / 2**20, 1), "takes_per_sec": round(keys / seconds)}
+
+
+def run(keys=(100_000, 1_000_000), max_keys: int = 100_000, calls: int = 20_000) -> Dict[str, Any]:
+    results = {
+        "memory/hot_key_us": _per_take_us(MemoryBucketStore(), calls, 1),
+        "memory/10k_keys_us": _per_take_us(MemoryBucketStore(), calls, 10_000),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteBucketStore(ConnectionManager(Path(tmp) / "app.db"))
+        results["sqlite/hot_key_us"] = _per_take_us(store, calls // 10, 1)
+        results["sqlite/10k_keys_us"] = _per_take_us(store, calls // 10, 10_000)
+        store.db.close()
+    for n in keys:
+        results[f"flood/{n}_keys"] = _flood(n, max_keys)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    for name, value in run(args.keys, args.max_keys, args.calls).items():
+        if isinstance(value, dict):
+            value = "  ".join(f"{k}={v}" for k, v in value.items())
+        print(f"{name:<24}{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Route-planned itineraries: solve time and travel distance vs. visiting places in listing order.
+
+    python -m benchmarks.bench_routes --rows 100 1000 10000 --days 3 5
+"""
+import argparse
+import tempfile
+import time
+from typing import Any, Dict
+import numpy as np
+from utils.route_planner import RoutePlanner, haversine_matrix
+from ._support import isolated_storage, seed_places, synthetic_places, timed
+
+
+def _listing_order_km(plan: Dict[str, Any]) -> float:
+    """Same places and days, visited in name order instead of the solved order"""
+    total = 0.0
+    start = plan["start"]
+    for day in plan["days"]:
+        places = sorted(day["places"], key=lambda p: p["name"])
+        lats = [start["lat"]] + [p["lat"] for p in places] + [start["lat"]]
+        lons = [start["lon"]] + [p["lon"] for p in places] + [start["lon"]]
+        total += float(np.trace(haversine_matrix(lats[:-1], lons[:-1], lats[1:], lons[1:])))
+    return round(total, 1)
+
+
+def run(rows=(100, 1000, 10_000), days=(3, 5), per_day: int = 4) -> Dict[str, Any]:
+    results = {}
+    for n in rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = isolated_storage(tmp)
+            seed_places(storage, synthetic_places(n))
+            for d in days:
+                planner = RoutePlanner(storage, per_day=per_day)
+                start = time.perf_counter()
+                plan = planner.plan("Hyderabad", d, ["Heritage", "Nature"], "Winter")
+                cold_ms = round((time.perf_counter() - start) * 1000, 3)
+                results[f"rows={n}/days={d}"] = {
+                    "cold_ms": cold_ms,
+                    "warm_ms": timed(lambda: planner.plan("Hyderabad", d, ["Heritage", "Nature"], "Winter")),
+                    "routed_km": plan["total_km"],
+                    "listing_order_km": _listing_order_km(plan)
+                }
+            storage.db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10_000])
+    parser.add_argument("--days", type=int, nargs="+", default=[3, 5])
+    parser.add_argument("--per-day", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'case':<22}{'cold ms':>10}{'warm ms':>10}{'routed km':>12}{'listing km':>12}")
+    for name, row in run(args.rows, args.days, args.per_day).items():
+        print(f"{name:<22}{row['cold_ms']:>10}{row['warm_ms']:>10}{row['routed_km']:>12}{row['listing_order_km']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""FTS5 search vs. Python substring scanning over places.
+
+    python -m benchmarks.bench_search --rows 10000 100000 1000000
+"""
+import argparse
+import tempfile
+from typing import Any, Dict
+from ._support import isolated_storage, seed_places, synthetic_places, timed
+
+QUERIES = ["kakatiya fort", "lake", "qutb shahi tomb", "sanct"]
+
+
+def run(rows=(10_000, 100_000, 1_000_000)) -> Dict[str, Any]:
+    results = {}
+    for n in rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = isolated_storage(tmp)
+            seed_places(storage, synthetic_places(n))
+            loaded = storage._load_local_places()
+
+            def scan(query):
+                terms = query.lower().split()
+                return [p for p in loaded
+                        if all(t in f"{p['name']} {p['description']} {p['district']}".lower() for t in terms)][:20]
+
+            for query in QUERIES:
+                results[f"rows={n}/{query}"] = {
+                    "fts_ms": timed(lambda: storage.search(query, scopes=("places",))),
+                    "scan_ms": timed(lambda: scan(query), repeat=3),
+                    "load_and_scan_ms": timed(lambda: (storage._load_local_places(), scan(query)), repeat=1)
+                }
+            storage.db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'case':<36}{'fts ms':>10}{'scan ms':>10}{'load+scan ms':>14}")
+    for name, row in run(args.rows).items():
+        print(f"{name:<36}{row['fts_ms']:>10}{row['scan_ms']:>10}{row['load_and_scan_ms']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Cold-start and query latency of the memory-mapped semantic index.
+
+Uses synthetic clustered vectors so it runs without downloading a model; pass
+--model to also time real sentence-transformers query encoding on CPU.
+
+    python -m benchmarks.bench_semantic --rows 10000 100000 --dim 384
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+import numpy as np
+from utils.semantic_index import EmbeddingIndex
+from ._support import timed
+
+
+def _build(index_dir: Path, rows: int, dim: int) -> np.ndarray:
+    # Clustered like real embeddings: topics plus per-place noise
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((max(rows // 500, 1), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), rows)]
+    vectors += 0.35 * rng.standard_normal((rows, dim)).astype(np.float32)
+    index = EmbeddingIndex(index_dir, encoder=lambda texts: vectors[[int(t) for t in texts]])
+    chunk = 10_000
+    for start in range(0, rows, chunk):
+        index.upsert([(f"place-{i}", str(i)) for i in range(start, min(start + chunk, rows))])
+    return vectors
+
+
+def run(rows=(10_000, 100_000), dim: int = 384, model: Optional[str] = None) -> Dict[str, Any]:
+    results = {}
+    for n in rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            index_dir = Path(tmp) / "embeddings"
+            vectors = _build(index_dir, n, dim)
+            query = vectors[n // 2] / np.linalg.norm(vectors[n // 2])
+
+            start = time.perf_counter()
+            cold = EmbeddingIndex(index_dir)
+            cold.search_vector(query, k=10)
+            cold_ms = round((time.perf_counter() - start) * 1000, 3)
+
+            exact = EmbeddingIndex(index_dir, ann_threshold=n + 1)
+            ann = EmbeddingIndex(index_dir, ann_threshold=0)
+            ann.search_vector(query, k=10)  # build LSH buckets outside the timed loop
+            exact_ids = {pid for pid, _ in exact.search_vector(query, k=10)}
+            ann_ids = {pid for pid, _ in ann.search_vector(query, k=10)}
+
+            results[f"rows={n}"] = {
+                "cold_start_ms": cold_ms,
+                "exact_query_ms": timed(lambda: exact.search_vector(query, k=10)),
+                "ann_query_ms": timed(lambda: ann.search_vector(query, k=10)),
+                "ann_recall_at_10": round(len(exact_ids & ann_ids) / len(exact_ids), 2),
+                "index_mb": round((index_dir / "vectors.f32").stat().st_size / 1e6, 1)
+            }
+
+    if model:
+        from sentence_transformers import SentenceTransformer
+        start = time.perf_counter()
+        encoder = SentenceTransformer(model, device="cpu")
+        load_ms = round((time.perf_counter() - start) * 1000, 3)
+        results["model"] = {
+            "load_ms": load_ms,
+            "encode_query_ms": timed(lambda: encoder.encode(["quiet lakeside spot for sunset"]))
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--model", default=None, help="e.g. sentence-transformers/all-MiniLM-L6-v2")
+    args = parser.parse_args()
+
+    for name, row in run(args.rows, args.dim, args.model).items():
+        print(name, " ".join(f"{k}={v}" for k, v in row.items()))
+
+
+if __name__ == "__main__":
+    main()
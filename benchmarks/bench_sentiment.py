@@ -0,0 +1,69 @@
+"""Feedback sentiment scoring: batched worker vs. scoring and updating one row at a time.
+
+    python -m benchmarks.bench_sentiment --rows 10000 50000 --batch-sizes 64 512
+"""
+import argparse
+import random
+import tempfile
+import time
+from typing import Any, Dict
+from utils.sentiment import LexiconScorer
+from ._support import isolated_storage
+
+PHRASES = ["great views", "very crowded", "not worth it", "lovely gardens", "dirty toilets",
+           "friendly guides", "overpriced tickets", "peaceful at sunrise", "opens at nine", "boring museum"]
+
+
+def _seed_feedback(storage, n: int):
+    rng = random.Random(11)
+    rows = [(f"Place {i % 500}", " and ".join(rng.sample(PHRASES, 2)), "Neutral") for i in range(n)]
+    with storage.db.connection() as conn:
+        conn.executemany("INSERT INTO feedback (place, feedback, sentiment) VALUES (?, ?, ?)", rows)
+
+
+def run(rows=(10_000, 50_000), batch_sizes=(64, 512)) -> Dict[str, Any]:
+    results = {}
+    for n in rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = isolated_storage(tmp, ai={"use_hf_inference": False, "local_fallback": False,
+                                                "sentiment_worker": False})
+            _seed_feedback(storage, n)
+            scorer = LexiconScorer()
+            start = time.perf_counter()
+            with storage.db.connection() as conn:
+                pending = conn.execute("SELECT id, feedback FROM feedback WHERE scored_at IS NULL").fetchall()
+            for row in pending:
+                label, score = scorer.score_one(row["feedback"])
+                with storage.db.connection() as conn:
+                    conn.execute("UPDATE feedback SET sentiment = ?, sentiment_score = ?, scored_at = ? WHERE id = ?",
+                                 (label, score, time.time(), row["id"]))
+            results[f"rows={n}/per-row"] = {"rows_per_sec": round(n / (time.perf_counter() - start), 1)}
+
+            for batch_size in batch_sizes:
+                with storage.db.connection() as conn:
+                    conn.execute("UPDATE feedback SET scored_at = NULL")
+                worker = storage.sentiment
+                worker.batch_size = batch_size
+                start = time.perf_counter()
+                worker.score_pending(max_batches=n)
+                results[f"rows={n}/batch={batch_size}"] = {
+                    "rows_per_sec": round(n / (time.perf_counter() - start), 1),
+                    "backlog": worker.backlog()
+                }
+            storage.db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64, 512])
+    args = parser.parse_args()
+
+    print(f"{'case':<26}{'rows/s':>12}{'backlog':>10}")
+    for name, row in run(args.rows, args.batch_sizes).items():
+        print(f"{name:<26}{row['rows_per_sec']:>12}{row.get('backlog', '-'):>10}")
+
+
+if __name__ == "__main__":
+    main()
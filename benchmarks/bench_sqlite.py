@@ -0,0 +1,116 @@
+"""Read/write throughput of the local SQLite store with concurrent writers.
+
+Compares the original pattern (a fresh `sqlite3.connect` per operation on a
+rollback-journal database) with the pooled WAL ConnectionManager.
+
+    python -m benchmarks.bench_sqlite --writers 1 4 8 --seconds 3
+"""
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Any
+from utils.db import ConnectionManager
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        place TEXT NOT NULL,
+        feedback TEXT NOT NULL,
+        sentiment TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def _naive(db_path: Path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(SCHEMA)
+
+    def write(i: int):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO feedback (place, feedback, sentiment) VALUES (?, ?, ?)",
+                         (f"place-{i % 100}", "Lovely place", "Neutral"))
+
+    def read():
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("SELECT * FROM feedback ORDER BY id DESC LIMIT 50").fetchall()
+
+    return write, read, lambda: None
+
+
+def _pooled(db_path: Path):
+    manager = ConnectionManager(db_path)
+    with manager.connection() as conn:
+        conn.execute(SCHEMA)
+
+    def write(i: int):
+        with manager.connection() as conn:
+            conn.execute("INSERT INTO feedback (place, feedback, sentiment) VALUES (?, ?, ?)",
+                         (f"place-{i % 100}", "Lovely place", "Neutral"))
+
+    def read():
+        with manager.connection() as conn:
+            conn.execute("SELECT * FROM feedback ORDER BY id DESC LIMIT 50").fetchall()
+
+    return write, read, manager.close
+
+
+def _run(write: Callable, read: Callable, writers: int, readers: int, seconds: float) -> Dict[str, Any]:
+    stop = time.perf_counter() + seconds
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def worker(kind: str):
+        done = errors = 0
+        while time.perf_counter() < stop:
+            try:
+                write(done) if kind == "writes" else read()
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        with lock:
+            counts[kind] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=worker, args=("writes",)) for _ in range(writers)]
+    threads += [threading.Thread(target=worker, args=("reads",)) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return {
+        "writes_per_sec": round(counts["writes"] / seconds, 1),
+        "reads_per_sec": round(counts["reads"] / seconds, 1),
+        "errors": counts["errors"]
+    }
+
+
+def run(writers=(1, 4, 8), readers: int = 4, seconds: float = 3.0) -> Dict[str, Any]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in writers:
+            for name, factory in (("naive", _naive), ("pooled_wal", _pooled)):
+                write, read, close = factory(Path(tmp) / f"{name}-{n}.db")
+                results[f"{name}/writers={n}"] = _run(write, read, n, readers, seconds)
+                close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{'variant':<24}{'writes/s':>12}{'reads/s':>12}{'errors':>8}")
+    for name, row in run(args.writers, args.readers, args.seconds).items():
+        print(f"{name:<24}{row['writes_per_sec']:>12}{row['reads_per_sec']:>12}{row['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
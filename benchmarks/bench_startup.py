@@ -0,0 +1,113 @@
+"""Cold start: time for a fresh interpreter to run app.py, and import cost per module.
+
+Runs app.py in a new process (as a bare script, without the Streamlit server)
+under `python -X importtime`, once as shipped and once with the map and model
+stacks imported up front, as app.py used to.
+
+    python -m benchmarks.bench_startup --top 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("folium", "streamlit_folium", "utils.ai_modules", "transformers", "torch", "sentence_transformers",
+         "numpy", "PIL")
+SECRETS = """
+semantic_search = false
+
+[corpus]
+use_api = false
+
+[ai]
+use_hf_inference = false
+sentiment_worker = false
+"""
+CHILD = """
+import runpy, sys, time
+start = time.perf_counter()
+for name in {preload!r}:
+    __import__(name)
+runpy.run_path({app!r}, run_name="app")
+print("APP_MS", (time.perf_counter() - start) * 1000)
+print("LOADED", ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def profile(preload: tuple = (), secrets: Optional[str] = None) -> Dict[str, Any]:
+    """Run app.py once in a fresh interpreter; returns timings and per-import costs"""
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / ".streamlit").mkdir()
+        (Path(tmp) / ".streamlit" / "secrets.toml").write_text(Path(secrets).read_text() if secrets else SECRETS)
+        env = {**os.environ, "PYTHONPATH": str(ROOT), "DATA_DIR": str(Path(tmp) / "data")}
+        code = CHILD.format(preload=tuple(preload), app=str(ROOT / "app.py"), heavy=HEAVY)
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=tmp, env=env,
+                              capture_output=True, text=True)
+        wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode:
+        raise RuntimeError(f"app.py failed to start:\n{proc.stderr[-2000:]}")
+
+    top_level: Dict[str, float] = {}
+    by_package: Dict[str, float] = defaultdict(float)
+    for match in IMPORT_LINE.finditer(proc.stderr):
+        self_us, cumulative_us, indent, name = match.groups()
+        by_package[name.split(".")[0]] += int(self_us) / 1000
+        if not indent:
+            top_level[name] = int(cumulative_us) / 1000
+    stdout = dict(line.split(" ", 1) for line in proc.stdout.splitlines() if line.startswith(("APP_MS", "LOADED")))
+    return {
+        "process_ms": round(wall_ms, 1),
+        "app_ms": round(float(stdout["APP_MS"]), 1),
+        "import_ms": round(sum(by_package.values()), 1),
+        "heavy_loaded": [m for m in stdout.get("LOADED", "").strip().split(",") if m],
+        "top_level": top_level,
+        "by_package": dict(by_package)
+    }
+
+
+def run(repeat: int = 3, secrets: Optional[str] = None) -> Dict[str, Any]:
+    """Best-of-`repeat` profile of app.py as shipped and with every heavy stack imported eagerly"""
+    results = {}
+    for label, preload in (("lazy", ()), ("eager", ("folium", "streamlit_folium", "utils.ai_modules"))):
+        runs = [profile(preload, secrets) for _ in range(repeat)]
+        results[label] = min(runs, key=lambda r: r["process_ms"])
+    return results
+
+
+def _top(costs: Dict[str, float], n: int) -> List[tuple]:
+    return sorted(costs.items(), key=lambda item: -item[1])[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--secrets", help="secrets.toml to start with (default: local-only settings)")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.secrets)
+    print(f"{'startup':<10}{'process ms':>12}{'app.py ms':>12}{'imports ms':>12}  heavy modules loaded")
+    for label, row in results.items():
+        print(f"{label:<10}{row['process_ms']:>12}{row['app_ms']:>12}{row['import_ms']:>12}  "
+              f"{', '.join(row['heavy_loaded']) or '-'}")
+
+    lazy = results["lazy"]
+    print(f"\n{'package (self time)':<36}{'ms':>10}")
+    for name, ms in _top(lazy["by_package"], args.top):
+        print(f"{name:<36}{ms:>10.1f}")
+    print(f"\n{'top-level import (cumulative)':<36}{'ms':>10}")
+    for name, ms in _top(lazy["top_level"], args.top):
+        print(f"{name:<36}{ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
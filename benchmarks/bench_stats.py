@@ -0,0 +1,69 @@
+"""Visitor statistics: precomputed aggregates vs. counting over every feedback row in Python.
+
+    python -m benchmarks.bench_stats --rows 10000 100000
+"""
+import argparse
+import random
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict
+from ._support import DISTRICTS, isolated_storage, timed
+
+
+def _seed(storage, n: int):
+    rng = random.Random(5)
+    sentiments = ["Positive", "Negative", "Neutral"]
+    feedback = [(f"Place {rng.randrange(500)}", "...", rng.choice(sentiments),
+                 f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00:00") for _ in range(n)]
+    itineraries = [(rng.choice(DISTRICTS), rng.randint(1, 7), ",".join(rng.sample(["Heritage", "Nature", "Religious", "Adventure"], 2)),
+                    rng.choice(["Low", "Medium", "High"]), "...") for _ in range(n // 10)]
+    start = time.perf_counter()
+    with storage.db.connection() as conn:
+        conn.executemany("INSERT INTO feedback (place, feedback, sentiment, created_at) VALUES (?, ?, ?, ?)", feedback)
+        conn.executemany("INSERT INTO itineraries (start, days, interests, budget, plan) VALUES (?, ?, ?, ?, ?)",
+                         itineraries)
+    return round(n / (time.perf_counter() - start), 1)
+
+
+def _python_stats(storage) -> Dict[str, Any]:
+    rows = storage._load_local_feedback()
+    places = Counter(r["place"] for r in rows)
+    return {
+        "feedback_total": len(rows),
+        "by_sentiment": Counter(r["sentiment"] for r in rows),
+        "top_places": places.most_common(10),
+        "feedback_per_day": sorted(Counter(r["created_at"][:10] for r in rows).items())
+    }
+
+
+def run(rows=(10_000, 100_000)) -> Dict[str, Any]:
+    results = {}
+    for n in rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = isolated_storage(tmp, ai={"use_hf_inference": False, "local_fallback": False,
+                                                "sentiment_worker": False})
+            insert_rate = _seed(storage, n)
+            results[f"rows={n}"] = {
+                "aggregate_ms": timed(lambda: storage.visitor_stats(days=None)),
+                "python_ms": timed(lambda: _python_stats(storage), repeat=3),
+                "rebuild_ms": timed(storage.stats.rebuild, repeat=1),
+                "insert_rows_per_sec": insert_rate
+            }
+            storage.db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'case':<14}{'aggregate ms':>14}{'python ms':>12}{'rebuild ms':>12}{'insert rows/s':>15}")
+    for name, row in run(args.rows).items():
+        print(f"{name:<14}{row['aggregate_ms']:>14}{row['python_ms']:>12}{row['rebuild_ms']:>12}"
+              f"{row['insert_rows_per_sec']:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Time to first visible content: streamed vs. blocking itinerary generation.
+
+Drives AIModule against a local stand-in for the HF inference endpoint that
+emits one server-sent event per token after a fixed per-token delay.
+
+    python -m benchmarks.bench_streaming --tokens 200 --token-ms 20
+"""
+import argparse
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from ._support import configure_secrets
+
+
+def _server(tokens: int, token_ms: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            words = [f" word{i}" for i in range(tokens)]
+            if not payload.get("stream"):
+                time.sleep(tokens * token_ms / 1000)
+                body = json.dumps([{"generated_text": "".join(words)}]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for word in words:
+                time.sleep(token_ms / 1000)
+                self._chunk(f"data: {json.dumps({'token': {'text': word, 'special': False}})}\n\n".encode())
+            self._chunk(b"")
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def run(tokens: int = 200, token_ms: float = 20) -> Dict[str, Any]:
+    httpd = _server(tokens, token_ms)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            configure_secrets(tmp, ai={
+                "use_hf_inference": True,
+                "hf_api_key": "benchmark",
+                "hf_inference_url": f"http://127.0.0.1:{httpd.server_address[1]}",
+                "local_fallback": False,
+                "cache_itineraries": False
+            })
+            from utils.ai_modules import AIModule
+            ai = AIModule()
+
+            start = time.perf_counter()
+            ai.generate_itinerary("Hyderabad", 2, ["Heritage"], "Medium", "Winter")
+            blocking_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            first_ms = None
+            chunks = 0
+            for _ in ai.generate_itinerary_stream("Hyderabad", 2, ["Heritage"], "Medium", "Winter"):
+                chunks += 1
+                if first_ms is None:
+                    first_ms = (time.perf_counter() - start) * 1000
+            stream_total_ms = (time.perf_counter() - start) * 1000
+    finally:
+        httpd.shutdown()
+
+    return {
+        "blocking_first_content_ms": round(blocking_ms, 1),
+        "stream_first_content_ms": round(first_ms, 1),
+        "stream_total_ms": round(stream_total_ms, 1),
+        "chunks": chunks
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    for key, value in run(args.tokens, args.token_ms).items():
+        print(f"{key:<28}{value}")
+
+
+if __name__ == "__main__":
+    main()
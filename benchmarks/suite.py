@@ -0,0 +1,243 @@
+"""Regression suite: storage, Corpus client, image validation and itinerary generation.
+
+Seeds synthetic places, feedback and itineraries at each scale, times every
+case `--repeat` times and writes the per-case statistics as JSON. Pass a
+previous results file with --compare to fail (exit 1) on cases whose median
+slowed down by more than --threshold.
+
+    python -m benchmarks.suite --scales 1000 10000 --output results.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.25
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from PIL import Image
+from utils.ai_modules import AIModule
+from utils.corpus_api import CorpusAPI
+from utils.local_model import LocalModel
+from utils.sentiment import SentimentWorker
+from utils.storage import Storage
+from utils.validators import Validators
+from ._support import (configure_secrets, isolated_storage, samples, seed_places, seed_rows, stub_corpus,
+                       synthetic_feedback, synthetic_itineraries, synthetic_places)
+
+Case = Tuple[str, Callable[[], Any]]
+
+# Secrets shared by every case: no background workers and no itinerary cache skewing timings
+AI_SECRETS = {"use_hf_inference": False, "local_fallback": False, "sentiment_worker": False,
+              "cache_itineraries": False}
+TRIP = ("Hyderabad", 3, ["Heritage", "Nature"], "Medium", "Winter")
+
+
+@contextmanager
+def _dataset(tmp: str, scale: int) -> Iterator[Storage]:
+    """Storage holding `scale` places, as much feedback and a quarter as many itineraries"""
+    storage = isolated_storage(tmp, ai=AI_SECRETS)
+    places = synthetic_places(scale)
+    seed_places(storage, places)
+    seed_rows(storage, "feedback", synthetic_feedback(scale, places))
+    seed_rows(storage, "itineraries", synthetic_itineraries(max(scale // 4, 1)))
+    try:
+        yield storage
+    finally:
+        SentimentWorker.close_all()
+        storage.db.close()
+
+
+def storage_cases(scale: int) -> Iterator[Case]:
+    """Local reads bypass the read cache; writes add a new row per call"""
+    with tempfile.TemporaryDirectory() as tmp, _dataset(tmp, scale) as storage:
+        counter = itertools.count()
+        yield "load_places", storage._load_local_places
+        yield "load_feedback", storage._load_local_feedback
+        yield "query_places", lambda: storage._fetch_place_page({"district": "Warangal", "limit": 50}, None)
+        yield "search", lambda: storage.search("fort temple")
+        yield "places_in_bbox", lambda: storage.places_in_bbox(17.2, 78.2, 17.6, 78.7)
+        yield "visitor_stats", storage.visitor_stats
+        yield "save_place", lambda: storage.save_place({
+            "name": f"Bench Fort {next(counter)}", "district": "Warangal", "category": "Heritage",
+            "season": "All", "description": "Benchmark write", "lat": 17.97, "lon": 79.6
+        })
+        yield "save_feedback", lambda: storage.save_feedback({"place": "Bench Fort", "feedback": "Lovely views"})
+        yield "save_itinerary", lambda: storage.save_itinerary({
+            "start": "Hyderabad", "days": 2, "interests": "Heritage,Nature", "budget": "Low", "plan": "Day 1: ..."
+        })
+        ai = AIModule(storage)
+        yield "generate_itinerary/fallback", lambda: ai.generate_itinerary(*TRIP)
+
+
+def api_cases(latency_ms: float, page: int = 100) -> Iterator[Case]:
+    """CorpusAPI round trips against a local stub that waits `latency_ms` before answering"""
+    places = synthetic_places(page)
+    httpd = stub_corpus({
+        ("GET", "/collections/places"): (200, {"data": places}),
+        ("POST", "/collections/feedback"): (201, {"id": "fb-1"}),
+        ("POST", "/auth/send-otp"): (200, {"status": "sent"}),
+    }, latency_ms)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"http://127.0.0.1:{httpd.server_address[1]}"
+            configure_secrets(tmp, ai=AI_SECRETS, corpus={"use_api": True, "base_url": url})
+            api = CorpusAPI()
+            yield "get_places", lambda: api.api_get("collections/places", params={"limit": page})
+            yield "post_feedback", lambda: api.api_post("collections/feedback", {"place": "Ramappa Temple",
+                                                                                 "feedback": "Lovely"})
+            yield "send_otp", lambda: api.send_otp("9876543210")
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _image(megapixels: float, fmt: str) -> bytes:
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    rng = np.random.default_rng(5)
+    pixels = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    out = io.BytesIO()
+    Image.fromarray(pixels).save(out, fmt, **({"quality": 90} if fmt == "JPEG" else {}))
+    return out.getvalue()
+
+
+def validator_cases(megapixels: float) -> Iterator[Case]:
+    for fmt in ("JPEG", "PNG"):
+        data = _image(megapixels, fmt)
+        yield f"validate_image/{fmt.lower()}", lambda data=data: Validators.validate_image(data, max_size=len(data))
+
+
+def model_cases(model_ms: float) -> Iterator[Case]:
+    """generate_itinerary through the local-model path, with a stub pipeline taking `model_ms` per batch"""
+    def loader(model_name):
+        def pipeline(prompts, **kwargs):
+            time.sleep(model_ms / 1000)
+            return [{"generated_text": f"Day 1: {p[:24]}"} for p in prompts]
+        return pipeline
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_secrets(tmp, ai=AI_SECRETS)
+        ai = AIModule()
+        ai.local = LocalModel("stub", loader=loader, batch_max_wait_ms=0)
+        ai.local.get()
+        try:
+            yield "generate_itinerary/stub_model", lambda: ai.generate_itinerary(*TRIP)
+        finally:
+            ai.local.batcher.close()
+
+
+def _stats(times: List[float]) -> Dict[str, Any]:
+    ordered = sorted(times)
+    median = statistics.median(ordered)
+    return {
+        "median_ms": round(median, 4),
+        "min_ms": round(ordered[0], 4),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 4),
+        "stdev_ms": round(statistics.stdev(ordered), 4) if len(ordered) > 1 else 0.0,
+        "ops_per_sec": round(1000 / median, 1) if median else None,
+        "samples": len(ordered)
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5, cwd=Path(__file__).parent).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run(scales: Sequence[int] = (1000, 10_000), latencies_ms: Sequence[float] = (0, 20),
+        megapixels: Sequence[float] = (0.3, 1, 4), model_ms: float = 20, repeat: int = 10,
+        only: Optional[str] = None) -> Dict[str, Any]:
+    """Time every case; `only` keeps the cases whose name contains it"""
+    groups = [(f"storage/rows={n}", storage_cases(n)) for n in scales]
+    groups += [(f"api/latency={ms:g}ms", api_cases(ms)) for ms in latencies_ms]
+    groups += [(f"validators/{mp:g}MP", validator_cases(mp)) for mp in megapixels]
+    groups.append((f"generation/model={model_ms:g}ms", model_cases(model_ms)))
+
+    results = {}
+    for prefix, cases in groups:
+        for name, fn in cases:
+            key = f"{prefix}/{name}"
+            if only is None or only in key:
+                results[key] = _stats(samples(fn, repeat))
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat
+        },
+        "results": results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2,
+            min_delta_ms: float = 0.1) -> List[Dict[str, Any]]:
+    """Per-case median change against a baseline run; a case regresses when it is slower by
+    more than `threshold` (a fraction) and by more than `min_delta_ms`, which absorbs timer noise"""
+    rows = []
+    for key, now in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        delta = now["median_ms"] - before["median_ms"]
+        ratio = now["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        rows.append({
+            "case": key,
+            "baseline_ms": before["median_ms"],
+            "current_ms": now["median_ms"],
+            "change": round(ratio - 1, 4),
+            "regression": ratio > 1 + threshold and delta > min_delta_ms
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[0, 20])
+    parser.add_argument("--megapixels", type=float, nargs="+", default=[0.3, 1, 4])
+    parser.add_argument("--model-ms", type=float, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown, as a fraction")
+    args = parser.parse_args(argv)
+
+    report = run(args.scales, args.latency_ms, args.megapixels, args.model_ms, args.repeat, args.only)
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+    print(f"{'case':<56}{'median ms':>12}{'p95 ms':>12}{'ops/s':>12}")
+    for key, row in report["results"].items():
+        print(f"{key:<56}{row['median_ms']:>12}{row['p95_ms']:>12}{row['ops_per_sec']:>12}")
+    print(f"wrote {args.output}", file=sys.stderr)
+
+    if not args.compare:
+        return 0
+    rows = compare(report, json.loads(Path(args.compare).read_text()), args.threshold)
+    regressions = [row for row in rows if row["regression"]]
+    print(f"\n{'case':<56}{'baseline ms':>12}{'current ms':>12}{'change':>10}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['case']:<56}{row['baseline_ms']:>12}{row['current_ms']:>12}{row['change']:>+10.1%}{flag}")
+    print(f"{len(regressions)} of {len(rows)} cases slower than +{args.threshold:.0%}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import urlsplit, parse_qs
+import pytest
+import streamlit as st
+from utils.http_pool import SessionPool
+from utils.storage import Storage
+from utils.db import ConnectionManager
+from utils.decorators import RateLimiter
+from utils.executor import TaskExecutor
+from utils.outbox import Outbox
+from utils.sentiment import SentimentWorker
+from utils.sync import SyncEngine
+from utils.resilience import BackendGuard
+
+
+class StubCorpus:
+    """Local HTTP server standing in for the Corpus API.
+
+    `routes` maps (method, path) to either a (status, body) tuple or a callable
+    taking the recorded request and returning (status, body[, headers]).
+    """
+    def __init__(self):
+        self.routes = {}
+        self.delay = 0.0
+        self.calls = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                request = SimpleNamespace(
+                    method=self.command,
+                    path=parts.path,
+                    query={k: v[0] for k, v in parse_qs(parts.query).items()},
+                    headers=dict(self.headers),
+                    json=json.loads(raw) if raw else None
+                )
+                with stub._lock:
+                    stub.calls.append(request)
+                if stub.delay:
+                    time.sleep(stub.delay)
+
+                route = stub.routes.get((self.command, parts.path), (404, {"detail": "not found"}))
+                result = route(request) if callable(route) else route
+                status, body = result[0], result[1]
+                headers = result[2] if len(result) > 2 else {}
+
+                payload = b"" if body is None else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _dispatch
+            do_POST = _dispatch
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def corpus_server():
+    stub = StubCorpus()
+    stub.start()
+    yield stub
+    stub.stop()
+    SessionPool.close_all()
+
+
+@pytest.fixture
+def secrets(tmp_path, monkeypatch):
+    """In-memory st.secrets with a throwaway data directory"""
+    values = {
+        "semantic_search": False,
+        "corpus": {"use_api": False},
+        "ai": {"use_hf_inference": False, "local_fallback": False, "sentiment_worker": False},
+        "resilience": {"backoff_base": 0.01},
+        "executor": {"cpu_workers": 0}
+    }
+    monkeypatch.setattr(st, "secrets", values)
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(Storage, "_cache", None)
+    yield values
+    Outbox.close_all()
+    SentimentWorker.close_all()
+    SyncEngine.reset_all()
+    ConnectionManager.close_all_managers()
+    BackendGuard.reset_all()
+    RateLimiter.reset_all()
+    TaskExecutor.shutdown_shared()
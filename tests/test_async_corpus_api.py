@@ -0,0 +1,80 @@
+import time
+import pytest
+from utils.async_corpus_api import AsyncCorpusAPI
+from utils.storage import Storage
+
+
+@pytest.fixture
+def api_secrets(secrets, corpus_server):
+    secrets["corpus"].update({"use_api": True, "base_url": corpus_server.url, "max_concurrency": 4,
+                               "sync": False})
+    corpus_server.routes[("GET", "/collections/places")] = (200, {"data": [{"name": "Golconda Fort"}]})
+    corpus_server.routes[("GET", "/collections/feedback")] = (200, [{"place": "Golconda Fort", "feedback": "Great"}])
+    return secrets
+
+
+class TestAsyncCorpusAPI:
+    def test_fan_out_takes_slowest_not_sum(self, api_secrets, corpus_server):
+        corpus_server.delay = 0.3
+        client = AsyncCorpusAPI()
+
+        start = time.perf_counter()
+        places, feedback = client.run_sync(client.gather(
+            client.api_get("collections/places"),
+            client.api_get("collections/feedback")
+        ))
+        elapsed = time.perf_counter() - start
+
+        assert places == {"data": [{"name": "Golconda Fort"}]}
+        assert feedback[0]["feedback"] == "Great"
+        assert elapsed < 0.55
+
+    def test_concurrency_limit(self, api_secrets, corpus_server):
+        corpus_server.delay = 0.2
+        client = AsyncCorpusAPI(max_concurrency=1)
+
+        start = time.perf_counter()
+        client.run_sync(client.gather(*(client.api_get("collections/places") for _ in range(3))))
+
+        assert time.perf_counter() - start >= 0.6
+
+    def test_send_otp_payload(self, api_secrets, corpus_server):
+        corpus_server.routes[("POST", "/auth/send-otp")] = (200, {"sent": True})
+        client = AsyncCorpusAPI()
+
+        assert client.run_sync(client.send_otp("user@example.com")) == {"sent": True}
+        assert corpus_server.calls[-1].json == {"email": "user@example.com"}
+
+    def test_run_sync_inside_running_loop(self, api_secrets):
+        import asyncio
+
+        async def outer():
+            return AsyncCorpusAPI.run_sync(asyncio.sleep(0, result="done"))
+
+        assert asyncio.run(outer()) == "done"
+
+
+class TestStorageFanOut:
+    def test_load_collections(self, api_secrets, corpus_server):
+        corpus_server.delay = 0.3
+        storage = Storage()
+
+        start = time.perf_counter()
+        result = storage.load_collections(["places", "feedback"])
+
+        assert time.perf_counter() - start < 0.55
+        assert result["places"] == [{"name": "Golconda Fort"}]
+        assert result["feedback"] == [{"place": "Golconda Fort", "feedback": "Great"}]
+
+    def test_unknown_collection(self, api_secrets):
+        with pytest.raises(ValueError):
+            Storage().load_collections(["bookings"])
+
+    def test_save_itineraries_falls_back_locally(self, api_secrets, corpus_server):
+        storage = Storage()
+        storage.api.max_retries = 1
+        itinerary = {"start": "Hyderabad", "days": 2, "interests": ["Heritage"], "budget": "Low", "plan": "Day 1"}
+
+        saved = storage.save_itineraries([dict(itinerary), dict(itinerary)])
+
+        assert [s["id"] for s in saved] == [1, 2]
@@ -0,0 +1,56 @@
+import threading
+import time
+import pytest
+from utils.batching import MicroBatcher, QueueFullError
+
+
+class TestMicroBatcher:
+    def test_coalesces_concurrent_callers(self):
+        sizes = []
+
+        def double(items):
+            sizes.append(len(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(double, max_batch_size=4, max_wait_ms=50)
+        futures = [batcher.submit(i) for i in range(8)]
+
+        assert [f.result(2) for f in futures] == [i * 2 for i in range(8)]
+        assert sizes == [4, 4]
+        assert batcher.stats()["avg_batch_size"] == 4.0
+        batcher.close()
+
+    def test_flushes_partial_batch_after_wait(self):
+        batcher = MicroBatcher(lambda items: items, max_batch_size=16, max_wait_ms=10)
+        start = time.monotonic()
+
+        assert batcher("solo", timeout=2) == "solo"
+        assert time.monotonic() - start < 1
+        batcher.close()
+
+    def test_errors_reach_every_caller(self):
+        def broken(items):
+            raise ValueError("model crashed")
+
+        batcher = MicroBatcher(broken, max_batch_size=2, max_wait_ms=20)
+        futures = [batcher.submit(i) for i in range(2)]
+
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(2)
+        batcher.close()
+
+    def test_queue_depth_is_bounded(self):
+        release = threading.Event()
+        batcher = MicroBatcher(lambda items: release.wait(2) and items, max_batch_size=1,
+                               max_wait_ms=0, max_queue_depth=2)
+        first = batcher.submit(0)
+        time.sleep(0.05)  # worker is now blocked on the first item
+        batcher.submit(1)
+        batcher.submit(2)
+
+        with pytest.raises(QueueFullError):
+            batcher.submit(3)
+        release.set()
+        assert first.result(2) == 0
+        batcher.close()
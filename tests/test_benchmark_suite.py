@@ -0,0 +1,33 @@
+import json
+from benchmarks import suite
+
+
+def test_small_run_writes_comparable_results(secrets, tmp_path):
+    output = tmp_path / "results.json"
+    code = suite.main(["--scales", "50", "--latency-ms", "0", "--megapixels", "0.05",
+                       "--model-ms", "1", "--repeat", "2", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert code == 0 and report["meta"]["repeat"] == 2
+    names = set(report["results"])
+    for case in ("storage/rows=50/load_places", "storage/rows=50/save_feedback",
+                 "storage/rows=50/generate_itinerary/fallback", "api/latency=0ms/get_places",
+                 "validators/0.05MP/validate_image/png", "generation/model=1ms/generate_itinerary/stub_model"):
+        assert case in names
+    assert all(row["samples"] == 2 and row["min_ms"] <= row["median_ms"] for row in report["results"].values())
+
+
+def test_compare_flags_only_real_slowdowns():
+    def report(**medians):
+        return {"results": {name: {"median_ms": ms} for name, ms in medians.items()}}
+
+    rows = {row["case"]: row for row in suite.compare(
+        report(slow=13.0, noisy=0.06, steady=10.5, new=1.0),
+        report(slow=10.0, noisy=0.03, steady=10.0),
+        threshold=0.2
+    )}
+
+    assert rows["slow"]["regression"] and rows["slow"]["change"] == 0.3
+    # Doubling a sub-0.1 ms case is timer noise, not a regression
+    assert not rows["noisy"]["regression"] and not rows["steady"]["regression"]
+    assert "new" not in rows
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import sqlite3
+import pytest
+from utils.bulk import BulkLoader, detect_format, main
+from utils.storage import Storage
+
+CSV_DATA = """id,name,district,category,season,description,lat,lon,image_url
+,Golconda Fort,Hyderabad,Heritage,Winter,Qutb Shahi citadel,17.3833,78.4011,
+ramappa,Ramappa Temple,Mulugu,Religious,All,Kakatiya temple,18.2592,79.9431,
+,Broken Row,Warangal,Heritage,Winter,Bad coordinates,north,east,
+,Missing Fields,Warangal
+"""
+
+
+@pytest.fixture
+def loader(secrets):
+    return BulkLoader(Storage(), chunk_size=2)
+
+
+class TestBulkLoader:
+    def test_csv_import_reports_row_errors(self, loader):
+        result = loader.import_stream(io.StringIO(CSV_DATA), "csv")
+
+        assert (result["rows"], result["loaded"], result["error_count"]) == (4, 2, 2)
+        assert [e["line"] for e in result["errors"]] == [4, 5]
+        places = {p["id"]: p for p in loader.storage.load_places()}
+        assert set(places) == {"golconda-fort", "ramappa"}
+        assert places["ramappa"]["lat"] == pytest.approx(18.2592)
+
+    def test_jsonl_import_upserts(self, loader):
+        lines = [
+            json.dumps({"name": "Bogatha Waterfalls", "district": "Mulugu", "category": "Nature",
+                        "season": "Monsoon", "description": "Waterfall"}),
+            "{not json",
+            json.dumps({"name": "Bogatha Waterfalls", "district": "Mulugu", "category": "Nature",
+                        "season": "Monsoon", "description": "Telangana's Niagara"}),
+            "",
+            json.dumps(["not", "an", "object"])
+        ]
+        result = loader.import_stream(io.StringIO("\n".join(lines)), "jsonl")
+
+        assert (result["loaded"], result["error_count"]) == (2, 2)
+        assert [p["description"] for p in loader.storage.load_places()] == ["Telangana's Niagara"]
+        assert loader.storage.search("niagara")["places"][0]["id"] == "bogatha-waterfalls"
+
+    def test_export_round_trip(self, loader, tmp_path):
+        loader.import_stream(io.StringIO(CSV_DATA), "csv")
+
+        assert loader.export_file(tmp_path / "out.jsonl")["rows"] == 2
+        rows = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+        assert [r["name"] for r in rows] == ["Golconda Fort", "Ramappa Temple"]
+
+        out = io.StringIO()
+        assert loader.export_stream(out, "csv", district="Mulugu")["rows"] == 1
+        exported = list(csv.DictReader(io.StringIO(out.getvalue())))
+        assert exported[0]["id"] == "ramappa"
+
+    def test_detect_format(self):
+        assert detect_format("places.NDJSON") == "jsonl"
+        with pytest.raises(ValueError):
+            detect_format("places.xlsx")
+
+    def test_cli_exit_code(self, secrets, tmp_path):
+        path = tmp_path / "places.csv"
+        path.write_text(CSV_DATA)
+
+        assert main(["import", str(path)]) == 1
+        assert main(["export", str(tmp_path / "out.csv")]) == 0
+
+    def test_deferred_indexing_keeps_triggers(self, loader):
+        storage = loader.storage
+        triggers = "SELECT name FROM sqlite_master WHERE name IN ('places_fts_insert', 'places_rtree_insert')"
+        other = sqlite3.connect(storage.db_path)
+        with pytest.raises(RuntimeError):
+            with storage.db.connection() as conn, storage.deferred_place_indexing(conn):
+                assert conn.in_transaction
+                # Other connections still see the triggers while the block runs
+                assert len(other.execute(triggers).fetchall()) == 2
+                raise RuntimeError("boom")
+        other.close()
+
+        with storage.db.connection() as conn:
+            assert len(conn.execute(triggers).fetchall()) == 2
+        storage.save_place({"name": "Bhongir Fort", "district": "Yadadri", "category": "Heritage",
+                            "season": "Winter", "description": "Monolithic rock fort", "lat": 17.5, "lon": 78.9})
+        assert [p["name"] for p in storage.search("Bhongir")["places"]] == ["Bhongir Fort"]
+        assert [p["name"] for p in storage.places_in_bbox(17, 78, 18, 79)] == ["Bhongir Fort"]
@@ -0,0 +1,164 @@
+import threading
+import time
+from utils.cache import TTLCache
+from utils.storage import Storage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    def test_hit_and_miss(self):
+        cache = TTLCache(ttl=10, clock=FakeClock())
+        calls = []
+        loader = lambda: calls.append(1) or ["a"]
+
+        assert cache.get_or_load(("places", None), loader) == ["a"]
+        assert cache.get_or_load(("places", None), loader) == ["a"]
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_expiry_after_stale_window(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, stale_ttl=5, clock=clock)
+        cache.set(("places", None), ["old"])
+
+        clock.now = 16
+        assert cache.get(("places", None)) is None
+
+    def test_stale_while_revalidate(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, stale_ttl=60, clock=clock)
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return ["new"]
+
+        cache.set(("places", None), ["old"], loader=loader)
+        clock.now = 11
+
+        assert cache.get(("places", None)) == ["old"]
+        assert refreshed.wait(2)
+        for _ in range(100):
+            if not cache._refreshing:
+                break
+            time.sleep(0.01)
+        assert cache.get(("places", None)) == ["new"]
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_entries=2, clock=FakeClock())
+        cache.set(("places", "a"), 1)
+        cache.set(("places", "b"), 2)
+        cache.get(("places", "a"))
+        cache.set(("places", "c"), 3)
+
+        assert cache.get(("places", "b")) is None
+        assert cache.get(("places", "a")) == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_collection(self):
+        cache = TTLCache(clock=FakeClock())
+        cache.set(("places", "a"), 1)
+        cache.set(("places", "b"), 2)
+        cache.set(("feedback", "a"), 3)
+
+        cache.invalidate("places")
+
+        assert cache.get(("places", "a")) is None
+        assert cache.get(("places", "b")) is None
+        assert cache.get(("feedback", "a")) == 3
+
+    def test_racing_load_discarded_after_invalidate(self):
+        cache = TTLCache(clock=FakeClock())
+        generation = cache.generation("places")
+        cache.invalidate("places")
+        cache.set(("places", None), ["stale"], generation=generation)
+
+        assert cache.get(("places", None)) is None
+
+    def test_concurrent_misses_load_once(self):
+        cache = TTLCache()
+        start = threading.Barrier(8)
+        calls = []
+        results = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.2)  # long enough for every other thread to miss meanwhile
+            return ["Charminar"]
+
+        def session():
+            start.wait()
+            results.append(cache.get_or_load(("places", None), loader))
+
+        threads = [threading.Thread(target=session) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1 and results == [["Charminar"]] * 8
+
+    def test_failed_load_is_shared_then_retried(self):
+        cache = TTLCache()
+        release = threading.Event()
+        errors = []
+
+        def failing():
+            release.wait(5)
+            raise ConnectionError("backend down")
+
+        def load(loader):
+            try:
+                cache.get_or_load(("places", None), loader)
+            except ConnectionError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=load, args=(failing,))
+        leader.start()
+        while ("places", None) not in cache._loading:
+            time.sleep(0.001)
+        follower = threading.Thread(target=load, args=(lambda: ["never called"],))
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+        assert len(errors) == 2
+        # Failures are not cached
+        assert cache.get_or_load(("places", None), lambda: ["Golconda"]) == ["Golconda"]
+
+    def test_invalidate_detaches_running_load(self):
+        cache = TTLCache()
+        release = threading.Event()
+        old = threading.Thread(target=cache.get_or_load,
+                               args=(("places", None), lambda: release.wait(5) and ["old"]))
+        old.start()
+        while ("places", None) not in cache._loading:
+            time.sleep(0.001)
+        cache.invalidate("places")
+        # A read after the write does not wait for, or get, the pre-write load
+        assert cache.get_or_load(("places", None), lambda: ["new"]) == ["new"]
+        release.set()
+        old.join()
+        assert cache.get(("places", None)) == ["new"]
+
+
+class TestStorageCache:
+    def test_save_place_invalidates(self, secrets):
+        storage = Storage()
+        place = {"name": "Golconda Fort", "district": "Hyderabad", "category": "Heritage",
+                 "season": "Winter", "description": "Fort"}
+
+        assert storage.load_places() == []
+        storage.save_place(place)
+
+        assert [p["name"] for p in storage.load_places()] == ["Golconda Fort"]
+        assert storage.cache_stats()["misses"] == 2
@@ -0,0 +1,53 @@
+import pytest
+import streamlit as st
+from streamlit.runtime.secrets import Secrets
+from utils.config import Config
+
+
+@pytest.fixture
+def secrets_file(tmp_path, monkeypatch):
+    """A real file-backed st.secrets, as in a running app"""
+    path = tmp_path / "secrets.toml"
+    path.write_text('[corpus]\nuse_api = true\ntimeout = 5\n\n[sqlite]\npool_size = 2\n')
+    previous = st.config.get_option("secrets.files")
+    st.config.set_option("secrets.files", [str(path)])
+    monkeypatch.setattr(st, "secrets", Secrets())
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(Config, "_sections", {})
+    monkeypatch.setattr(Config, "_source", None)
+    yield path
+    st.config.set_option("secrets.files", previous)
+
+
+class TestConfigSnapshot:
+    def test_sections_are_built_once_and_read_only(self, secrets_file):
+        corpus = Config.get_corpus_config()
+
+        assert corpus["timeout"] == 5 and corpus["endpoints"]["places"] == "collections/places"
+        assert Config.get_corpus_config() is corpus
+        assert Config.get_app_config()["sqlite"]["pool_size"] == 2
+        assert isinstance(Config.get_app_config()["image_widths"], tuple)
+        with pytest.raises(TypeError):
+            corpus["timeout"] = 1
+        with pytest.raises(TypeError):
+            corpus["endpoints"]["places"] = "elsewhere"
+
+    def test_reloads_when_the_secrets_file_changes(self, secrets_file):
+        before = Config.get_corpus_config()
+        secrets_file.write_text('[corpus]\nuse_api = true\ntimeout = 9\n')
+        # What Streamlit's file watcher calls after an edit
+        st.secrets._on_secrets_changed(str(secrets_file))
+
+        after = Config.get_corpus_config()
+        assert before["timeout"] == 5 and after["timeout"] == 9
+        assert Config.get_corpus_config() is after
+
+    def test_data_dir_change_rebuilds_app_config(self, secrets_file, tmp_path, monkeypatch):
+        assert Config.get_app_config()["data_dir"] == str(tmp_path / "data")
+        monkeypatch.setenv("DATA_DIR", str(tmp_path / "other"))
+        assert Config.get_app_config()["data_dir"] == str(tmp_path / "other")
+
+    def test_programmatic_secrets_are_read_on_every_call(self, secrets):
+        assert Config.get_corpus_config()["use_api"] is False
+        secrets["corpus"]["use_api"] = True
+        assert Config.get_corpus_config()["use_api"] is True
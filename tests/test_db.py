@@ -0,0 +1,53 @@
+import threading
+import pytest
+from utils.db import ConnectionManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ConnectionManager(tmp_path / "test.db", pool_size=2)
+    with manager.connection() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    yield manager
+    manager.close()
+
+
+class TestConnectionManager:
+    def test_wal_and_pragmas(self, manager):
+        with manager.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_connection_reused(self, manager):
+        with manager.connection() as first:
+            pass
+        with manager.connection() as second:
+            assert second is first
+
+    def test_nested_blocks_share_transaction(self, manager):
+        with pytest.raises(RuntimeError):
+            with manager.connection() as outer:
+                outer.execute("INSERT INTO items (name) VALUES ('a')")
+                with manager.connection() as inner:
+                    assert inner is outer
+                    inner.execute("INSERT INTO items (name) VALUES ('b')")
+                raise RuntimeError("abort")
+
+        with manager.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    def test_concurrent_writers(self, manager):
+        def write(n):
+            for i in range(50):
+                with manager.connection() as conn:
+                    conn.execute("INSERT INTO items (name) VALUES (?)", (f"{n}-{i}",))
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        with manager.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 200
@@ -0,0 +1,196 @@
+import pytest
+from utils import decorators
+from utils.async_corpus_api import AsyncCorpusAPI
+from utils.corpus_api import CorpusAPI
+from utils.db import ConnectionManager
+from utils.decorators import (MemoryBucketStore, RateLimiter, RateLimitExceeded, SQLiteBucketStore, parse_rate,
+                              rate_limited)
+from utils.storage import Storage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseRate:
+    def test_units(self):
+        assert parse_rate("3/10m") == (3, 600.0)
+        assert parse_rate("5/s") == (5, 1.0)
+        assert parse_rate("120 / 1h") == (120, 3600.0)
+        assert parse_rate("2/30") == (2, 30.0)
+
+    @pytest.mark.parametrize("rate", ["", "0/1m", "three/1m", "5/1w"])
+    def test_rejects_bad_rates(self, rate):
+        with pytest.raises(ValueError):
+            parse_rate(rate)
+
+
+class TestMemoryBucketStore:
+    def test_burst_then_steady_refill(self):
+        clock = FakeClock()
+        store = MemoryBucketStore(clock=clock)
+        # 3 calls per 60 s: each spends 20 s of a 60 s bucket
+        assert [store.take("k", 20, 60) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert store.take("k", 20, 60) == pytest.approx(20)
+
+        clock.now += 20
+        assert store.take("k", 20, 60) == 0.0
+        assert store.take("k", 20, 60) > 0
+        assert store.take("other", 20, 60) == 0.0
+
+    def test_refilled_keys_are_swept(self):
+        clock = FakeClock()
+        store = MemoryBucketStore(clock=clock)
+        for i in range(1000):
+            store.take(f"k{i}", 1, 10)
+        clock.now += 5
+        store.take("late", 10, 10)
+        clock.now += 6  # every bucket but "late" has refilled
+        for i in range(30):
+            store.take(f"new{i}", 1, 10)
+        assert len(store) == 31
+
+    def test_memory_stays_bounded_under_distinct_keys(self):
+        clock = FakeClock()
+        store = MemoryBucketStore(max_keys=2000, clock=clock)
+        for i in range(50_000):
+            clock.now += 0.001
+            assert store.take(f"bot-{i}", 5, 60) == 0.0
+        assert len(store) <= 2000 and store.evicted > 0
+        # The most recent (emptiest) buckets survive eviction
+        assert store.take("bot-49999", 60, 60) > 0
+
+
+class TestSQLiteBucketStore:
+    def test_buckets_are_shared_between_processes(self, tmp_path):
+        clock = FakeClock()
+        # Separate managers stand in for two worker processes on the same file
+        first = SQLiteBucketStore(ConnectionManager(tmp_path / "app.db"), clock=clock)
+        second = SQLiteBucketStore(ConnectionManager(tmp_path / "app.db"), clock=clock)
+
+        assert first.take("otp:contact:a", 30, 60) == 0.0
+        assert second.take("otp:contact:a", 30, 60) == 0.0
+        assert first.take("otp:contact:a", 30, 60) == pytest.approx(30)
+        clock.now += 30
+        assert second.take("otp:contact:a", 30, 60) == 0.0
+
+    def test_refilled_rows_are_deleted(self, tmp_path):
+        clock = FakeClock()
+        store = SQLiteBucketStore(ConnectionManager(tmp_path / "app.db"), sweep_every=10, clock=clock)
+        for i in range(9):
+            store.take(f"k{i}", 1, 10)
+        clock.now += 2
+        store.take("last", 1, 10)
+        assert len(store) == 1
+
+
+class TestTakeMany:
+    @pytest.mark.parametrize("kind", ["memory", "sqlite"])
+    def test_take_many_spends_all_or_nothing(self, kind, tmp_path):
+        clock = FakeClock()
+        store = (MemoryBucketStore(clock=clock) if kind == "memory"
+                 else SQLiteBucketStore(ConnectionManager(tmp_path / "app.db"), clock=clock))
+        assert store.take_many([("narrow", 10, 60), ("broad", 30, 60)]) == [0.0, 0.0]
+        assert store.take_many([("narrow", 10, 60), ("broad", 31, 60)]) == [0.0, pytest.approx(1)]
+        # The rejected call left the narrow bucket alone: five more fit in it
+        assert [store.take("narrow", 10, 60) for _ in range(5)] == [0.0] * 5
+
+
+class TestRateLimited:
+    def test_otp_sends_are_throttled_per_contact(self, secrets, corpus_server):
+        secrets["corpus"].update({"use_api": True, "base_url": corpus_server.url})
+        secrets["rate_limits"] = {"otp_send": {"contact": "2/10m", "global": "3/1m"}}
+        corpus_server.routes[("POST", "/auth/send-otp")] = (200, {"sent": True})
+        api = CorpusAPI()
+
+        api.send_otp("9876543210")
+        api.send_otp(" 9876543210 ")
+        with pytest.raises(RateLimitExceeded) as exc:
+            api.send_otp("9876543210")
+        assert exc.value.scope == "contact" and 0 < exc.value.retry_after <= 600
+        assert "try again in" in str(exc.value)
+        assert len(corpus_server.calls) == 2
+
+        api.send_otp("user@example.com")
+        with pytest.raises(RateLimitExceeded) as exc:
+            api.send_otp("other@example.com")
+        assert exc.value.scope == "global" and len(corpus_server.calls) == 3
+        assert RateLimiter.stats()["otp_send"] == {"allowed": 3, "rejected": 2}
+
+    def test_async_otp_shares_the_sync_limits(self, secrets, corpus_server):
+        secrets["corpus"].update({"use_api": True, "base_url": corpus_server.url})
+        secrets["rate_limits"] = {"otp_send": {"contact": "2/10m"}, "otp_verify": {"contact": "1/10m"}}
+        corpus_server.routes[("POST", "/auth/send-otp")] = (200, {"sent": True})
+        corpus_server.routes[("POST", "/auth/verify-otp")] = (200, {"token": "t"})
+        client = AsyncCorpusAPI()
+
+        CorpusAPI().send_otp("9876543210")
+        client.run_sync(client.send_otp("9876543210"))
+        with pytest.raises(RateLimitExceeded):
+            client.run_sync(client.send_otp("9876543210"))
+        client.run_sync(client.verify_otp("9876543210", "123456"))
+        with pytest.raises(RateLimitExceeded):
+            client.run_sync(client.verify_otp("9876543210", "123456"))
+        assert len(corpus_server.calls) == 3
+
+    def test_rejection_by_a_broad_scope_spends_nothing(self, secrets, monkeypatch):
+        secrets["rate_limits"] = {"generate": {"session": "2/1m", "global": "1/1m"}}
+        monkeypatch.setattr(decorators, "current_session_id", lambda: "a")
+        limiter = RateLimiter.for_action("generate")
+        limiter.hit(session="b")
+        for _ in range(3):
+            with pytest.raises(RateLimitExceeded) as exc:
+                limiter.hit(session="a")
+            assert exc.value.scope == "global"
+        # Session a was never charged for the calls global turned away
+        assert limiter.store.take("generate:session:a", 60, 60) == 0.0
+
+    def test_sessions_have_their_own_buckets(self, secrets, monkeypatch):
+        secrets["rate_limits"] = {"generate": {"session": "1/1m", "global": "10/1m"}}
+        session = {"id": "a"}
+        monkeypatch.setattr(decorators, "current_session_id", lambda: session["id"])
+        calls = []
+
+        @rate_limited("generate")
+        def generate():
+            calls.append(session["id"])
+
+        generate()
+        with pytest.raises(RateLimitExceeded):
+            generate()
+        session["id"] = "b"
+        generate()
+        assert calls == ["a", "b"]
+
+    def test_storage_writes_and_disabling(self, secrets):
+        secrets["rate_limits"] = {"write": {"global": "2/1m"}}
+        storage = Storage()
+        for _ in range(2):
+            storage.save_feedback({"place": "Charminar", "feedback": "Lovely"})
+        with pytest.raises(RateLimitExceeded):
+            storage.save_itinerary({"start": "Hyderabad", "days": 1, "interests": "Heritage",
+                                    "budget": "Low", "plan": "..."})
+
+        secrets["rate_limits"]["enabled"] = False
+        storage.save_feedback({"place": "Charminar", "feedback": "Lovely"})
+
+    def test_batches_are_charged_per_item(self, secrets):
+        secrets["rate_limits"] = {"write": {"global": "3/1m"}}
+        storage = Storage()
+        itinerary = {"start": "Hyderabad", "days": 1, "interests": "Heritage", "budget": "Low", "plan": "..."}
+        storage.save_itineraries([itinerary, itinerary])
+        with pytest.raises(RateLimitExceeded):
+            storage.save_itineraries([itinerary, itinerary])
+        assert len(storage.save_itineraries([itinerary])) == 1
+
+    def test_sqlite_store_from_config(self, secrets):
+        secrets["rate_limits"] = {"store": "sqlite", "generate": {"global": "1/1m"}}
+        limiter = RateLimiter.for_action("generate")
+        limiter.hit()
+        with pytest.raises(RateLimitExceeded):
+            limiter.hit()
+        assert isinstance(limiter.store, SQLiteBucketStore)
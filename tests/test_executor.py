@@ -0,0 +1,142 @@
+import io
+import os
+import threading
+from types import SimpleNamespace
+import pytest
+from PIL import Image
+from utils import executor as executor_module
+from utils import local_model
+from utils.ai_modules import AIModule
+from utils.executor import ExecutorBusy, TaskExecutor, TaskTimeout
+from utils.local_model import LocalModel
+from utils.validators import Validators
+
+
+class FakePipeline:
+    def __call__(self, prompts, **kwargs):
+        return [{"generated_text": f"plan for: {prompt[:20]}"} for prompt in prompts]
+
+
+@pytest.fixture
+def pool():
+    executor = TaskExecutor(cpu_workers=1, io_workers=1, max_pending=2)
+    yield executor
+    executor.shutdown()
+
+
+def blocker(executor):
+    release = threading.Event()
+    started = threading.Event()
+
+    def wait():
+        started.set()
+        release.wait(5)
+
+    future = executor.submit(TaskExecutor.IO, wait)
+    started.wait(5)
+    return release, future
+
+
+class TestTaskExecutor:
+    def test_inline_mode(self):
+        executor = TaskExecutor(cpu_workers=0)
+        assert executor.run(TaskExecutor.CPU, os.getpid) == os.getpid()
+        with pytest.raises(ZeroDivisionError):
+            executor.run(TaskExecutor.CPU, divmod, 1, 0)
+        assert executor.stats()["cpu"] == {"submitted": 2, "completed": 1, "failed": 1, "rejected": 0,
+                                           "timed_out": 0, "cancelled": 0, "pending": 0}
+        with pytest.raises(ValueError):
+            executor.submit("gpu", os.getpid)
+
+    def test_cpu_tasks_run_in_worker_processes(self, pool):
+        assert pool.run(TaskExecutor.CPU, os.getpid) != os.getpid()
+        assert pool.run(TaskExecutor.CPU, pow, 2, 10) == 1024
+
+    def test_full_pool_rejects_instead_of_queueing(self, pool):
+        release, running = blocker(pool)
+        queued = pool.submit(TaskExecutor.IO, int, "7")
+        with pytest.raises(ExecutorBusy):
+            pool.submit(TaskExecutor.IO, int, "8")
+        release.set()
+        assert queued.result(5) == 7
+        assert pool.run(TaskExecutor.IO, int, "9") == 9
+        assert pool.stats()["io"]["rejected"] == 1
+
+    def test_timeout_cancels_queued_task(self, pool):
+        release, running = blocker(pool)
+        with pytest.raises(TaskTimeout):
+            pool.run(TaskExecutor.IO, int, "7", timeout=0.05)
+        release.set()
+        pool.shutdown()
+        stats = pool.stats()["io"]
+        assert stats["timed_out"] == 1 and stats["cancelled"] == 1 and stats["pending"] == 0
+
+    def test_ended_sessions_are_reaped(self, pool, monkeypatch):
+        monkeypatch.setattr(executor_module, "current_session_id", lambda: "gone")
+        release, running = blocker(pool)
+        queued = pool.submit(TaskExecutor.IO, int, "7")
+        assert pool.stats()["sessions"] == 1
+
+        runtime = SimpleNamespace(is_active_session=lambda session: session != "gone")
+        monkeypatch.setattr(executor_module, "Runtime",
+                            SimpleNamespace(exists=lambda: True, instance=lambda: runtime))
+        # The running task cannot be interrupted; only the queued one is cancelled
+        assert pool.reap() == 1
+        assert queued.cancelled()
+        release.set()
+        pool.shutdown()
+        assert running.done() and pool.stats()["sessions"] == 0
+
+    def test_counts_stay_consistent_under_concurrency(self):
+        executor = TaskExecutor(cpu_workers=0, io_workers=4, max_pending=1000)
+        futures = []
+
+        def submit_many():
+            futures.extend(executor.submit(TaskExecutor.IO, int, "1") for _ in range(100))
+
+        submitters = [threading.Thread(target=submit_many) for _ in range(8)]
+        for thread in submitters:
+            thread.start()
+        for thread in submitters:
+            thread.join()
+        assert sum(future.result(5) for future in futures) == 800
+        executor.shutdown()  # joins the pool threads, so every done-callback has run
+        stats = executor.stats()["io"]
+        assert stats["submitted"] == stats["completed"] == 800 and stats["pending"] == 0
+
+    def test_workers_are_not_forked(self, pool):
+        assert pool.start_method in ("forkserver", "spawn")
+        assert pool._pool(TaskExecutor.CPU)._mp_context.get_start_method() == pool.start_method
+        assert TaskExecutor(start_method="no-such-method").start_method == "spawn"
+
+    def test_shared_follows_config(self, secrets):
+        first = TaskExecutor.shared()
+        assert first is TaskExecutor.shared() and first.cpu_workers == 0
+        secrets["executor"]["max_pending"] = 3
+        assert TaskExecutor.shared() is not first and TaskExecutor.shared().max_pending == 3
+
+
+class TestOffloadedCallers:
+    def test_validate_image_in_worker(self, pool):
+        out = io.BytesIO()
+        Image.new("RGBA", (40, 30)).save(out, "PNG")
+        img = Validators.validate_image(out.getvalue(), executor=pool)
+        assert img.mode == "RGB" and img.size == (40, 30)
+        with pytest.raises(ValueError):
+            Validators.validate_image(b"not an image", executor=pool)
+        pool.shutdown()
+        assert pool.stats()["cpu"]["completed"] == 1 and pool.stats()["cpu"]["failed"] == 1
+
+    def test_generate_in_worker(self, secrets, monkeypatch):
+        secrets["ai"].update({"local_fallback": True, "generate_in_worker": True})
+        calls = []
+        monkeypatch.setattr(local_model, "_load_pipeline", lambda name: calls.append(name) or FakePipeline())
+        monkeypatch.setattr(local_model, "_worker_models", {})
+        parent = LocalModel("google/flan-t5-small", loader=lambda name: FakePipeline())
+        monkeypatch.setattr(LocalModel, "_instances", {"google/flan-t5-small": parent})
+
+        plan = AIModule().generate_itinerary("Hyderabad", 1, ["Heritage"], "Low", "Winter")
+        assert plan.startswith("plan for") and calls == ["google/flan-t5-small"]
+        # The script process's own model is never loaded
+        assert not parent.loaded
+        assert TaskExecutor.shared().stats()["cpu"]["completed"] == 1
@@ -0,0 +1,52 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from utils.http_pool import SessionPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"ok": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    SessionPool.close_all()
+
+
+class TestSessionPool:
+    def test_same_session_per_base_url(self, server):
+        assert SessionPool.get_session(server) is SessionPool.get_session(server + "/")
+
+    def test_connections_are_reused(self, server):
+        session = SessionPool.get_session(server)
+        for _ in range(5):
+            assert session.get(f"{server}/ping", timeout=5).json() == {"ok": True}
+
+        stats = SessionPool.stats(server)
+        assert stats["requests"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 4
+
+    def test_keep_alive_disabled(self, server):
+        session = SessionPool.get_session(server, keep_alive=False)
+        for _ in range(3):
+            session.get(f"{server}/ping", timeout=5)
+
+        assert SessionPool.stats(server)["connections_opened"] == 3
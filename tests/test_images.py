@@ -0,0 +1,69 @@
+import io
+import pytest
+from PIL import Image
+from utils.executor import TaskExecutor
+from utils.images import ImagePipeline
+from utils.storage import Storage
+
+
+def photo(width=1200, height=800, fmt="JPEG"):
+    img = Image.new("RGB", (width, height))
+    img.putdata([((x * 7) % 256, (y * 3) % 256, (x + y) % 256) for y in range(height) for x in range(width)])
+    out = io.BytesIO()
+    img.save(out, fmt, quality=95)
+    return out.getvalue()
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return ImagePipeline(tmp_path / "images", widths=(160, 320))
+
+
+class TestImagePipeline:
+    def test_thumbnails_are_content_addressed(self, pipeline):
+        data = photo()
+        manifest = pipeline.ingest(data)
+
+        directory = pipeline.root / manifest["hash"][:2] / manifest["hash"]
+        assert sorted(p.name for p in directory.iterdir()) == [
+            "160.jpeg", "160.webp", "320.jpeg", "320.webp", "manifest.json"
+        ]
+        with Image.open(pipeline.path(manifest, 200, "jpeg")) as thumb:
+            assert thumb.size == (320, 213)
+        assert manifest["files"]["320.webp"] < len(data) / 10
+        assert pipeline.ingest(data) == manifest
+
+    def test_small_images_are_not_upscaled(self, pipeline):
+        manifest = pipeline.ingest(photo(100, 50, "PNG"))
+        assert manifest["widths"] == [100]
+
+    def test_rejects_unsupported_format(self, pipeline):
+        out = io.BytesIO()
+        Image.new("RGB", (10, 10)).save(out, "GIF")
+        with pytest.raises(ValueError):
+            pipeline.ingest(out.getvalue())
+        with pytest.raises(ValueError):
+            pipeline.ingest(b"not an image")
+
+    def test_process_pool(self, tmp_path):
+        executor = TaskExecutor(cpu_workers=1)
+        pipeline = ImagePipeline(tmp_path / "pooled", widths=(160,), formats=("jpeg",), executor=executor)
+        try:
+            assert pipeline.ingest(photo(400, 300))["files"]["160.jpeg"] > 0
+        finally:
+            executor.shutdown()
+
+
+class TestStorageImages:
+    def test_attach_image(self, secrets):
+        storage = Storage()
+        storage.save_place({"name": "Bhongir Fort", "district": "Yadadri", "category": "Heritage",
+                            "season": "Winter", "description": "Monolithic rock fort"})
+
+        storage.attach_image("bhongir-fort", photo())
+
+        place = storage.load_places()[0]
+        assert storage.thumbnail_path(place).name == "320.webp"
+        assert storage.thumbnail_path(place, 2000, "jpeg").name == "640.jpeg"
+        with pytest.raises(ValueError):
+            storage.attach_image("nowhere", photo())
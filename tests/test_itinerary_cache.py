@@ -0,0 +1,88 @@
+import threading
+import time
+import pytest
+from utils.ai_modules import AIModule
+from utils.db import ConnectionManager
+from utils.itinerary_cache import ItineraryCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    db = ConnectionManager(tmp_path / "app.db")
+    yield ItineraryCache(db, ttl_seconds=60, max_entries=3)
+    db.close()
+
+
+def params(city="Hyderabad", interests=("Heritage", "Nature")):
+    return ItineraryCache.normalize(city, 2, list(interests), "Medium", "Winter", "google/flan-t5-small")
+
+
+class TestItineraryCache:
+    def test_key_ignores_case_and_interest_order(self):
+        a = ItineraryCache.make_key(params(" hyderabad ", ("Nature", "heritage")))
+        b = ItineraryCache.make_key(params("Hyderabad", ("Heritage", "Nature")))
+        assert a == b
+        assert a != ItineraryCache.make_key(params("Warangal"))
+
+    def test_hit_after_generation(self, cache):
+        calls = []
+        generate = lambda: calls.append(1) or ("Day 1: Charminar", True)
+
+        assert cache.get_or_generate(params(), generate) == "Day 1: Charminar"
+        assert cache.get_or_generate(params(), generate) == "Day 1: Charminar"
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_fallback_results_not_stored(self, cache):
+        cache.get_or_generate(params(), lambda: ("template plan", False))
+        assert cache.get(ItineraryCache.make_key(params())) is None
+
+    def test_ttl_expiry(self, cache, monkeypatch):
+        cache.put(ItineraryCache.make_key(params()), params(), "old plan")
+        later = time.time() + 61
+        monkeypatch.setattr(time, "time", lambda: later)
+        assert cache.get(ItineraryCache.make_key(params())) is None
+
+    def test_size_bounded_lru_eviction(self, cache):
+        for city in ["A", "B", "C"]:
+            cache.put(ItineraryCache.make_key(params(city)), params(city), city)
+            time.sleep(0.01)
+        cache.get(ItineraryCache.make_key(params("A")))
+        cache.put(ItineraryCache.make_key(params("D")), params("D"), "D")
+
+        assert cache.stats()["entries"] == 3
+        assert cache.get(ItineraryCache.make_key(params("B"))) is None
+        assert cache.get(ItineraryCache.make_key(params("A"))) == "A"
+
+    def test_concurrent_identical_requests_share_generation(self, cache):
+        calls = []
+        release = threading.Event()
+
+        def generate():
+            calls.append(1)
+            release.wait(2)
+            return "shared plan", True
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_generate(params(), generate)))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert results == ["shared plan"] * 5
+        assert len(calls) == 1
+
+
+class TestAIModuleCaching:
+    def test_model_output_cached(self, secrets, monkeypatch):
+        ai = AIModule()
+        calls = []
+        monkeypatch.setattr(ai, "_generate", lambda *args: calls.append(args) or ("model plan", True))
+
+        assert ai.generate_itinerary("Hyderabad", 2, ["Nature", "Heritage"], "Medium", "Winter") == "model plan"
+        assert ai.generate_itinerary("hyderabad", 2, ["Heritage", "Nature"], "Medium", "Winter") == "model plan"
+        assert len(calls) == 1
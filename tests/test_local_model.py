@@ -0,0 +1,76 @@
+import threading
+import time
+from utils.ai_modules import AIModule
+from utils.local_model import LocalModel
+
+
+class FakePipeline:
+    def __call__(self, prompts, **kwargs):
+        return [{"generated_text": f"plan for: {prompt[:20]}"} for prompt in prompts]
+
+
+def counting_loader(calls, delay=0.0):
+    def loader(model_name):
+        calls.append(model_name)
+        time.sleep(delay)
+        return FakePipeline()
+    return loader
+
+
+class TestLocalModel:
+    def test_lazy_and_loaded_once(self):
+        calls = []
+        model = LocalModel("flan", loader=counting_loader(calls, delay=0.05))
+        assert not model.loaded
+
+        threads = [threading.Thread(target=model.get) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert calls == ["flan"]
+        assert model.stats()["loads"] == 1
+
+    def test_warm_up_in_background(self):
+        calls = []
+        model = LocalModel("flan", loader=counting_loader(calls))
+        model.warm_up().join(2)
+        assert model.loaded
+
+    def test_idle_unload(self):
+        model = LocalModel("flan", idle_unload_seconds=0.05, loader=counting_loader([]))
+        model.get()
+        for _ in range(100):
+            if not model.loaded:
+                break
+            time.sleep(0.01)
+        assert not model.loaded
+
+    def test_failed_load_is_not_retried_immediately(self):
+        calls = []
+
+        def broken(model_name):
+            calls.append(model_name)
+            raise OSError("no weights")
+
+        model = LocalModel("flan", loader=broken)
+        assert model.get() is None
+        assert model.get() is None
+        assert len(calls) == 1
+        assert model.stats()["load_error"] == "no weights"
+
+
+class TestAIModuleLazyLoading:
+    def test_constructing_does_not_load(self, secrets, monkeypatch):
+        secrets["ai"]["local_fallback"] = True
+        calls = []
+        shared = LocalModel("google/flan-t5-small", loader=counting_loader(calls))
+        monkeypatch.setattr(LocalModel, "_instances", {"google/flan-t5-small": shared})
+
+        first, second = AIModule(), AIModule()
+        assert calls == []
+        assert first.local is second.local
+
+        assert first.generate_itinerary("Hyderabad", 1, ["Heritage"], "Low", "Winter").startswith("plan for")
+        assert calls == ["google/flan-t5-small"]
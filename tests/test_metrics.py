@@ -0,0 +1,82 @@
+import threading
+import pytest
+import requests
+from utils import metrics
+from utils.metrics import MetricsRegistry
+from utils.storage import Storage
+
+
+@pytest.fixture
+def registry():
+    metrics.registry.reset()
+    yield metrics.registry
+    metrics.registry.reset()
+
+
+def series(registry, name, **labels):
+    return next(row for row in registry.summary()
+                if row["metric"] == name and all(row.get(k) == v for k, v in labels.items()))
+
+
+class TestRegistry:
+    def test_timer_counts_errors(self):
+        registry = MetricsRegistry()
+        with registry.timer("op", kind="a"):
+            pass
+        with pytest.raises(ValueError):
+            with registry.timer("op", kind="a"):
+                raise ValueError("boom")
+
+        row = series(registry, "op", kind="a")
+        assert (row["count"], row["error_rate"]) == (2, 0.5)
+        assert row["p50_ms"] == 0.5
+
+    def test_threads_merge_and_retire(self):
+        registry = MetricsRegistry()
+        record = registry.timed("work")(lambda: None)
+        threads = [threading.Thread(target=lambda: [record() for _ in range(1000)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        record()
+
+        assert series(registry, "work")["count"] == 4001
+        assert len(registry._shards) == 1
+        assert series(registry, "work")["count"] == 4001
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.observe("corpus_request", 0.003, method="GET", endpoint='/a"b')
+        registry.observe("corpus_request", 0.2, error=True, method="GET", endpoint='/a"b')
+        text = registry.prometheus_text()
+
+        assert '# TYPE telangana_corpus_request_seconds histogram' in text
+        assert 'telangana_corpus_request_seconds_bucket{endpoint="/a\\"b",method="GET",le="0.005"} 1' in text
+        assert 'telangana_corpus_request_seconds_bucket{endpoint="/a\\"b",method="GET",le="+Inf"} 2' in text
+        assert 'telangana_corpus_request_seconds_count{endpoint="/a\\"b",method="GET"} 2' in text
+        assert 'telangana_corpus_request_errors_total{endpoint="/a\\"b",method="GET"} 1' in text
+
+
+class TestInstrumentation:
+    def test_storage_paths_are_split(self, secrets, corpus_server, registry):
+        secrets["corpus"].update({"use_api": True, "base_url": corpus_server.url, "sync": False,
+                                  "write_behind": False})
+        corpus_server.routes[("GET", "/collections/places")] = (200, [{"name": "Charminar"}])
+        storage = Storage()
+        storage.load_places()
+        storage._load_local_places()
+
+        assert series(registry, "storage", op="load_places", source="api")["count"] == 1
+        assert series(registry, "storage", op="load_places", source="sqlite")["count"] == 1
+        assert series(registry, "corpus_request", method="GET")["error_rate"] == 0
+
+    def test_endpoint_serves_text(self, registry):
+        registry.observe("generation", 0.01, backend="fallback")
+        server = metrics.serve(0)
+        try:
+            response = requests.get(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5)
+            assert response.status_code == 200
+            assert 'telangana_generation_seconds_count{backend="fallback"} 1' in response.text
+        finally:
+            metrics.shutdown()
@@ -0,0 +1,100 @@
+import time
+import pytest
+from utils.async_corpus_api import AsyncCorpusAPI
+from utils.executor import TaskTimeout
+from utils.storage import Storage
+
+
+@pytest.fixture
+def storage(secrets, corpus_server):
+    secrets["corpus"].update({
+        "use_api": True,
+        "base_url": corpus_server.url,
+        "outbox_worker": False,
+        "outbox_max_attempts": 2
+    })
+    storage = Storage()
+    storage.api.max_retries = 1
+    return storage
+
+
+def feedback(text="Lovely sunset"):
+    return {"place": "Hussain Sagar", "feedback": text, "sentiment": "Positive"}
+
+
+class TestOutbox:
+    def test_write_is_local_and_queued(self, storage, corpus_server):
+        corpus_server.delay = 0.5
+
+        start = time.perf_counter()
+        saved = storage.save_feedback(feedback())
+
+        assert time.perf_counter() - start < 0.2
+        assert saved["id"] == 1
+        assert corpus_server.calls == []
+        assert storage.outbox.stats()["pending"] == 1
+
+    def test_drain_sends_with_idempotency_key(self, storage, corpus_server):
+        corpus_server.routes[("POST", "/collections/feedback")] = (201, {"ok": True})
+        corpus_server.routes[("POST", "/collections/itineraries")] = (201, {"ok": True})
+        storage.save_feedback(feedback())
+        storage.save_itineraries([
+            {"start": "Warangal", "days": d, "interests": ["Heritage"], "budget": "Low", "plan": "Day 1"}
+            for d in (1, 2)
+        ])
+
+        counts = storage.outbox.flush(storage.api)
+
+        assert counts["sent"] == 3
+        assert storage.outbox.stats()["pending"] == 0
+        keys = {call.headers["Idempotency-Key"] for call in corpus_server.calls}
+        assert len(keys) == 3
+        posted = next(call.json for call in corpus_server.calls if call.path == "/collections/feedback")
+        assert posted == feedback()  # local row id is not sent
+
+    def test_transient_failure_is_retried_later(self, storage, corpus_server):
+        corpus_server.routes[("POST", "/collections/feedback")] = (503, {"detail": "busy"})
+        storage.save_feedback(feedback())
+
+        assert storage.outbox.drain(storage.api)["retry"] == 1
+        assert storage.outbox.drain(storage.api)["claimed"] == 0  # backing off
+        with storage.db.connection() as conn:
+            row = conn.execute("SELECT attempts, next_attempt_at, last_error FROM outbox").fetchone()
+        assert row["attempts"] == 1
+        assert row["next_attempt_at"] > time.time()
+        assert "503" in row["last_error"]
+
+    def test_transient_exception_is_retried_until_max_attempts(self, storage, monkeypatch):
+        async def timed_out(self, *args, **kwargs):
+            raise TaskTimeout("response parsing did not finish")
+
+        monkeypatch.setattr(AsyncCorpusAPI, "api_post", timed_out)
+        storage.save_feedback(feedback())
+
+        assert storage.outbox.drain(storage.api)["retry"] == 1
+        with storage.db.connection() as conn:
+            conn.execute("UPDATE outbox SET next_attempt_at = 0")
+        # outbox_max_attempts is 2: the second failure is final
+        assert storage.outbox.drain(storage.api)["dead"] == 1
+        assert "did not finish" in storage.outbox.dead_letters()[0]["last_error"]
+
+    def test_rejected_write_is_dead_lettered_and_requeued(self, storage, corpus_server):
+        corpus_server.routes[("POST", "/collections/feedback")] = (422, {"detail": "invalid"})
+        storage.save_feedback(feedback())
+
+        assert storage.outbox.drain(storage.api)["dead"] == 1
+        assert storage.outbox.dead_letters()[0]["collection"] == "feedback"
+
+        corpus_server.routes[("POST", "/collections/feedback")] = (201, {"ok": True})
+        assert storage.outbox.requeue_dead() == 1
+        assert storage.outbox.drain(storage.api)["sent"] == 1
+
+    def test_worker_drains_in_background(self, storage, corpus_server):
+        corpus_server.routes[("POST", "/collections/feedback")] = (201, {"ok": True})
+        storage.outbox.start(storage.api)
+        storage.save_feedback(feedback())
+
+        deadline = time.time() + 5
+        while storage.outbox.stats()["sent"] == 0 and time.time() < deadline:
+            time.sleep(0.02)
+        assert storage.outbox.stats()["sent"] == 1
@@ -0,0 +1,126 @@
+import time
+import pytest
+from utils.corpus_api import CorpusAPI
+from utils.resilience import AdaptiveTimeout, BackendGuard, CircuitBreaker, CircuitOpenError, backoff_delay
+from utils.storage import Storage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    def test_opens_on_failure_rate(self):
+        breaker = CircuitBreaker("test", failure_rate_threshold=0.5, window_size=10, min_calls=4)
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED  # below min_calls
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.stats()["rejected"] == 1
+
+    def test_successes_keep_it_closed(self):
+        breaker = CircuitBreaker("test", failure_rate_threshold=0.5, window_size=10, min_calls=4)
+        for _ in range(6):
+            breaker.record_success()
+        for _ in range(4):
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_trial(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=10, clock=clock)
+        breaker.record_failure()
+        assert not breaker.available()
+
+        clock.now = 10
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # only one trial at a time
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        clock.now = 20
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestAdaptiveTimeout:
+    def test_initial_until_enough_samples(self):
+        timeout = AdaptiveTimeout(30, minimum=0.5, min_samples=10)
+        for _ in range(9):
+            timeout.record(0.1)
+        assert timeout.current() == 30
+
+    def test_tracks_percentile_within_bounds(self):
+        timeout = AdaptiveTimeout(30, minimum=0.5, multiplier=3, min_samples=10)
+        for _ in range(100):
+            timeout.record(0.5)
+        assert timeout.current() == pytest.approx(1.5)
+
+        for _ in range(200):
+            timeout.record(0.01)
+        assert timeout.current() == 0.5
+
+    def test_backoff_is_capped_and_jittered(self):
+        assert backoff_delay(0, base=0.5, rng=lambda: 1.0) == 0.5
+        assert backoff_delay(10, base=0.5, cap=4, rng=lambda: 1.0) == 4
+        assert backoff_delay(3, rng=lambda: 0.0) == 0
+
+
+class TestCorpusAPIBreaker:
+    @pytest.fixture
+    def api(self, secrets, corpus_server):
+        secrets["corpus"].update({"use_api": True, "base_url": corpus_server.url, "sync": False})
+        secrets["resilience"].update({"min_calls": 3, "open_seconds": 60})
+        return CorpusAPI()
+
+    def test_fails_fast_once_open(self, api, corpus_server):
+        corpus_server.routes[("GET", "/collections/places")] = (503, {"detail": "down"})
+        corpus_server.delay = 0.1
+        api.max_retries = 1
+        for _ in range(3):
+            with pytest.raises(Exception):
+                api.api_get("collections/places")
+        calls = len(corpus_server.calls)
+
+        start = time.perf_counter()
+        with pytest.raises(CircuitOpenError):
+            api.api_get("collections/places")
+        assert time.perf_counter() - start < 0.05
+        assert len(corpus_server.calls) == calls
+
+    def test_client_errors_do_not_trip(self, api, corpus_server):
+        corpus_server.routes[("GET", "/collections/places")] = (404, {"detail": "missing"})
+        for _ in range(5):
+            with pytest.raises(Exception):
+                api.api_get("collections/places")
+        assert api.available()
+        assert len(corpus_server.calls) == 5  # 4xx is not retried
+
+    def test_retries_transient_failure(self, api, corpus_server):
+        responses = iter([(500, {}), (200, {"data": []})])
+        corpus_server.routes[("GET", "/collections/places")] = lambda request: next(responses)
+
+        assert api.api_get("collections/places") == {"data": []}
+        assert len(corpus_server.calls) == 2
+
+    def test_storage_skips_open_circuit(self, api, secrets, corpus_server):
+        corpus_server.routes[("GET", "/collections/places")] = (200, {"data": [{"name": "Remote"}]})
+        storage = Storage()
+        guard = BackendGuard.get(f"corpus:{corpus_server.url}")
+        for _ in range(3):
+            guard.breaker.record_failure()
+
+        assert storage.load_places() == []
+        assert corpus_server.calls == []
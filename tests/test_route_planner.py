@@ -0,0 +1,114 @@
+import itertools
+import threading
+import numpy as np
+import pytest
+from utils.ai_modules import AIModule
+from utils.route_planner import (DistanceMatrix, RoutePlanner, haversine_matrix, nearest_neighbour_tour,
+                                 tour_length, two_opt)
+from utils.storage import Storage, haversine_km
+
+PLACES = [
+    ("Charminar", "Hyderabad", "Heritage", 17.3616, 78.4747),
+    ("Golconda Fort", "Hyderabad", "Heritage", 17.3833, 78.4011),
+    ("Chowmahalla Palace", "Hyderabad", "Heritage", 17.3578, 78.4717),
+    ("Bhongir Fort", "Yadadri", "Heritage", 17.5106, 78.8890),
+    ("Warangal Fort", "Warangal", "Heritage", 17.9575, 79.6149),
+    ("Thousand Pillar Temple", "Warangal", "Heritage", 18.0037, 79.5748),
+    ("Ramappa Temple", "Mulugu", "Heritage", 18.2592, 79.9431),
+    ("Bogatha Waterfalls", "Mulugu", "Nature", 18.4139, 80.3839),
+]
+
+
+@pytest.fixture
+def storage(secrets):
+    storage = Storage()
+    for name, district, category, lat, lon in PLACES:
+        storage.save_place({"name": name, "district": district, "category": category, "season": "All",
+                            "description": f"About {name}", "lat": lat, "lon": lon})
+    return storage
+
+
+class TestDistanceMatrix:
+    def test_matches_scalar_haversine(self):
+        lats, lons = np.array([17.36, 18.26, 17.96]), np.array([78.47, 79.94, 79.61])
+        matrix = haversine_matrix(lats, lons, lats, lons)
+        assert matrix[0, 1] == pytest.approx(haversine_km(17.36, 78.47, 18.26, 79.94))
+        assert np.allclose(matrix, matrix.T) and np.allclose(np.diag(matrix), 0)
+
+    def test_incremental_growth_and_moves(self):
+        matrix = DistanceMatrix()
+        matrix.rows(["a", "b"], np.array([17.0, 18.0]), np.array([78.0, 79.0]))
+        assert matrix.computed == 4
+
+        rows = matrix.rows(["b", "c"], np.array([18.0, 17.5]), np.array([79.0, 78.5]))
+        assert matrix.computed == 4 + 3 and len(matrix) == 3
+        assert matrix.submatrix(rows)[0, 1] == pytest.approx(haversine_km(18.0, 79.0, 17.5, 78.5), rel=1e-6)
+
+        rows = matrix.rows(["a", "c"], np.array([16.0, 17.5]), np.array([78.0, 78.5]))
+        assert matrix.submatrix(rows)[0, 1] == pytest.approx(haversine_km(16.0, 78.0, 17.5, 78.5), rel=1e-6)
+
+    def test_starts_over_past_capacity(self):
+        matrix = DistanceMatrix(max_places=3)
+        matrix.rows(["a", "b", "c"], np.zeros(3), np.arange(3.0))
+        matrix.rows(["d"], np.zeros(1), np.ones(1))
+        assert len(matrix) == 1
+
+
+    def test_reset_cannot_slip_between_rows_and_distances(self):
+        matrix = DistanceMatrix()
+        locate = matrix._locate
+        clearing = threading.Thread(target=matrix.clear)
+
+        def locate_then_clear(*args):
+            rows = locate(*args)
+            clearing.start()
+            clearing.join(0.05)
+            assert clearing.is_alive()  # waits for the lock
+            return rows
+
+        matrix._locate = locate_then_clear
+        _, between = matrix.rows_and_submatrix(["a", "b"], np.array([17.0, 18.0]), np.array([78.0, 79.0]))
+        clearing.join(5)
+        assert between[0, 1] == pytest.approx(haversine_km(17.0, 78.0, 18.0, 79.0), rel=1e-6)
+        assert len(matrix) == 0
+
+class TestSolver:
+    def test_two_opt_matches_brute_force_on_small_tours(self):
+        rng = np.random.default_rng(3)
+        points = rng.uniform(0, 1, size=(7, 2))
+        dist = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+        tour = two_opt(nearest_neighbour_tour(dist), dist, deadline=float("inf"))
+
+        best = min(tour_length((0, *p, 0), dist) for p in itertools.permutations(range(1, 7)))
+        assert sorted(tour[1:-1]) == list(range(1, 7)) and tour[0] == tour[-1] == 0
+        assert tour_length(tour, dist) <= best * 1.05
+
+
+class TestRoutePlanner:
+    def test_plan_groups_nearby_places_per_day(self, storage):
+        plan = RoutePlanner(storage, per_day=3).plan("Hyderabad", 2, ["Heritage"])
+
+        days = [{p["name"] for p in day["places"]} for day in plan["days"]]
+        assert len(days) == 2 and sum(map(len, days)) == 6
+        assert "Bogatha Waterfalls" not in set().union(*days)
+        assert {"Charminar", "Chowmahalla Palace"} <= days[0] or {"Charminar", "Chowmahalla Palace"} <= days[1]
+        assert plan["total_km"] == pytest.approx(sum(d["distance_km"] for d in plan["days"]), abs=0.2)
+
+    def test_plan_is_deterministic_and_reuses_matrix(self, storage):
+        planner = RoutePlanner(storage)
+        first = planner.plan("Warangal", 2, ["Heritage"], "Winter")
+        computed = planner.matrix.computed
+        second = planner.plan("Warangal", 2, ["Heritage"], "Winter")
+
+        assert first["days"] == second["days"]
+        assert planner.matrix.computed == computed
+
+    def test_unknown_interest_uses_any_place(self, storage):
+        plan = RoutePlanner(storage, per_day=2).plan("Mulugu", 1, ["Shopping"])
+        assert {p["name"] for p in plan["days"][0]["places"]} == {"Ramappa Temple", "Bogatha Waterfalls"}
+
+    def test_fallback_itinerary_uses_routes(self, storage):
+        text = "".join(AIModule(storage)._fallback_itinerary("Hyderabad", 3, ["Heritage"], "Low", "Winter"))
+
+        assert text.count("Day ") == 3
+        assert "Charminar" in text and "Lunch: Recommendation for Low budget" in text
@@ -0,0 +1,82 @@
+import re
+import subprocess
+import sys
+import zlib
+import numpy as np
+import pytest
+from utils.semantic_index import EmbeddingIndex
+from utils.storage import Storage
+
+
+def hashing_encoder(texts, dim=64):
+    """Deterministic bag-of-words embedding, good enough to rank overlaps"""
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in re.findall(r"\w+", text.lower()):
+            vectors[i, zlib.crc32(word.encode()) % dim] += 1.0
+    return vectors
+
+
+@pytest.fixture
+def index(tmp_path):
+    return EmbeddingIndex(tmp_path / "embeddings", encoder=hashing_encoder)
+
+
+class TestEmbeddingIndex:
+    def test_top_k(self, index):
+        index.upsert([("lake", "hussain sagar lake boating"), ("fort", "golconda fort ruins"),
+                      ("temple", "ramappa temple carvings")])
+
+        results = index.search("boating on a lake", k=2)
+
+        assert results[0][0] == "lake"
+        assert len(results) == 2
+        assert results[0][1] >= results[1][1]
+
+    def test_incremental_overwrite(self, index):
+        index.upsert([("a", "golconda fort"), ("b", "bogatha waterfalls")])
+        index.upsert([("a", "laknavaram lake bridge")])
+
+        assert len(index) == 2
+        assert index.search("lake bridge", k=1)[0][0] == "a"
+
+    def test_persists_across_instances(self, index, tmp_path):
+        index.upsert([("fort", "golconda fort ruins"), ("lake", "hussain sagar lake")])
+
+        reopened = EmbeddingIndex(tmp_path / "embeddings", encoder=hashing_encoder)
+
+        assert len(reopened) == 2
+        assert reopened.search("fort", k=1)[0][0] == "fort"
+
+    def test_ann_matches_exact_for_duplicates(self, tmp_path):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((500, 32)).astype(np.float32)
+        index = EmbeddingIndex(tmp_path / "ann", encoder=lambda texts: vectors[[int(t) for t in texts]],
+                               ann_bits=6, ann_threshold=100)
+        index.upsert([(f"p{i}", str(i)) for i in range(500)])
+        query = vectors[42] / np.linalg.norm(vectors[42])
+
+        assert index.search_vector(query, k=1)[0][0] == "p42"
+        index.upsert([("p500", "7")])
+        assert {pid for pid, _ in index.search_vector(vectors[7] / np.linalg.norm(vectors[7]), k=2)} == {"p7", "p500"}
+
+
+class TestStorageSemanticSearch:
+    def test_save_place_indexes(self, secrets, monkeypatch):
+        secrets["semantic_search"] = True
+        storage = Storage()
+        monkeypatch.setattr(storage.semantic, "_encoder", hashing_encoder)
+        for name, description in [("Golconda Fort", "hilltop fort ruins"),
+                                  ("Hussain Sagar", "heart shaped lake with boating")]:
+            storage.save_place({"name": name, "district": "Hyderabad", "category": "Heritage",
+                                "season": "All", "description": description})
+
+        results = storage.semantic_search("lake boating", k=1)
+
+        assert results[0]["name"] == "Hussain Sagar"
+        assert "similarity" in results[0]
+
+    def test_storage_import_defers_numpy_and_pil(self):
+        code = "import sys, utils.storage; print(sorted(m for m in ('numpy', 'PIL') if m in sys.modules))"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        assert out.strip() == "[]"
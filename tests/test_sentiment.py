@@ -0,0 +1,87 @@
+import time
+import pytest
+from utils.sentiment import LexiconScorer, TransformersScorer
+from utils.storage import Storage
+
+
+class TestLexiconScorer:
+    @pytest.mark.parametrize("text,label", [
+        ("Absolutely stunning views and very friendly guides", "Positive"),
+        ("Dirty, overcrowded and overpriced", "Negative"),
+        ("The fort opens at nine", "Neutral"),
+        ("Not worth the trip", "Negative"),
+        ("The queue was long and crowded but the carvings are magnificent", "Positive"),
+        ("Wasn't bad at all", "Positive"),
+    ])
+    def test_labels(self, text, label):
+        assert LexiconScorer().score_one(text)[0] == label
+
+    def test_scores_are_bounded(self):
+        label, score = LexiconScorer().score_one("great " * 50)
+        assert label == "Positive" and 0 < score < 1
+
+
+class TestTransformersScorer:
+    def test_maps_binary_labels(self):
+        outputs = [{"label": "POSITIVE", "score": 0.99}, {"label": "NEGATIVE", "score": 0.97},
+                   {"label": "POSITIVE", "score": 0.55}]
+        scorer = TransformersScorer("stub", loader=lambda name: lambda texts, **kwargs: outputs[:len(texts)])
+
+        assert [label for label, _ in scorer.score(["a", "b", "c"])] == ["Positive", "Negative", "Neutral"]
+        assert scorer.name == "stub"
+
+    def test_falls_back_to_lexicon(self):
+        def broken(name):
+            raise ImportError("No module named 'transformers'")
+
+        scorer = TransformersScorer("missing", loader=broken)
+        assert scorer.score(["lovely lake"]) == [LexiconScorer().score_one("lovely lake")]
+        assert scorer.name == "lexicon"
+
+
+class TestSentimentWorker:
+    def test_scores_backlog_in_batches(self, secrets):
+        secrets["ai"]["sentiment_batch_size"] = 2
+        storage = Storage()
+        for text in ["Lovely lake, great sunset", "Dirty and crowded", "Opens at nine"]:
+            storage.save_feedback({"place": "Hussain Sagar", "feedback": text})
+        assert storage.sentiment_stats()["backlog"] == 3
+
+        assert storage.sentiment.score_pending() == 3
+
+        sentiments = {f["feedback"]: f["sentiment"] for f in storage.load_feedback()}
+        assert sentiments == {"Lovely lake, great sunset": "Positive", "Dirty and crowded": "Negative",
+                              "Opens at nine": "Neutral"}
+        stats = storage.sentiment_stats()
+        assert stats["backlog"] == 0 and stats["scored_total"] == 3 and stats["rows_per_sec"] > 0
+
+    def test_background_worker_scores_new_feedback(self, secrets):
+        secrets["ai"].update({"sentiment_worker": True, "sentiment_poll_seconds": 30})
+        storage = Storage()
+        storage.save_feedback({"place": "Ramappa Temple", "feedback": "Magnificent carvings"})
+
+        deadline = time.time() + 5
+        while storage.sentiment_stats()["backlog"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert storage.sentiment_stats()["worker_running"]
+        assert storage.load_feedback()[0]["sentiment"] == "Positive"
+
+    def test_edited_text_is_not_overwritten(self, secrets):
+        storage = Storage()
+        storage.save_feedback({"place": "Golconda Fort", "feedback": "Terrible"})
+        scorer = storage.sentiment.scorer
+
+        class EditingScorer:
+            name = "editing"
+
+            def score(self, texts):
+                with storage.db.connection() as conn:
+                    conn.execute("UPDATE feedback SET feedback = 'Wonderful'")
+                return scorer.score(texts)
+
+        storage.sentiment.scorer = EditingScorer()
+        storage.sentiment.score_batch()
+        storage.sentiment.scorer = scorer
+        assert storage.sentiment.backlog() == 1
+        storage.sentiment.score_pending()
+        assert storage.load_feedback()[0]["sentiment"] == "Positive"
@@ -0,0 +1,74 @@
+import pytest
+from utils.storage import Storage, haversine_km
+
+
+def make_place(name, lat, lon, category="Heritage"):
+    return {"name": name, "district": "Hyderabad", "category": category, "season": "All",
+            "description": f"About {name}", "lat": lat, "lon": lon}
+
+
+@pytest.fixture
+def storage(secrets):
+    storage = Storage()
+    storage.save_place(make_place("Charminar", 17.3616, 78.4747))
+    storage.save_place(make_place("Golconda Fort", 17.3833, 78.4011))
+    storage.save_place(make_place("Hussain Sagar", 17.4239, 78.4738, category="Nature"))
+    storage.save_place(make_place("Ramappa Temple", 18.2592, 79.9431))
+    storage.save_place(make_place("Kuntala Waterfall", 19.2167, 78.4667, category="Nature"))
+    return storage
+
+
+def grid_total(storage, zoom):
+    with storage.db.connection() as conn:
+        return conn.execute("SELECT COALESCE(SUM(count), 0) FROM place_grid WHERE zoom = ?", (zoom,)).fetchone()[0]
+
+
+class TestSpatialQueries:
+    def test_bbox(self, storage):
+        names = [p["name"] for p in storage.places_in_bbox(17.3, 78.3, 17.5, 78.5)]
+        assert names == ["Charminar", "Golconda Fort", "Hussain Sagar"]
+
+        nature = storage.places_in_bbox(17.3, 78.3, 17.5, 78.5, category="Nature")
+        assert [p["name"] for p in nature] == ["Hussain Sagar"]
+
+    def test_radius_nearest_first(self, storage):
+        hits = storage.places_within_radius(17.3616, 78.4747, 10)
+
+        assert [h["name"] for h in hits] == ["Charminar", "Hussain Sagar", "Golconda Fort"]
+        assert hits[0]["distance_km"] == 0
+        assert hits[2]["distance_km"] == pytest.approx(haversine_km(17.3616, 78.4747, 17.3833, 78.4011), abs=1e-3)
+        assert all(h["distance_km"] <= 10 for h in hits)
+
+    def test_markers_below_cap_are_exact(self, storage):
+        view = storage.map_markers(15.8, 77.2, 19.9, 81.3, zoom=7)
+
+        assert view["total"] == 5
+        assert view["clusters"] == []
+        assert {m["name"] for m in view["markers"]} >= {"Charminar", "Ramappa Temple"}
+
+    @pytest.mark.parametrize("zoom", [6, 14])
+    def test_markers_cluster_above_cap(self, storage, zoom):
+        view = storage.map_markers(17.0, 78.0, 17.6, 78.6, zoom=zoom, max_markers=2)
+
+        assert view["markers"] == []
+        assert 0 < len(view["clusters"]) <= 2
+        assert sum(c["count"] for c in view["clusters"]) == 3
+
+    def test_grid_follows_writes(self, storage):
+        assert grid_total(storage, 8) == 5
+        with storage.db.connection() as conn:
+            conn.execute("UPDATE places SET lat = 16.5, lon = 80.6 WHERE name = 'Charminar'")
+            conn.execute("DELETE FROM places WHERE name = 'Ramappa Temple'")
+
+        assert grid_total(storage, 8) == 4
+        assert [p["name"] for p in storage.places_in_bbox(16.4, 80.5, 16.6, 80.7)] == ["Charminar"]
+        assert storage.places_in_bbox(18.2, 79.9, 18.3, 80.0) == []
+
+    def test_index_backfilled_for_existing_rows(self, storage):
+        with storage.db.connection() as conn:
+            conn.execute("DROP TABLE places_rtree")
+            conn.execute("DROP TABLE place_grid")
+        Storage()
+
+        assert len(storage.places_in_bbox(15.8, 77.2, 19.9, 81.3)) == 5
+        assert grid_total(storage, 12) == 5
@@ -0,0 +1,91 @@
+import pytest
+from utils.stats import VisitorStats, main
+from utils.storage import Storage
+
+
+@pytest.fixture
+def storage(secrets):
+    storage = Storage()
+    for place, text in [("Charminar", "Lovely at night"), ("Charminar", "Too crowded"),
+                        ("Golconda Fort", "Great sound and light show"), ("Charminar", "Opens at nine")]:
+        storage.save_feedback({"place": place, "feedback": text})
+    for start, days, interests, budget in [("Hyderabad", 2, ["Heritage", "Nature"], "Low"),
+                                           ("Hyderabad", 3, ["Heritage"], "Medium"),
+                                           ("Warangal", 2, "Heritage,Religious", "Low")]:
+        storage.save_itinerary({"start": start, "days": days, "interests": interests, "budget": budget, "plan": "..."})
+    return storage
+
+
+def values(entries):
+    return {e["value"]: e["count"] for e in entries}
+
+
+class TestVisitorStats:
+    def test_counts_follow_writes(self, storage):
+        stats = storage.visitor_stats()
+
+        assert stats["feedback_total"] == 4 and stats["by_sentiment"] == {"Neutral": 4}
+        assert stats["top_places"][0] == {"place": "Charminar", "count": 3, "positive": 0, "negative": 0}
+        assert sum(d["count"] for d in stats["feedback_per_day"]) == 4
+        assert stats["itinerary_total"] == 3
+        assert values(stats["interests"]) == {"Heritage": 3, "Nature": 1, "Religious": 1}
+        assert values(stats["budgets"]) == {"Low": 2, "Medium": 1}
+        assert values(stats["trip_lengths"]) == {"2": 2, "3": 1}
+
+    def test_sentiment_scoring_and_deletes_update_counts(self, storage):
+        storage.sentiment.score_pending()
+        with storage.db.connection() as conn:
+            conn.execute("DELETE FROM feedback WHERE feedback = 'Opens at nine'")
+            conn.execute("DELETE FROM itineraries WHERE start = 'Warangal'")
+
+        stats = storage.visitor_stats()
+        assert stats["by_sentiment"] == {"Positive": 2, "Negative": 1}
+        assert stats["top_places"][0] == {"place": "Charminar", "count": 2, "positive": 1, "negative": 1}
+        assert values(stats["interests"]) == {"Heritage": 2, "Nature": 1}
+        with storage.db.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM itinerary_stats WHERE value = 'Religious'").fetchone()[0] == 0
+
+    def test_rebuild_matches_incremental(self, storage):
+        storage.sentiment.score_pending()
+        before = storage.visitor_stats()
+        with storage.db.connection() as conn:
+            conn.execute("UPDATE feedback_place_stats SET count = 99")
+
+        assert storage.stats.rebuild()["groups"] > 0
+        assert storage.visitor_stats() == before
+
+    def test_cli(self, storage, capsys):
+        assert main(["rebuild"]) == 0
+        assert main(["show", "--top", "1"]) == 0
+        assert '"Charminar"' in capsys.readouterr().out
+
+    def test_interests_with_control_characters(self, storage):
+        storage.save_itinerary({"start": "Hyderabad", "days": 1, "interests": ["Food\tStreet", "Line\nBreak", 'Say "hi"'],
+                                "budget": "Low", "plan": "..."})
+        expected = {"Heritage": 3, "Nature": 1, "Religious": 1, "Food\tStreet": 1, "Line\nBreak": 1, 'Say "hi"': 1}
+        assert values(storage.visitor_stats()["interests"]) == expected
+
+        # An existing database gaining the stats tables backfills them from these rows
+        with storage.db.connection() as conn:
+            conn.execute("DROP TABLE itinerary_stats")
+        assert values(VisitorStats(storage.db).summary()["interests"]) == expected
+
+        with storage.db.connection() as conn:
+            conn.execute("DELETE FROM itineraries WHERE start = 'Hyderabad' AND days = 1")
+        assert "Line\nBreak" not in values(storage.visitor_stats()["interests"])
+
+    def test_stale_itinerary_triggers_are_replaced(self, storage):
+        with storage.db.connection() as conn:
+            conn.execute("DROP TRIGGER itinerary_stats_insert")
+            # The pre-json_quote trigger body, as older databases still have it
+            conn.execute("""
+                CREATE TRIGGER itinerary_stats_insert AFTER INSERT ON itineraries BEGIN
+                    INSERT INTO itinerary_stats (dimension, value, count)
+                    SELECT 'interest', trim(value), 1 FROM json_each('["' || replace(new.interests, ',', '","') || '"]')
+                    WHERE true ON CONFLICT (dimension, value) DO UPDATE SET count = count + 1;
+                END
+            """)
+        VisitorStats(storage.db)
+        storage.save_itinerary({"start": "Hyderabad", "days": 1, "interests": ["Food\tStreet"],
+                                "budget": "Low", "plan": "..."})
+        assert values(storage.visitor_stats()["interests"])["Food\tStreet"] == 1
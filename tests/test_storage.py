@@ -0,0 +1,102 @@
+import pytest
+from utils.storage import Storage
+
+
+def make_place(name, district="Hyderabad", category="Heritage", season="Winter"):
+    return {"name": name, "district": district, "category": category,
+            "season": season, "description": f"About {name}"}
+
+
+@pytest.fixture
+def storage(secrets):
+    storage = Storage()
+    for i in range(7):
+        storage.save_place(make_place(f"Fort {i}"))
+    storage.save_place(make_place("Bogatha Falls", district="Mulugu", category="Nature", season="Monsoon"))
+    storage.save_place(make_place("Ramappa Temple", district="Mulugu", season="All"))
+    return storage
+
+
+class TestQueryPlaces:
+    def test_filters(self, storage):
+        page = storage.query_places(district="Mulugu")
+        assert [p["name"] for p in page["items"]] == ["Bogatha Falls", "Ramappa Temple"]
+        assert page["next_cursor"] is None
+
+        assert [p["name"] for p in storage.query_places(category="Nature")["items"]] == ["Bogatha Falls"]
+
+    def test_season_includes_all(self, storage):
+        names = [p["name"] for p in storage.query_places(district="Mulugu", season="Winter")["items"]]
+        assert names == ["Ramappa Temple"]
+
+    def test_keyset_pagination(self, storage):
+        seen, cursor = [], None
+        while True:
+            page = storage.query_places(category="Heritage", limit=3, cursor=cursor)
+            seen.extend(p["name"] for p in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert seen == [f"Fort {i}" for i in range(7)] + ["Ramappa Temple"]
+
+    def test_invalid_cursor(self, storage):
+        with pytest.raises(ValueError):
+            storage.query_places(cursor="not-a-cursor")
+
+    def test_filter_uses_index(self, storage):
+        with storage.db.connection() as conn:
+            plan = " ".join(row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM places WHERE district = ? AND category = ? "
+                "ORDER BY name, id", ("Mulugu", "Nature")))
+        assert "USING INDEX idx_places_" in plan
+        assert "SCAN places" not in plan
+
+    def test_save_invalidates_queries(self, storage):
+        assert len(storage.query_places(district="Warangal")["items"]) == 0
+        storage.save_place(make_place("Thousand Pillar Temple", district="Warangal"))
+        assert len(storage.query_places(district="Warangal")["items"]) == 1
+
+    def test_api_receives_filters(self, secrets, corpus_server):
+        secrets["corpus"].update({"use_api": True, "base_url": corpus_server.url, "sync": False})
+        corpus_server.routes[("GET", "/collections/places")] = (
+            200, {"items": [{"name": "Bogatha Falls"}], "next_cursor": "abc"})
+
+        page = Storage().query_places(district="Mulugu", category="Nature", limit=10)
+
+        assert page == {"items": [{"name": "Bogatha Falls"}], "next_cursor": "abc"}
+        assert corpus_server.calls[-1].query == {"district": "Mulugu", "category": "Nature", "limit": "10"}
+
+
+class TestSearch:
+    def test_prefix_and_ranking(self, storage):
+        storage.save_place({**make_place("Warangal Fort", district="Warangal"),
+                            "description": "Kakatiya ruins and stone gateways"})
+        storage.save_place({**make_place("Bhadrakali Temple", district="Warangal"),
+                            "description": "Hilltop temple near Warangal Fort"})
+
+        hits = storage.search("warang fort", scopes=("places",))["places"]
+
+        assert [h["name"] for h in hits[:2]] == ["Warangal Fort", "Bhadrakali Temple"]
+        assert "**Warangal**" in hits[0]["snippet"] or "**Fort**" in hits[0]["snippet"]
+
+    def test_index_follows_updates(self, storage):
+        storage.save_place({**make_place("Fort 1"), "description": "Now a museum of miniatures"})
+
+        assert [h["name"] for h in storage.search("miniatures")["places"]] == ["Fort 1"]
+        assert "Fort 1" not in [h["name"] for h in storage.search("about")["places"]]
+        with storage.db.connection() as conn:
+            conn.execute("INSERT INTO places_fts (places_fts) VALUES ('integrity-check')")
+
+    def test_feedback_search(self, storage):
+        storage.save_feedback({"place": "Fort 0", "feedback": "Sunset views were breathtaking"})
+
+        hits = storage.search("breath", scopes=("feedback",))["feedback"]
+
+        assert hits[0]["place"] == "Fort 0"
+        assert "**breathtaking**" in hits[0]["snippet"]
+
+    def test_query_syntax_is_escaped(self, storage):
+        assert len(storage.search('fort" (:*')["places"]) == 7
+        assert storage.search("fort NOT temple")["places"] == []
+        assert storage.search("   ") == {"places": [], "feedback": []}
@@ -0,0 +1,137 @@
+import json
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+import pytest
+from utils.ai_modules import AIModule
+from utils.http_pool import SessionPool
+from utils.local_model import LocalModel
+
+TOKENS = ["Day 1:", " Charminar", " and", " Laad Bazaar"]
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length))
+        self.server.requests.append(payload)
+        if self.server.fail:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for text in TOKENS:
+            event = {"token": {"text": text, "special": False}}
+            self._chunk(f"data: {json.dumps(event)}\n\n".encode())
+            time.sleep(self.server.token_delay)
+        end = {"token": {"text": "</s>", "special": True}, "generated_text": "".join(TOKENS)}
+        self._chunk(f"data: {json.dumps(end)}\n\n".encode())
+        self._chunk(b"")
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeStreamer:
+    """Stands in for transformers.TextIteratorStreamer"""
+    def __init__(self, tokenizer, timeout=None, **kwargs):
+        self.queue = queue.Queue()
+        self.timeout = timeout
+
+    def put(self, text):
+        self.queue.put(text)
+
+    def end(self):
+        self.queue.put(None)
+
+    def __iter__(self):
+        while (text := self.queue.get(timeout=self.timeout)) is not None:
+            yield text
+
+
+class EndlessPipeline:
+    """Emits a token every 10 ms until a stopping criterion fires"""
+    tokenizer = None
+
+    def __init__(self):
+        self.tokens = 0
+        self.stopped = threading.Event()
+
+    def __call__(self, prompt, streamer, stopping_criteria=(), **kwargs):
+        while not any(stop(None, None) for stop in stopping_criteria) and self.tokens < 500:
+            self.tokens += 1
+            streamer.put(f" t{self.tokens}")
+            time.sleep(0.01)
+        streamer.end()
+        self.stopped.set()
+
+
+@pytest.fixture
+def hf_server(secrets):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SSEHandler)
+    httpd.requests, httpd.fail, httpd.token_delay = [], False, 0.0
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    secrets["ai"].update({
+        "use_hf_inference": True,
+        "hf_api_key": "test-key",
+        "hf_inference_url": f"http://127.0.0.1:{httpd.server_address[1]}"
+    })
+    yield httpd
+    httpd.shutdown()
+    SessionPool.close_all()
+
+
+class TestItineraryStreaming:
+    def test_hf_tokens_streamed_and_cached(self, hf_server):
+        ai = AIModule()
+
+        chunks = list(ai.generate_itinerary_stream("Hyderabad", 1, ["Heritage"], "Low", "Winter"))
+
+        assert chunks == TOKENS
+        assert hf_server.requests[0]["stream"] is True
+        assert ai.generate_itinerary("Hyderabad", 1, ["Heritage"], "Low", "Winter") == "".join(TOKENS)
+        assert len(hf_server.requests) == 1
+
+    def test_first_chunk_before_generation_finishes(self, hf_server):
+        hf_server.token_delay = 0.2
+        stream = AIModule().generate_itinerary_stream("Warangal", 1, ["Nature"], "Low", "Monsoon")
+
+        start = time.perf_counter()
+        next(stream)
+        assert time.perf_counter() - start < 0.2 * len(TOKENS) / 2
+        list(stream)
+
+    def test_fallback_streams_day_by_day(self, hf_server):
+        hf_server.fail = True
+
+        chunks = list(AIModule().generate_itinerary_stream("Nalgonda", 3, ["Heritage"], "Low", "Winter"))
+
+        assert len(chunks) == 3
+        assert chunks[0].startswith("Day 1:")
+        assert chunks[2].startswith("\n\nDay 3:")
+
+    def test_abandoned_stream_stops_the_local_model(self, secrets, monkeypatch):
+        secrets["ai"]["local_fallback"] = True
+        monkeypatch.setitem(sys.modules, "transformers", SimpleNamespace(TextIteratorStreamer=FakeStreamer))
+        pipeline = EndlessPipeline()
+        model = LocalModel("google/flan-t5-small", loader=lambda name: pipeline)
+        monkeypatch.setattr(LocalModel, "_instances", {"google/flan-t5-small": model})
+
+        stream = AIModule().generate_itinerary_stream("Hyderabad", 1, ["Heritage"], "Low", "Winter")
+        assert next(stream) == " t1"
+        # What a Streamlit rerun does to the page's loop
+        stream.close()
+        assert pipeline.stopped.wait(2) and pipeline.tokens < 500
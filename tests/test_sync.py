@@ -0,0 +1,115 @@
+import pytest
+from utils.storage import Storage
+
+
+class FakeCorpusCollection:
+    """Stub route that honours updated_since and If-None-Match"""
+    def __init__(self, records):
+        self.records = list(records)
+
+    def etag(self):
+        return f'"{len(self.records)}-{max((r["updated_at"] for r in self.records), default="")}"'
+
+    def __call__(self, request):
+        if request.headers.get("If-None-Match") == self.etag():
+            return 304, None, {"ETag": self.etag()}
+        since = request.query.get("updated_since", "")
+        changed = [r for r in self.records if r["updated_at"] > since]
+        return 200, {"data": changed}, {"ETag": self.etag()}
+
+
+def place(name, updated_at, **extra):
+    return {"name": name, "district": "Hyderabad", "category": "Heritage", "updated_at": updated_at, **extra}
+
+
+@pytest.fixture
+def places(corpus_server):
+    collection = FakeCorpusCollection([place("Golconda Fort", "2024-01-01"), place("Charminar", "2024-01-02")])
+    corpus_server.routes[("GET", "/collections/places")] = collection
+    return collection
+
+
+@pytest.fixture
+def storage(secrets, corpus_server):
+    secrets["corpus"].update({"use_api": True, "base_url": corpus_server.url, "outbox_worker": False})
+    return Storage()
+
+
+class TestSyncEngine:
+    def test_initial_sync_fills_mirror(self, storage, places, corpus_server):
+        assert [p["name"] for p in storage.load_places()] == ["Charminar", "Golconda Fort"]
+        assert corpus_server.calls[0].query == {}
+        assert storage.sync_status()["places"]["rows_total"] == 2
+
+    def test_unchanged_collection_is_not_modified(self, storage, places, corpus_server):
+        storage.sync.sync("places")
+        result = storage.sync.sync("places")
+
+        assert result["status"] == 304
+        assert result["upserted"] == 0
+        assert corpus_server.calls[-1].headers["If-None-Match"] == places.etag()
+
+    def test_only_changes_are_fetched(self, storage, places, corpus_server):
+        storage.sync.sync("places")
+        places.records.append(place("Ramappa Temple", "2024-02-01"))
+        places.records.append(place("Golconda Fort", "2024-02-02", deleted=True))
+
+        result = storage.sync.sync("places")
+
+        assert corpus_server.calls[-1].query == {"updated_since": "2024-01-02"}
+        assert (result["upserted"], result["deleted"]) == (1, 1)
+        assert [p["name"] for p in storage._load_local_places()] == ["Charminar", "Ramappa Temple"]
+        assert storage.sync_status()["places"]["high_water"] == "2024-02-02"
+
+    def test_remote_feedback_adopts_local_copy(self, storage, corpus_server):
+        storage.save_feedback({"place": "Charminar", "feedback": "Crowded but lovely"})
+        corpus_server.routes[("GET", "/collections/feedback")] = (200, [
+            {"id": 91, "place": "Charminar", "feedback": "Crowded but lovely", "updated_at": "2024-03-01"},
+            {"id": 92, "place": "Charminar", "feedback": "Great biryani nearby", "updated_at": "2024-03-02"}
+        ])
+
+        storage.sync.sync("feedback")
+
+        rows = storage._load_local_feedback()
+        assert sorted(r["remote_id"] for r in rows) == ["91", "92"]
+
+    def test_remote_place_adopts_local_copy(self, storage, corpus_server):
+        corpus_server.routes[("POST", "/collections/places")] = (201, {"ok": True})
+        storage.save_place({"name": "Golconda Fort", "district": "Hyderabad", "category": "Heritage",
+                            "season": "Winter", "description": "Hilltop fortress"})
+        assert storage.outbox.flush(storage.api)["sent"] == 1
+        corpus_server.routes[("GET", "/collections/places")] = FakeCorpusCollection([
+            place("Golconda Fort", "2024-03-01", id="uuid-1", season="Winter", description="Hilltop fortress")
+        ])
+
+        storage.sync.sync("places")
+
+        with storage.db.connection() as conn:
+            rows = conn.execute("SELECT id, name FROM places").fetchall()
+        assert [tuple(row) for row in rows] == [("uuid-1", "Golconda Fort")]
+
+    def test_local_sentiment_survives_unchanged_text(self, storage, corpus_server):
+        records = [
+            {"id": 91, "place": "Charminar", "feedback": "Crowded but lovely", "updated_at": "2024-03-01"},
+            {"id": 92, "place": "Charminar", "feedback": "Fine", "updated_at": "2024-03-01"}
+        ]
+        corpus_server.routes[("GET", "/collections/feedback")] = (200, records)
+        storage.sync.sync("feedback")
+        storage.sentiment.score_pending()
+
+        records[1] = {**records[1], "feedback": "Dirty", "updated_at": "2024-03-02"}
+        storage.sync.sync("feedback")
+
+        assert storage.sentiment.backlog() == 1
+        storage.sentiment.score_pending()
+        rows = {r["remote_id"]: r["sentiment"] for r in storage._load_local_feedback()}
+        assert rows == {"91": "Positive", "92": "Negative"}
+
+    def test_reads_survive_outage(self, storage, places, corpus_server):
+        storage.sync.sync("places")
+        corpus_server.routes[("GET", "/collections/places")] = (503, {"detail": "down"})
+
+        with pytest.raises(Exception):
+            storage.sync.sync("places")
+        assert len(storage._load_local_places()) == 2
+        assert "503" in storage.sync_status()["places"]["last_error"]
@@ -35,6 +35,15 @@ class TestValidators:
         with pytest.raises(ValueError):
             Validators.validate_image(b'invalid')
 
+    def test_validate_image_base64(self):
+        img_bytes = io.BytesIO()
+        Image.new('RGB', (10, 10), color='blue').save(img_bytes, format='PNG')
+        data_url = "data:image/png;base64," + base64.b64encode(img_bytes.getvalue()).decode()
+
+        assert Validators.validate_image(data_url).size == (10, 10)
+        with pytest.raises(ValueError):
+            Validators.validate_image("not a data url")
+
     def test_validate_place_data(self):
         valid_data = {
             'name': 'Test Place',
@@ -1,28 +1,63 @@
 # utils/ai_modules.py
+import os
+import time
 import streamlit as st
-import requests
-from typing import List, Optional
-from transformers import pipeline
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
 from .config import Config
+from .decorators import rate_limited
+from .itinerary_cache import ItineraryCache
+from .http_pool import SessionPool
+from .executor import TaskExecutor
+from .local_model import LocalModel, generate_in_worker
+from .metrics import observe, timer
+from .resilience import BackendGuard, is_http_failure
+from .route_planner import RoutePlanner
+from .storage import Storage
 import logging
 
 logger = logging.getLogger(__name__)
 
 class AIModule:
-    def __init__(self):
+    def __init__(self, storage: Optional[Storage] = None):
         self.config = Config.get_ai_config()
-        self.local_model = None
-        
-        if self.config['local_fallback']:
-            try:
-                self.local_model = pipeline(
-                    "text2text-generation",
-                    model=self.config['model_name'],
-                    device="cpu"
-                )
-            except Exception as e:
-                logger.warning(f"Failed to load local model: {str(e)}")
-                self.local_model = None
+        self.hf_url = self.config['hf_inference_url'].rstrip('/')
+        self.session = SessionPool.get_session(self.hf_url)
+        self.hf_guard = BackendGuard.get(
+            f"hf:{self.hf_url}",
+            timeout=self.config['hf_timeout'],
+            **Config.get_resilience_config()
+        )
+        # Loaded on first use and shared by every AIModule in the process
+        self.local = LocalModel.shared(
+            self.config['model_name'],
+            idle_unload_seconds=self.config['idle_unload_seconds'],
+            batch_max_size=self.config['batch_max_size'],
+            batch_max_wait_ms=self.config['batch_max_wait_ms'],
+            batch_queue_depth=self.config['batch_queue_depth']
+        ) if self.config['local_fallback'] else None
+
+        if self.local and self.config['warm_up']:
+            self.local.warm_up(background=True)
+
+        # Without a model, itineraries are routed over the stored places
+        self.planner = RoutePlanner(
+            storage,
+            per_day=self.config['places_per_day'],
+            time_budget_ms=self.config['route_time_budget_ms']
+        ) if storage is not None else None
+
+        self.cache = None
+        if self.config['cache_itineraries']:
+            app_config = Config.get_app_config()
+            os.makedirs(app_config['data_dir'], exist_ok=True)
+            self.cache = ItineraryCache.for_path(
+                Path(app_config['data_dir']) / 'app.db',
+                sqlite=app_config['sqlite'],
+                ttl_seconds=self.config['cache_ttl_hours'] * 3600,
+                max_entries=self.config['cache_max_entries']
+            )
 
     def _hf_generate(self, prompt: str) -> str:
         """Generate text using Hugging Face Inference API"""
@@ -38,45 +73,159 @@ class AIModule:
             }
         }
         
-        try:
-            response = requests.post(
-                f"https://api-inference.huggingface.co/models/{self.config['model_name']}",
+        def send(timeout: float) -> str:
+            response = self.session.post(
+                f"{self.hf_url}/models/{self.config['model_name']}",
                 headers=headers,
                 json=payload,
-                timeout=60
+                timeout=timeout
             )
             response.raise_for_status()
             result = response.json()
             return result[0]['generated_text'] if isinstance(result, list) else str(result)
+
+        try:
+            # No retries here: the local model and template fallbacks are the retry
+            return self.hf_guard.call(send, is_failure=is_http_failure)
         except Exception as e:
             logger.error(f"HF API Error: {str(e)}")
             raise
 
+    def _hf_generate_stream(self, prompt: str) -> Iterator[str]:
+        """Stream generated text from the Hugging Face Inference API as it arrives"""
+        if not self.config['hf_api_key']:
+            raise ValueError("Hugging Face API key is missing")
+
+        headers = {"Authorization": f"Bearer {self.config['hf_api_key']}"}
+        payload = {
+            "inputs": prompt,
+            "parameters": {
+                "max_new_tokens": 500,
+                "temperature": 0.7
+            },
+            "stream": True
+        }
+
+        try:
+            # Latency is not recorded: a full stream's duration says nothing about time to first byte
+            with self.hf_guard.track(is_http_failure, record_latency=False) as timeout, self.session.post(
+                f"{self.hf_url}/models/{self.config['model_name']}",
+                headers=headers,
+                json=payload,
+                timeout=timeout,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                if 'text/event-stream' not in response.headers.get('Content-Type', ''):
+                    # Endpoint does not stream: deliver the whole result as one chunk
+                    result = response.json()
+                    yield result[0]['generated_text'] if isinstance(result, list) else str(result)
+                    return
+
+                for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                    if not line or not line.startswith('data:'):
+                        continue
+                    event = json.loads(line[len('data:'):].strip())
+                    token = event.get('token') or {}
+                    if token.get('text') and not token.get('special'):
+                        yield token['text']
+        except Exception as e:
+            logger.error(f"HF API Error: {str(e)}")
+            raise
+
+    @rate_limited("generate")
+    def generate_itinerary_stream(self, city: str, days: int, interests: List[str],
+                                  budget: str, season: str) -> Iterator[str]:
+        """Yield itinerary text chunks as soon as each backend produces them"""
+        params = ItineraryCache.normalize(city, days, interests, budget, season, self.config['model_name'])
+        key = ItineraryCache.make_key(params)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        prompt = self._build_prompt(city, days, interests, budget, season)
+        backends = []
+        if self.config['use_hf_inference']:
+            backends.append(("HF", "hf", self._hf_generate_stream))
+        if self.local:
+            backends.append(("Local model", "local", self.local.generate_stream))
+
+        for name, label, backend in backends:
+            chunks = []
+            start = time.perf_counter()
+            stream = backend(prompt)
+            try:
+                for chunk in stream:
+                    if not chunks:
+                        observe("generation_first_chunk", time.perf_counter() - start, backend=label)
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as e:
+                observe("generation_stream", time.perf_counter() - start, error=True, backend=label)
+                if chunks:
+                    # Text already reached the user; end the stream rather than restart
+                    logger.warning(f"{name} stream interrupted: {str(e)}")
+                    return
+                logger.warning(f"{name} streaming failed: {str(e)}")
+                continue
+            finally:
+                # An abandoned stream (rerun, disconnect) stops the model or closes the HTTP response now
+                stream.close()
+            if chunks:
+                observe("generation_stream", time.perf_counter() - start, backend=label)
+                if self.cache:
+                    self.cache.put(key, params, "".join(chunks))
+                return
+
+        start = time.perf_counter()
+        yield from self._fallback_itinerary(city, days, interests, budget, season)
+        observe("generation_stream", time.perf_counter() - start, backend="fallback")
+
+    @rate_limited("generate")
     def generate_itinerary(self, city: str, days: int, interests: List[str], 
                          budget: str, season: str) -> str:
-        """Generate travel itinerary with fallback logic"""
+        """Generate travel itinerary, reusing results for identical requests"""
+        if not self.cache:
+            return self._generate(city, days, interests, budget, season)[0]
+
+        params = ItineraryCache.normalize(city, days, interests, budget, season, self.config['model_name'])
+        return self.cache.get_or_generate(
+            params,
+            lambda: self._generate(city, days, interests, budget, season)
+        )
+
+    def _generate(self, city: str, days: int, interests: List[str],
+                  budget: str, season: str) -> Tuple[str, bool]:
+        """Generate travel itinerary with fallback logic; flag marks model output worth caching"""
         prompt = self._build_prompt(city, days, interests, budget, season)
         
         if self.config['use_hf_inference']:
             try:
-                return self._hf_generate(prompt)
+                with timer("generation", backend="hf"):
+                    return self._hf_generate(prompt), True
             except Exception as e:
                 st.warning(f"HF Generation failed: {str(e)}")
                 if not self.config['local_fallback']:
-                    return self._fallback_itinerary(city, days, interests, budget)
+                    with timer("generation", backend="fallback"):
+                        return "".join(self._fallback_itinerary(city, days, interests, budget, season)), False
         
-        if self.local_model:
+        if self.local:
             try:
-                result = self.local_model(
-                    prompt,
-                    max_length=500,
-                    temperature=0.7
-                )
-                return result[0]['generated_text']
+                with timer("generation", backend="local"):
+                    return self._local_generate(prompt), True
             except Exception as e:
                 logger.warning(f"Local model failed: {str(e)}")
         
-        return self._fallback_itinerary(city, days, interests, budget)
+        with timer("generation", backend="fallback"):
+            return "".join(self._fallback_itinerary(city, days, interests, budget, season)), False
+
+    def _local_generate(self, prompt: str) -> str:
+        """Local model output, from a CPU-pool worker when `generate_in_worker` is set"""
+        if self.config['generate_in_worker']:
+            return TaskExecutor.shared().run(TaskExecutor.CPU, generate_in_worker, self.config['model_name'], prompt)
+        return self.local.generate(prompt)
 
     def _build_prompt(self, city: str, days: int, interests: List[str], 
                      budget: str, season: str) -> str:
@@ -89,19 +238,36 @@ class AIModule:
             "Provide restaurant recommendations and travel tips."
         )
 
-    def _fallback_itinerary(self, city: str, days: int, 
-                           interests: List[str], budget: str) -> str:
-        """Simple fallback itinerary generator"""
+    def _route_plan(self, city: str, days: int, interests: List[str], season: Optional[str]) -> Dict[str, Any]:
+        if not self.planner:
+            return {'days': []}
+        try:
+            return self.planner.plan(city, days, interests, season)
+        except Exception as e:
+            logger.warning(f"Route planning failed: {str(e)}")
+            return {'days': []}
+
+    def _fallback_itinerary(self, city: str, days: int, interests: List[str], budget: str,
+                            season: Optional[str] = None) -> Iterator[str]:
+        """Itinerary built from stored places without a model, one day per chunk"""
         interests_str = ', '.join(interests) if interests else 'general'
-        itinerary = []
-        
+        routed = {d['day']: d for d in self._route_plan(city, days, interests, season)['days']}
+        slots = ["Morning", "Afternoon", "Evening"]
+
         for day in range(1, days + 1):
-            day_plan = (
-                f"Day {day}:\n"
-                f"- Morning: Suggested activity based on {interests_str} interests\n"
-                f"- Afternoon: Lunch recommendation for {budget} budget\n"
-                f"- Evening: Leisure activity in {city}"
-            )
-            itinerary.append(day_plan)
-        
-        return "\n\n".join(itinerary)
\ No newline at end of file
+            if day in routed:
+                lines = [f"Day {day} (round trip from {city}, about {routed[day]['distance_km']} km):"]
+                for i, place in enumerate(routed[day]['places']):
+                    slot = slots[i] if i < len(slots) else f"Stop {i + 1}"
+                    lines.append(f"- {slot}: {place['name']} ({place['category']}, {place['district']})")
+                    if i == 0:
+                        lines.append(f"- Lunch: Recommendation for {budget} budget")
+                day_plan = "\n".join(lines)
+            else:
+                day_plan = (
+                    f"Day {day}:\n"
+                    f"- Morning: Suggested activity based on {interests_str} interests\n"
+                    f"- Afternoon: Lunch recommendation for {budget} budget\n"
+                    f"- Evening: Leisure activity in {city}"
+                )
+            yield day_plan if day == 1 else f"\n\n{day_plan}"
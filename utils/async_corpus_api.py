@@ -0,0 +1,135 @@
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Awaitable
+from .corpus_api import CorpusAPI
+from .decorators import rate_limited
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCorpusAPI:
+    """asyncio front-end for CorpusAPI with bounded concurrent fan-out.
+
+    Requests are dispatched onto a process-wide worker pool that sends through
+    the shared keep-alive sessions, so concurrent calls reuse pooled
+    connections instead of opening new ones.
+    """
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, api: Optional[CorpusAPI] = None, max_concurrency: Optional[int] = None):
+        self.api = api or CorpusAPI()
+        self.config = self.api.config
+        self.max_concurrency = max_concurrency or self.config['max_concurrency']
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def _get_executor(cls, workers: int) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=workers,
+                        thread_name_prefix="corpus-async"
+                    )
+        return cls._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Run a blocking CorpusAPI request without blocking the event loop"""
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(self.config['max_concurrency']),
+                functools.partial(self.api._make_request, method, endpoint, **kwargs)
+            )
+
+    @rate_limited("otp_send", contact="contact")
+    async def send_otp(self, contact: str) -> Dict[str, Any]:
+        """Send OTP to phone/email with validation"""
+        if not contact:
+            raise ValueError("Contact information is required")
+
+        payload = {"phone": contact} if "@" not in contact else {"email": contact}
+        return await self._make_request(
+            "POST",
+            self.config['endpoints']['send_otp'],
+            json=payload
+        )
+
+    @rate_limited("otp_verify", contact="contact")
+    async def verify_otp(self, contact: str, otp: str) -> Dict[str, Any]:
+        """Verify OTP with validation"""
+        if not all([contact, otp]):
+            raise ValueError("Contact and OTP are required")
+
+        payload = {"phone": contact, "otp": otp} if "@" not in contact else {"email": contact, "otp": otp}
+        return await self._make_request(
+            "POST",
+            self.config['endpoints']['verify_otp'],
+            json=payload
+        )
+
+    async def api_get(self, endpoint: str, token: Optional[str] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """GET request with authentication"""
+        return await self._make_request(
+            "GET",
+            endpoint,
+            token=token,
+            params=params
+        )
+
+    async def api_post(self, endpoint: str, data: Dict[str, Any], token: Optional[str] = None,
+                       headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """POST request with authentication"""
+        if not data:
+            raise ValueError("Data payload is required")
+
+        return await self._make_request(
+            "POST",
+            endpoint,
+            json=data,
+            token=token,
+            headers={"Content-Type": "application/json", **(headers or {})}
+        )
+
+    @staticmethod
+    async def gather(*calls: Awaitable, return_exceptions: bool = False) -> List[Any]:
+        """Await several requests concurrently, preserving order"""
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+    @staticmethod
+    def run_sync(coro: Awaitable) -> Any:
+        """Run a coroutine to completion from synchronous (Streamlit) code"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        # Already inside an event loop on this thread: run on a helper thread
+        result: Dict[str, Any] = {}
+
+        def runner():
+            try:
+                result['value'] = asyncio.run(coro)
+            except BaseException as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=runner, name="corpus-async-bridge")
+        thread.start()
+        thread.join()
+        if 'error' in result:
+            raise result['error']
+        return result['value']
@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the batcher already holds max_queue_depth pending items"""
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into batched calls of `fn`.
+
+    A worker thread takes the first pending item, then keeps collecting until
+    `max_batch_size` items are gathered or `max_wait_ms` has passed since that
+    first item arrived. `fn` receives the list of items and must return one
+    result per item, in order; each caller gets its own result (or the
+    batch's exception) through a Future.
+    """
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 8,
+                 max_wait_ms: float = 25, max_queue_depth: int = 64, name: str = "micro-batcher"):
+        self.fn = fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_depth = max_queue_depth
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_depth)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+        self._wait_seconds = 0.0
+        self._busy_seconds = 0.0
+        self._started = time.monotonic()
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item; the Future resolves to its result"""
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.monotonic()))
+        except queue.Full:
+            raise QueueFullError(f"{self.name} queue is full ({self.max_queue_depth} pending)")
+        return future
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Submit an item and block until its result is ready"""
+        return self.submit(item).result(timeout)
+
+    def _collect(self) -> List[tuple]:
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                self._closed = True
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+
+            items = [item for item, future, _ in batch if future.set_running_or_notify_cancel()]
+            futures = [future for _, future, _ in batch if future.running()]
+            started = time.monotonic()
+            try:
+                results = self.fn(items) if items else []
+                if len(results) != len(items):
+                    raise RuntimeError(f"{self.name} returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                logger.warning(f"{self.name} batch of {len(items)} failed: {str(e)}")
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+
+            finished = time.monotonic()
+            with self._lock:
+                self._batches += 1
+                self._items += len(items)
+                self._largest_batch = max(self._largest_batch, len(items))
+                self._wait_seconds += sum(started - enqueued for _, _, enqueued in batch)
+                self._busy_seconds += finished - started
+
+            if self._closed and self._queue.empty():
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch sizes, queueing delay and throughput since start"""
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "largest_batch": self._largest_batch,
+                "queue_depth": self._queue.qsize(),
+                "avg_wait_ms": round(self._wait_seconds / self._items * 1000, 3) if self._items else 0.0,
+                "busy_seconds": round(self._busy_seconds, 3),
+                "items_per_sec": round(self._items / elapsed, 2)
+            }
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop accepting items and let the worker drain what is queued"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout)
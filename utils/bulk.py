@@ -0,0 +1,249 @@
+"""Bulk import and export of places as CSV or JSONL.
+
+    python -m utils.bulk import places.csv
+    python -m utils.bulk export places.jsonl --district Warangal
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple, Union
+from .storage import Storage
+from .validators import Validators
+import logging
+
+logger = logging.getLogger(__name__)
+
+PLACE_COLUMNS = ["id", "name", "district", "category", "season", "description", "lat", "lon", "image_url"]
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def detect_format(path: Union[str, Path], fmt: Optional[str] = None) -> str:
+    """Explicit format, else inferred from the file extension"""
+    if fmt:
+        return fmt
+    try:
+        return FORMATS[Path(path).suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Cannot infer format of {path}; pass csv or jsonl")
+
+
+class BulkLoader:
+    """Streams place records in and out of the local store in large transactions.
+
+    Rows are parsed lazily, validated with `Validators.validate_place_data`
+    and written `chunk_size` at a time with `executemany`, one transaction
+    per chunk. A bad row is
+    reported with its line number and skipped; the rest of the file still
+    loads.
+    """
+    def __init__(self, storage: Storage, chunk_size: int = 5000, max_reported_errors: int = 1000):
+        self.storage = storage
+        self.chunk_size = chunk_size
+        self.max_reported_errors = max_reported_errors
+
+    @staticmethod
+    def _read_rows(stream: IO[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+        """Yield (line number, raw record); unparseable JSON lines yield the exception"""
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row
+        elif fmt == "jsonl":
+            for line_no, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, e
+        else:
+            raise ValueError(f"Unsupported format: {fmt}")
+
+    @staticmethod
+    def _clean(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalise a parsed record: trim strings, drop blank optional fields"""
+        place = {}
+        for key in PLACE_COLUMNS:
+            value = record.get(key)
+            if isinstance(value, str):
+                value = value.strip()
+            if value in (None, "") and key in ("id", "lat", "lon", "image_url"):
+                continue
+            place[key] = value
+        return place
+
+    def _row(self, place: Dict[str, Any]) -> Tuple:
+        return (
+            self.storage._place_id(place),
+            place["name"],
+            place["district"],
+            place["category"],
+            place["season"] or "All",
+            place["description"],
+            place.get("lat"),
+            place.get("lon"),
+            place.get("image_url", "")
+        )
+
+    def _write_chunk(self, places: List[Dict[str, Any]], token: Optional[str]):
+        with self.storage.db.connection() as conn, self.storage.deferred_place_indexing(conn):
+            conn.executemany(
+                f"""
+                INSERT INTO places ({', '.join(PLACE_COLUMNS)})
+                VALUES ({', '.join('?' * len(PLACE_COLUMNS))})
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name, district = excluded.district,
+                    category = excluded.category, season = excluded.season,
+                    description = excluded.description, lat = excluded.lat,
+                    lon = excluded.lon, image_url = excluded.image_url
+                """,
+                # Last occurrence wins; a row inserted and updated in one chunk would
+                # hit the update triggers before it is indexed
+                list({row[0]: row for row in map(self._row, places)}.values())
+            )
+            if self.storage.outbox is not None:
+                self.storage.outbox.enqueue_many(conn, 'places', places, token)
+
+    def import_stream(self, stream: IO[str], fmt: str, token: Optional[str] = None) -> Dict[str, Any]:
+        """Load places from an open text stream; returns counts, throughput and row errors"""
+        start = time.perf_counter()
+        rows = loaded = error_count = 0
+        errors: List[Dict[str, Any]] = []
+        chunk: List[Dict[str, Any]] = []
+
+        def flush():
+            nonlocal loaded
+            if not chunk:
+                return
+            self._write_chunk(chunk, token)
+            self.storage._index_places(chunk)
+            loaded += len(chunk)
+            chunk.clear()
+
+        for line_no, record in self._read_rows(stream, fmt):
+            rows += 1
+            try:
+                if isinstance(record, Exception):
+                    raise ValueError(f"Invalid JSON: {str(record)}")
+                if not isinstance(record, dict):
+                    raise ValueError("Record must be an object")
+                place = self._clean(record)
+                Validators.validate_place_data(place)
+                for key in ("lat", "lon"):
+                    if key in place:
+                        place[key] = float(place[key])
+            except ValueError as e:
+                error_count += 1
+                if len(errors) < self.max_reported_errors:
+                    errors.append({"line": line_no, "error": str(e)})
+                continue
+            chunk.append(place)
+            if len(chunk) >= self.chunk_size:
+                flush()
+        flush()
+
+        if loaded:
+            self.storage._cache.invalidate('places')
+            if self.storage.outbox is not None:
+                self.storage.outbox.notify()
+        seconds = time.perf_counter() - start
+        return {
+            "rows": rows,
+            "loaded": loaded,
+            "error_count": error_count,
+            "errors": errors,
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(rows / seconds, 1) if seconds else 0.0
+        }
+
+    def import_file(self, path: Union[str, Path], fmt: Optional[str] = None,
+                    token: Optional[str] = None) -> Dict[str, Any]:
+        """Load places from a CSV or JSONL file"""
+        with open(path, newline="", encoding="utf-8") as stream:
+            return self.import_stream(stream, detect_format(path, fmt), token)
+
+    def export_stream(self, stream: IO[str], fmt: str, district: Optional[str] = None,
+                      category: Optional[str] = None) -> Dict[str, Any]:
+        """Write places to an open text stream without materialising the table"""
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported format: {fmt}")
+        clauses, args = [], []
+        if district:
+            clauses.append("district = ?")
+            args.append(district)
+        if category:
+            clauses.append("category = ?")
+            args.append(category)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        start = time.perf_counter()
+        rows = 0
+        writer = csv.writer(stream) if fmt == "csv" else None
+        if writer:
+            writer.writerow(PLACE_COLUMNS)
+        with self.storage.db.connection() as conn:
+            cursor = conn.execute(f"SELECT {', '.join(PLACE_COLUMNS)} FROM places {where} ORDER BY name, id", args)
+            while True:
+                batch = cursor.fetchmany(self.chunk_size)
+                if not batch:
+                    break
+                if writer:
+                    writer.writerows(tuple(row) for row in batch)
+                else:
+                    stream.write("".join(json.dumps(dict(row), ensure_ascii=False) + "\n" for row in batch))
+                rows += len(batch)
+        seconds = time.perf_counter() - start
+        return {"rows": rows, "seconds": round(seconds, 3), "rows_per_sec": round(rows / seconds, 1) if seconds else 0.0}
+
+    def export_file(self, path: Union[str, Path], fmt: Optional[str] = None, **filters) -> Dict[str, Any]:
+        """Write places to a CSV or JSONL file"""
+        with open(path, "w", newline="", encoding="utf-8") as stream:
+            return self.export_stream(stream, detect_format(path, fmt), **filters)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import/export of places")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="load places from CSV or JSONL ('-' for stdin)")
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=["csv", "jsonl"])
+    importer.add_argument("--chunk-size", type=int, default=5000)
+    importer.add_argument("--token")
+
+    exporter = commands.add_parser("export", help="write places as CSV or JSONL ('-' for stdout)")
+    exporter.add_argument("path")
+    exporter.add_argument("--format", choices=["csv", "jsonl"])
+    exporter.add_argument("--district")
+    exporter.add_argument("--category")
+    args = parser.parse_args(argv)
+
+    loader = BulkLoader(Storage(), chunk_size=getattr(args, "chunk_size", 5000))
+    if args.command == "import":
+        if args.path == "-":
+            result = loader.import_stream(io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline=""),
+                                          args.format or "jsonl", args.token)
+        else:
+            result = loader.import_file(args.path, args.format, args.token)
+        for error in result["errors"]:
+            print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+        print(f"loaded {result['loaded']}/{result['rows']} rows in {result['seconds']}s "
+              f"({result['rows_per_sec']} rows/s), {result['error_count']} errors", file=sys.stderr)
+        return 1 if result["error_count"] else 0
+
+    filters = {"district": args.district, "category": args.category}
+    if args.path == "-":
+        result = loader.export_stream(sys.stdout, args.format or "jsonl", **filters)
+    else:
+        result = loader.export_file(args.path, args.format, **filters)
+    print(f"exported {result['rows']} rows in {result['seconds']}s ({result['rows_per_sec']} rows/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until", "loader")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float, loader: Optional[Callable[[], Any]]):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.loader = loader
+
+
+class TTLCache:
+    """Thread-safe read-through cache with TTL, LRU eviction and stale-while-revalidate.
+
+    Keys are tuples whose first element names the collection, e.g.
+    ('places', token), so writes can invalidate every entry of a collection.
+    Within `ttl` seconds an entry is served as fresh; until `stale_ttl` more
+    seconds have passed it is still served while a background thread reloads it.
+    Concurrent misses on one key share a single loader call.
+    """
+    def __init__(self, ttl: float = 30.0, stale_ttl: float = 300.0, max_entries: int = 256,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._data: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._generations: Dict[Hashable, int] = {}
+        self._refreshing = set()
+        self._loading: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refresh_errors = 0
+
+    def get(self, key: Tuple, default: Any = None) -> Any:
+        """Return a cached value (scheduling a refresh if stale) or default on miss"""
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def get_or_load(self, key: Tuple, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader on a miss.
+
+        Only the first caller to miss runs the loader; the others wait for its
+        result (or its exception) instead of loading the same key again.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._clock() < entry.expires_at:
+                # Loaded by another caller since our lookup
+                return entry.value
+            pending = self._loading.get(key)
+            if pending is not None:
+                leader = False
+            else:
+                leader = True
+                pending = self._loading[key] = Future()
+                generation = self._generations.get(key[0], 0)
+        if not leader:
+            return pending.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            self.set(key, value, loader=loader, generation=generation)
+            pending.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                if self._loading.get(key) is pending:
+                    del self._loading[key]
+
+    def set(self, key: Tuple, value: Any, loader: Optional[Callable[[], Any]] = None,
+            generation: Optional[int] = None):
+        """Store a value; dropped if the collection was invalidated since `generation`"""
+        now = self._clock()
+        with self._lock:
+            if generation is not None and generation != self._generations.get(key[0], 0):
+                return
+            self._data[key] = _Entry(value, now + self.ttl, now + self.ttl + self.stale_ttl, loader)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self, collection: Hashable) -> int:
+        """Invalidation counter for a collection, used to discard racing loads"""
+        with self._lock:
+            return self._generations.get(collection, 0)
+
+    def invalidate(self, collection: Optional[Hashable] = None):
+        """Drop every entry for a collection, or everything when collection is None"""
+        with self._lock:
+            # Loads already running read the old data: later misses start their own
+            for key in [k for k in self._loading if collection is None or k[0] == collection]:
+                del self._loading[key]
+            if collection is None:
+                self._data.clear()
+                for name in list(self._generations):
+                    self._generations[name] += 1
+                return
+            self._generations[collection] = self._generations.get(collection, 0) + 1
+            for key in [k for k in self._data if k[0] == collection]:
+                del self._data[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "refresh_errors": self.refresh_errors,
+                "entries": len(self._data),
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+            }
+
+    def _lookup(self, key: Tuple) -> Any:
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or now >= entry.stale_until:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return _MISSING
+
+            self._data.move_to_end(key)
+            if now < entry.expires_at:
+                self.hits += 1
+                return entry.value
+
+            self.stale_hits += 1
+            if entry.loader is not None and key not in self._refreshing:
+                self._refreshing.add(key)
+                generation = self._generations.get(key[0], 0)
+                threading.Thread(
+                    target=self._refresh,
+                    args=(key, entry.loader, generation),
+                    name="cache-refresh",
+                    daemon=True
+                ).start()
+            return entry.value
+
+    def _refresh(self, key: Tuple, loader: Callable[[], Any], generation: int):
+        try:
+            self.set(key, loader(), loader=loader, generation=generation)
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed for {key[0]}: {str(e)}")
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -1,11 +1,75 @@
 # utils/config.py
-from typing import Optional, Dict, Any
-import streamlit as st
+import functools
 import os
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+import streamlit as st
+from streamlit.runtime.secrets import Secrets
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of a config value: dicts become mappingproxies, lists tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _on_secrets_changed(*args, **kwargs):
+    Config.reload()
+
+
+def _snapshot(build: Callable[[], Dict[str, Any]]) -> Callable[[], Mapping[str, Any]]:
+    """Serve a section from Config's frozen snapshot instead of re-reading st.secrets per call"""
+    @functools.wraps(build)
+    def get() -> Mapping[str, Any]:
+        return Config._section(build.__name__, build)
+    return get
+
 
 class Config:
+    """Settings from st.secrets, with defaults.
+
+    Each section is built once into an immutable mapping and served from a
+    snapshot. Streamlit re-parses secrets.toml when it changes on disk and
+    signals `file_change_listener`, which drops the snapshot; a different
+    secrets object or DATA_DIR does too. Secrets assigned in code (tests,
+    benchmarks) have no file to watch and are read on every call.
+    """
+    _sections: Dict[str, Mapping[str, Any]] = {}
+    _source: Optional[Tuple] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _section(cls, name: str, build: Callable[[], Dict[str, Any]]) -> Mapping[str, Any]:
+        secrets = st.secrets
+        if not isinstance(secrets, Secrets):
+            return _freeze(build())
+        source = (id(secrets), os.getenv("DATA_DIR"))
+        if source != cls._source:
+            with cls._lock:
+                if source != cls._source:
+                    if cls._source is None or cls._source[0] != source[0]:
+                        secrets.file_change_listener.connect(_on_secrets_changed)
+                    cls._sections = {}
+                    cls._source = source
+        sections = cls._sections
+        value = sections.get(name)
+        if value is None:
+            value = sections[name] = _freeze(build())
+        return value
+
+    @classmethod
+    def reload(cls):
+        """Drop the snapshot so the next read rebuilds every section"""
+        with cls._lock:
+            cls._sections = {}
+
     @staticmethod
-    def get_corpus_config() -> Dict[str, Any]:
+    @_snapshot
+    def get_corpus_config() -> Mapping[str, Any]:
         """Get Corpus API configuration with defaults"""
         c = st.secrets.get("corpus", {})
         return {
@@ -19,25 +83,129 @@ class Config:
                 "itineraries": c.get("itineraries_endpoint", "collections/itineraries"),
             },
             "access_token": c.get("access_token", ""),
-            "timeout": c.get("timeout", 30)
+            "timeout": c.get("timeout", 30),
+            "pool_connections": c.get("pool_connections", 10),
+            "pool_maxsize": c.get("pool_maxsize", 20),
+            "pool_block": c.get("pool_block", False),
+            "keep_alive": c.get("keep_alive", True),
+            "max_concurrency": c.get("max_concurrency", 8),
+            "write_behind": c.get("write_behind", True),
+            "outbox_worker": c.get("outbox_worker", True),
+            "outbox_batch_size": c.get("outbox_batch_size", 20),
+            "outbox_max_attempts": c.get("outbox_max_attempts", 8),
+            "outbox_poll_seconds": c.get("outbox_poll_seconds", 5),
+            "sync": c.get("sync", True),
+            "sync_interval_seconds": c.get("sync_interval_seconds", 60),
+            "sync_since_param": c.get("sync_since_param", "updated_since")
         }
 
     @staticmethod
-    def get_ai_config() -> Dict[str, Any]:
+    @_snapshot
+    def get_ai_config() -> Mapping[str, Any]:
         """Get AI configuration with defaults"""
         a = st.secrets.get("ai", {})
         return {
             "use_hf_inference": a.get("use_hf_inference", False),
             "hf_api_key": a.get("hf_api_key", ""),
+            "hf_inference_url": a.get("hf_inference_url", "https://api-inference.huggingface.co"),
+            "hf_timeout": a.get("hf_timeout", 60),
             "model_name": a.get("model_name", "google/flan-t5-small"),
-            "local_fallback": a.get("local_fallback", True)
+            "local_fallback": a.get("local_fallback", True),
+            "warm_up": a.get("warm_up", False),
+            "idle_unload_seconds": a.get("idle_unload_seconds", 0),  # 0 keeps the model loaded
+            "batch_max_size": a.get("batch_max_size", 8),
+            "batch_max_wait_ms": a.get("batch_max_wait_ms", 25),
+            "batch_queue_depth": a.get("batch_queue_depth", 64),
+            "cache_itineraries": a.get("cache_itineraries", True),
+            "cache_ttl_hours": a.get("cache_ttl_hours", 168),
+            "cache_max_entries": a.get("cache_max_entries", 5000),
+            "embedding_model": a.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2"),
+            "places_per_day": a.get("places_per_day", 3),
+            "route_time_budget_ms": a.get("route_time_budget_ms", 50),
+            "sentiment_model": a.get("sentiment_model", ""),  # empty uses the built-in lexicon
+            "sentiment_worker": a.get("sentiment_worker", True),
+            "sentiment_batch_size": a.get("sentiment_batch_size", 64),
+            "sentiment_poll_seconds": a.get("sentiment_poll_seconds", 5),
+            # Run local generation in the CPU pool; every worker process loads its own copy of the model
+            "generate_in_worker": a.get("generate_in_worker", False)
+        }
+
+    @staticmethod
+    @_snapshot
+    def get_resilience_config() -> Mapping[str, Any]:
+        """Circuit breaker, timeout and retry settings shared by remote backends"""
+        r = st.secrets.get("resilience", {})
+        return {
+            "failure_rate": r.get("failure_rate", 0.5),
+            "window": r.get("window", 20),
+            "min_calls": r.get("min_calls", 5),
+            "open_seconds": r.get("open_seconds", 30),
+            "min_timeout": r.get("min_timeout", 2.0),
+            "timeout_multiplier": r.get("timeout_multiplier", 3.0),
+            "backoff_base": r.get("backoff_base", 0.5),
+            "backoff_cap": r.get("backoff_cap", 4.0)
+        }
+
+    @staticmethod
+    @_snapshot
+    def get_rate_limit_config() -> Mapping[str, Any]:
+        """Token-bucket limits per action and scope, as 'calls/period' (e.g. '3/10m')"""
+        r = st.secrets.get("rate_limits", {})
+        defaults = {
+            "otp_send": {"contact": "3/10m", "session": "5/10m", "global": "60/1m"},
+            "otp_verify": {"contact": "5/10m", "session": "10/10m", "global": "120/1m"},
+            "write": {"session": "30/1m", "global": "600/1m"},
+            "generate": {"session": "10/1m", "global": "120/1m"}
+        }
+        return {
+            "enabled": r.get("enabled", True),
+            "store": r.get("store", "memory"),  # "sqlite" shares buckets between worker processes
+            "max_keys": r.get("max_keys", 100_000),  # live buckets kept in memory before the fullest are evicted
+            "rules": {
+                action: {scope: r.get(action, {}).get(scope, rate) for scope, rate in scopes.items()}
+                for action, scopes in defaults.items()
+            }
+        }
+
+    @staticmethod
+    @_snapshot
+    def get_executor_config() -> Mapping[str, Any]:
+        """Process and thread pools that keep CPU-heavy and blocking work off script threads"""
+        e = st.secrets.get("executor", {})
+        return {
+            # Small by default: each worker is a whole Python process. 0 runs CPU tasks inline
+            "cpu_workers": e.get("cpu_workers", min(2, os.cpu_count() or 1)),
+            "io_workers": e.get("io_workers", 8),
+            "max_pending": e.get("max_pending", 64),  # queued + running tasks per pool before ExecutorBusy
+            "task_timeout": e.get("task_timeout", 120),
+            "reap_seconds": e.get("reap_seconds", 30),  # how often queued work of ended sessions is cancelled
+            "start_method": e.get("start_method", "forkserver")  # never fork the threaded server
         }
 
     @staticmethod
-    def get_app_config() -> Dict[str, Any]:
+    @_snapshot
+    def get_app_config() -> Mapping[str, Any]:
         """Get application configuration"""
+        db = st.secrets.get("sqlite", {})
         return {
             "name": st.secrets.get("app_name", "Telangana Tourist Guide"),
             "data_dir": os.getenv("DATA_DIR", "data"),
-            "max_file_size": 5 * 1024 * 1024  # 5MB
+            "max_file_size": 5 * 1024 * 1024,  # 5MB
+            "cache_ttl": st.secrets.get("cache_ttl", 30),
+            "cache_stale_ttl": st.secrets.get("cache_stale_ttl", 300),
+            "cache_max_entries": st.secrets.get("cache_max_entries", 256),
+            "semantic_search": st.secrets.get("semantic_search", True),
+            "ann_threshold": st.secrets.get("ann_threshold", 50_000),
+            "image_widths": st.secrets.get("image_widths", [160, 320, 640]),
+            "image_formats": st.secrets.get("image_formats", ["webp", "jpeg"]),
+            "image_quality": st.secrets.get("image_quality", 80),
+            "metrics_port": st.secrets.get("metrics_port", 0),  # 0 disables the /metrics endpoint
+            "sqlite": {
+                "journal_mode": db.get("journal_mode", "WAL"),
+                "synchronous": db.get("synchronous", "NORMAL"),
+                "cache_size": db.get("cache_size", -16000),  # KiB when negative
+                "mmap_size": db.get("mmap_size", 128 * 1024 * 1024),
+                "busy_timeout": db.get("busy_timeout", 5000),  # ms
+                "pool_size": db.get("pool_size", 8)
+            }
         }
\ No newline at end of file
@@ -1,42 +1,61 @@
 # utils/corpus_api.py
-import requests
 from typing import Optional, Dict, Any
-from requests.exceptions import RequestException
-import time
 from .config import Config
+from .decorators import rate_limited
+from .http_pool import SessionPool
+from .metrics import timer
+from .resilience import BackendGuard, is_http_failure
 
 class CorpusAPI:
     def __init__(self):
         self.config = Config.get_corpus_config()
         self.max_retries = 3
-        self.retry_delay = 1
+        self.session = SessionPool.get_session(
+            self.config['base_url'],
+            pool_connections=self.config['pool_connections'],
+            pool_maxsize=self.config['pool_maxsize'],
+            pool_block=self.config['pool_block'],
+            keep_alive=self.config['keep_alive']
+        )
+        self.guard = BackendGuard.get(
+            f"corpus:{self.config['base_url']}",
+            timeout=self.config['timeout'],
+            **Config.get_resilience_config()
+        )
 
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Generic request handler with retries"""
+        """Generic request handler with circuit breaker, adaptive timeout and jittered retries"""
         url = f"{self.config['base_url']}/{endpoint.lstrip('/')}"
         headers = kwargs.pop('headers', {})
+        raw = kwargs.pop('raw', False)
         
         if 'token' in kwargs:
             headers['Authorization'] = f"Bearer {kwargs.pop('token')}"
         
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.request(
-                    method,
-                    url,
-                    headers=headers,
-                    timeout=self.config['timeout'],
-                    **kwargs
-                )
-                response.raise_for_status()
-                return response.json()
-            except RequestException as e:
-                if attempt == self.max_retries - 1:
-                    raise
-                time.sleep(self.retry_delay * (attempt + 1))
-        
-        raise RequestException("Max retries exceeded")
+        def send(timeout: float) -> Any:
+            response = self.session.request(
+                method,
+                url,
+                headers=headers,
+                timeout=timeout,
+                **kwargs
+            )
+            response.raise_for_status()
+            return response if raw else response.json()
+
+        # Fails fast with CircuitOpenError while the backend is known to be down
+        with timer("corpus_request", method=method, endpoint=endpoint):
+            return self.guard.call(send, attempts=self.max_retries, is_failure=is_http_failure)
+
+    def available(self) -> bool:
+        """False while the circuit for this backend is open"""
+        return self.guard.available()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection reuse and handshake statistics for this base URL"""
+        return SessionPool.stats(self.config['base_url'])
 
+    @rate_limited("otp_send", contact="contact")
     def send_otp(self, contact: str) -> Dict[str, Any]:
         """Send OTP to phone/email with validation"""
         if not contact:
@@ -49,6 +68,7 @@ class CorpusAPI:
             json=payload
         )
 
+    @rate_limited("otp_verify", contact="contact")
     def verify_otp(self, contact: str, otp: str) -> Dict[str, Any]:
         """Verify OTP with validation"""
         if not all([contact, otp]):
@@ -70,7 +90,26 @@ class CorpusAPI:
             params=params
         )
 
-    def api_post(self, endpoint: str, data: Dict[str, Any], token: Optional[str] = None) -> Dict[str, Any]:
+    def api_get_changes(self, endpoint: str, token: Optional[str] = None, params: Optional[Dict] = None,
+                        etag: Optional[str] = None) -> Dict[str, Any]:
+        """Conditional GET: {'status', 'data', 'etag', 'bytes'}, with data None on 304 Not Modified"""
+        response = self._make_request(
+            "GET",
+            endpoint,
+            token=token,
+            params=params,
+            headers={"If-None-Match": etag} if etag else {},
+            raw=True
+        )
+        return {
+            "status": response.status_code,
+            "data": None if response.status_code == 304 else response.json(),
+            "etag": response.headers.get("ETag", etag),
+            "bytes": len(response.content)
+        }
+
+    def api_post(self, endpoint: str, data: Dict[str, Any], token: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """POST request with authentication"""
         if not data:
             raise ValueError("Data payload is required")
@@ -80,5 +119,5 @@ class CorpusAPI:
             endpoint,
             json=data,
             token=token,
-            headers={"Content-Type": "application/json"}
+            headers={"Content-Type": "application/json", **(headers or {})}
         )
\ No newline at end of file
@@ -0,0 +1,127 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionManager:
+    """Thread-safe pool of long-lived SQLite connections for one database file.
+
+    Connections are opened once with WAL journaling and tuned pragmas, then
+    reused, so each keeps its prepared-statement cache warm. Nested
+    `connection()` blocks on the same thread share one connection and commit
+    only when the outermost block exits.
+    """
+    _instances: Dict[str, "ConnectionManager"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path: Union[str, Path], journal_mode: str = "WAL", synchronous: str = "NORMAL",
+                 cache_size: int = -16000, mmap_size: int = 128 * 1024 * 1024, busy_timeout: int = 5000,
+                 pool_size: int = 8, cached_statements: int = 256):
+        self.db_path = str(db_path)
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+        self.pool_size = pool_size
+        self.cached_statements = cached_statements
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._local = threading.local()
+        self._all = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, db_path: Union[str, Path], **settings) -> "ConnectionManager":
+        """Process-wide manager for a database file"""
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            if manager is None:
+                manager = cls(db_path, **settings)
+                cls._instances[key] = manager
+            return manager
+
+    @classmethod
+    def close_all_managers(cls):
+        """Close every manager's connections (tests and shutdown)"""
+        with cls._instances_lock:
+            for manager in cls._instances.values():
+                manager.close()
+            cls._instances.clear()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        with self._lock:
+            self._all.add(conn)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, conn: sqlite3.Connection):
+        if self._idle.qsize() < self.pool_size:
+            self._idle.put(conn)
+            return
+        with self._lock:
+            self._all.discard(conn)
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection; commit on success, roll back on error"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self._release(conn)
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            connections = list(self._all)
+            self._all.clear()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to close SQLite connection: {str(e)}")
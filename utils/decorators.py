@@ -0,0 +1,276 @@
+import functools
+import heapq
+import inspect
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from .config import Config
+from .db import ConnectionManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("contact", "session", "global")
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+RATE = re.compile(r"^\s*(\d+)\s*/\s*(\d*\.?\d*)\s*([smhd]?)\s*$")
+LABELS = {"otp_send": "OTP", "otp_verify": "OTP verification", "write": "save", "generate": "itinerary"}
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised instead of running a call whose contact, session or global bucket is empty"""
+    def __init__(self, action: str, scope: str, retry_after: float):
+        self.action = action
+        self.scope = scope
+        self.retry_after = retry_after
+        super().__init__(f"Too many {LABELS.get(action, action)} requests; try again in {math.ceil(retry_after)}s")
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """'3/10m' -> (3 calls, 600 seconds); the period defaults to seconds and to 1 of its unit"""
+    match = RATE.match(str(rate))
+    if not match or int(match.group(1)) < 1:
+        raise ValueError(f"Invalid rate: {rate!r} (expected e.g. '5/1m')")
+    calls, amount, unit = match.groups()
+    return int(calls), float(amount or 1) * UNITS[unit or "s"]
+
+
+class MemoryBucketStore:
+    """Token buckets for one process, one float per key.
+
+    Each bucket is kept as its theoretical arrival time (GCRA): a call costing
+    `cost` seconds is allowed while the arrival time stays within `tolerance`
+    of now. A key whose bucket has refilled holds no information, so a sweep
+    (run whenever the table has doubled since the last one) drops it. Past
+    `max_keys` live keys the fullest buckets are evicted first, which keeps
+    memory bounded however many distinct keys arrive.
+    """
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._tat: Dict[str, float] = {}
+        self._sweep_at = min(1024, max_keys)
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+    def take(self, key: str, cost: float, tolerance: float) -> float:
+        """Spend `cost` from the bucket; 0.0 when allowed, else seconds until it would be"""
+        return self.take_many([(key, cost, tolerance)])[0]
+
+    def take_many(self, takes: Sequence[Tuple[str, float, float]]) -> List[float]:
+        """Spend from every (key, cost, tolerance) bucket, or from none when any would overflow"""
+        with self._lock:
+            now = self._clock()
+            tats = [max(self._tat.get(key, now), now) + cost for key, cost, _ in takes]
+            waits = [max(0.0, tat - now - tolerance) for tat, (_, _, tolerance) in zip(tats, takes)]
+            if any(waits):
+                return waits
+            for (key, _, _), tat in zip(takes, tats):
+                self._tat[key] = tat
+            if len(self._tat) >= self._sweep_at:
+                self._sweep(now)
+            return waits
+
+    def _sweep(self, now: float):
+        live = {key: tat for key, tat in self._tat.items() if tat > now}
+        if len(live) > self.max_keys * 3 // 4:
+            keep = heapq.nlargest(self.max_keys // 2, live.items(), key=lambda item: item[1])
+            self.evicted += len(live) - len(keep)
+            live = dict(keep)
+        self._tat = live
+        self._sweep_at = min(self.max_keys, max(1024, 2 * len(live)))
+
+
+class SQLiteBucketStore:
+    """The same buckets in a table, shared by every worker process using the database.
+
+    Arrival times use the wall clock so processes agree on them; a take reads
+    and updates its buckets inside one write transaction, so concurrent takes
+    cannot overspend a bucket. Refilled rows are deleted every `sweep_every`
+    takes.
+    """
+    def __init__(self, db: ConnectionManager, sweep_every: int = 1000, clock: Callable[[], float] = time.time):
+        self.db = db
+        self.sweep_every = sweep_every
+        self._clock = clock
+        self._takes = 0
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    tat REAL NOT NULL
+                ) WITHOUT ROWID
+            """)
+
+    def __len__(self) -> int:
+        with self.db.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def take(self, key: str, cost: float, tolerance: float) -> float:
+        """Spend `cost` from the bucket; 0.0 when allowed, else seconds until it would be"""
+        return self.take_many([(key, cost, tolerance)])[0]
+
+    def take_many(self, takes: Sequence[Tuple[str, float, float]]) -> List[float]:
+        """Spend from every (key, cost, tolerance) bucket, or from none when any would overflow"""
+        now = self._clock()
+        keys = [key for key, _, _ in takes]
+        with self.db.connection() as conn:
+            if not conn.in_transaction:
+                # Holds the write lock from the check to the update, so no other process spends in between
+                conn.execute("BEGIN IMMEDIATE")
+            stored = dict(conn.execute(
+                f"SELECT key, tat FROM rate_limits WHERE key IN ({', '.join('?' * len(keys))})", keys
+            ).fetchall())
+            tats = [max(stored.get(key, now), now) + cost for key, cost, _ in takes]
+            waits = [max(0.0, tat - now - tolerance) for tat, (_, _, tolerance) in zip(tats, takes)]
+            if any(waits):
+                return waits
+            conn.executemany(
+                "INSERT INTO rate_limits (key, tat) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET tat = excluded.tat",
+                zip(keys, tats)
+            )
+            self._takes += 1
+            if self._takes % self.sweep_every == 0:
+                conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+        return waits
+
+
+def current_session_id() -> Optional[str]:
+    """Streamlit session running this script, or None outside a script run"""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+class RateLimiter:
+    """Per-contact, per-session and global token buckets for one action.
+
+    Rules come from `Config.get_rate_limit_config()`, e.g. '3/10m' for three
+    calls per ten minutes with bursts up to three. Every scope is checked
+    before any is charged, so a call one scope rejects spends nothing from the
+    others; the narrowest full scope is the one reported.
+    """
+    _instances: Dict[Tuple, "RateLimiter"] = {}
+    _stores: Dict[Tuple, Any] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, action: str, rules: Mapping[str, str], store: Any):
+        unknown = set(rules) - set(SCOPES)
+        if unknown:
+            raise ValueError(f"Unknown rate limit scopes for {action}: {', '.join(sorted(unknown))}")
+        self.action = action
+        self.store = store
+        self.rules: Dict[str, Tuple[float, float]] = {}
+        for scope in SCOPES:
+            if rules.get(scope):
+                calls, period = parse_rate(rules[scope])
+                # Seconds of bucket each call spends, and how far ahead a full burst may run
+                self.rules[scope] = (period / calls, period)
+        self.allowed = 0
+        self.rejected = 0
+
+    @classmethod
+    def for_action(cls, action: str) -> Optional["RateLimiter"]:
+        """The process-wide limiter for an action under the current config; None when unlimited"""
+        config = Config.get_rate_limit_config()
+        rules = config['rules'].get(action)
+        if not config['enabled'] or not rules:
+            return None
+        key = (action, tuple(rules.items()), config['store'], config['max_keys'])
+        limiter = cls._instances.get(key)
+        if limiter is None:
+            with cls._instances_lock:
+                limiter = cls._instances.get(key)
+                if limiter is None:
+                    limiter = cls._instances[key] = cls(action, rules, cls._store(config))
+        return limiter
+
+    @classmethod
+    def _store(cls, config: Mapping[str, Any]) -> Any:
+        if config['store'] == 'sqlite':
+            app_config = Config.get_app_config()
+            os.makedirs(app_config['data_dir'], exist_ok=True)
+            path = Path(app_config['data_dir']) / 'app.db'
+            key = ('sqlite', str(path.resolve()))
+            if key not in cls._stores:
+                cls._stores[key] = SQLiteBucketStore(ConnectionManager.for_path(path, **app_config['sqlite']))
+        elif config['store'] == 'memory':
+            key = ('memory', config['max_keys'])
+            if key not in cls._stores:
+                cls._stores[key] = MemoryBucketStore(config['max_keys'])
+        else:
+            raise ValueError(f"Unknown rate limit store: {config['store']}")
+        return cls._stores[key]
+
+    @classmethod
+    def reset_all(cls):
+        """Forget every limiter and bucket (tests)"""
+        with cls._instances_lock:
+            cls._instances.clear()
+            cls._stores.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, int]]:
+        """Allowed and rejected calls per action since start"""
+        totals: Dict[str, Dict[str, int]] = {}
+        for limiter in list(cls._instances.values()):
+            row = totals.setdefault(limiter.action, {"allowed": 0, "rejected": 0})
+            row["allowed"] += limiter.allowed
+            row["rejected"] += limiter.rejected
+        return totals
+
+    def hit(self, contact: Optional[str] = None, session: Optional[str] = None, cost: int = 1):
+        """Spend `cost` calls in every applicable scope or raise RateLimitExceeded"""
+        keys = {"contact": str(contact).strip().lower() if contact else None, "session": session, "global": "*"}
+        scopes = [scope for scope in self.rules if keys[scope] is not None]
+        waits = [] if not scopes else self.store.take_many([
+            (f"{self.action}:{scope}:{keys[scope]}", cost * self.rules[scope][0], self.rules[scope][1])
+            for scope in scopes
+        ])
+        for scope, wait in zip(scopes, waits):
+            if wait:
+                self.rejected += 1
+                logger.warning(f"Rate limited {self.action} ({scope}); retry in {wait:.1f}s")
+                raise RateLimitExceeded(self.action, scope, wait)
+        self.allowed += 1
+
+
+def rate_limited(action: str, contact: Optional[str] = None, batch: Optional[str] = None) -> Callable:
+    """Check the action's buckets before each call.
+
+    `contact` names the argument holding the phone or email to throttle by,
+    and `batch` the argument holding a list whose items each cost one call;
+    the Streamlit session is picked up automatically when there is one.
+    Coroutine functions are checked when awaited.
+    """
+    def decorate(fn: Callable) -> Callable:
+        signature = inspect.signature(fn) if contact or batch else None
+
+        def check(args, kwargs):
+            limiter = RateLimiter.for_action(action)
+            if limiter is None:
+                return
+            arguments = signature.bind_partial(*args, **kwargs).arguments if signature else {}
+            cost = max(1, len(arguments.get(batch) or ())) if batch else 1
+            limiter.hit(contact=arguments.get(contact) if contact else None,
+                        session=current_session_id(), cost=cost)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                check(args, kwargs)
+                return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            check(args, kwargs)
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,218 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional, Set
+from streamlit.runtime import Runtime
+from .config import Config
+from .decorators import current_session_id
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised when a pool already holds max_pending queued or running tasks"""
+
+
+class TaskTimeout(TimeoutError):
+    """Raised when a task does not finish within its timeout"""
+
+
+class TaskExecutor:
+    """Process pool for CPU-bound work and thread pool for blocking I/O, shared by the app.
+
+    Each pool admits at most `max_pending` queued or running tasks and turns
+    away more with ExecutorBusy, so one heavy user cannot build a backlog for
+    everyone. `run()` waits up to a timeout and cancels the task if it has not
+    started. Tasks are tagged with the submitting Streamlit session, and a
+    reaper cancels the queued work of sessions that have ended. A task that is
+    already running in a worker process cannot be interrupted; its result is
+    dropped when it finishes. `cpu_workers=0` runs CPU tasks inline.
+
+    Workers start with `start_method` ("forkserver", falling back to "spawn"
+    where it is unavailable) rather than fork: forking a Streamlit server
+    copies every thread's held locks into the child, and they never unlock.
+    """
+    CPU = "cpu"
+    IO = "io"
+
+    _shared: Optional["TaskExecutor"] = None
+    _shared_key: Optional[tuple] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cpu_workers: int = 2, io_workers: int = 8, max_pending: int = 64,
+                 task_timeout: float = 120.0, reap_seconds: float = 30.0,
+                 start_method: str = "forkserver"):
+        self.cpu_workers = cpu_workers
+        self.io_workers = io_workers
+        self.max_pending = max_pending
+        self.task_timeout = task_timeout
+        self.reap_seconds = reap_seconds
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = "spawn"
+        self.start_method = start_method
+        self._pools: Dict[str, Any] = {}
+        self._slots = {kind: threading.BoundedSemaphore(max_pending) for kind in (self.CPU, self.IO)}
+        self._sessions: Dict[str, Set[Future]] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Updated from caller threads and from done-callbacks on pool threads
+        self._counts_lock = threading.Lock()
+        self._counts = {kind: {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0,
+                               "timed_out": 0, "cancelled": 0} for kind in (self.CPU, self.IO)}
+
+    @classmethod
+    def shared(cls) -> "TaskExecutor":
+        """The process-wide executor for the current config"""
+        config = Config.get_executor_config()
+        key = tuple(config.items())
+        executor = cls._shared
+        if executor is None or cls._shared_key != key:
+            with cls._shared_lock:
+                if cls._shared is None or cls._shared_key != key:
+                    if cls._shared is not None:
+                        cls._shared.shutdown(wait=False)
+                    cls._shared = cls(**config)
+                    cls._shared_key = key
+                executor = cls._shared
+        return executor
+
+    @classmethod
+    def shutdown_shared(cls):
+        """Stop the shared pools (tests and shutdown)"""
+        with cls._shared_lock:
+            if cls._shared is not None:
+                cls._shared.shutdown()
+                cls._shared = None
+                cls._shared_key = None
+
+    def _pool(self, kind: str):
+        pool = self._pools.get(kind)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(kind)
+                if pool is None:
+                    if kind == self.CPU:
+                        pool = ProcessPoolExecutor(max_workers=self.cpu_workers,
+                                                   mp_context=multiprocessing.get_context(self.start_method))
+                    else:
+                        pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="task-io")
+                    self._pools[kind] = pool
+        return pool
+
+    def submit(self, kind: str, fn: Callable, *args, **kwargs) -> Future:
+        """Queue `fn(*args, **kwargs)` on the CPU or I/O pool; raises ExecutorBusy when it is full"""
+        if kind not in self._slots:
+            raise ValueError(f"Unknown task kind: {kind}")
+        if not self._slots[kind].acquire(blocking=False):
+            self._count(kind, "rejected")
+            raise ExecutorBusy(f"{kind} pool is full ({self.max_pending} pending)")
+        self._count(kind, "submitted")
+
+        if kind == self.CPU and self.cpu_workers <= 0:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            self._finished(kind, None, future)
+            return future
+
+        try:
+            future = self._pool(kind).submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots[kind].release()
+            raise
+        session = current_session_id()
+        if session is not None:
+            with self._lock:
+                self._sessions.setdefault(session, set()).add(future)
+            self._start_reaper()
+        future.add_done_callback(lambda done: self._finished(kind, session, done))
+        return future
+
+    def _count(self, kind: str, field: str):
+        with self._counts_lock:
+            self._counts[kind][field] += 1
+
+    def _finished(self, kind: str, session: Optional[str], future: Future):
+        self._slots[kind].release()
+        if future.cancelled():
+            self._count(kind, "cancelled")
+        elif future.exception() is not None:
+            self._count(kind, "failed")
+        else:
+            self._count(kind, "completed")
+        if session is not None:
+            with self._lock:
+                pending = self._sessions.get(session)
+                if pending is not None:
+                    pending.discard(future)
+                    if not pending:
+                        del self._sessions[session]
+
+    def run(self, kind: str, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Submit and wait for the result, cancelling the task if it takes longer than `timeout`"""
+        future = self.submit(kind, fn, *args, **kwargs)
+        timeout = self.task_timeout if timeout is None else timeout
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()
+            self._count(kind, "timed_out")
+            raise TaskTimeout(f"{getattr(fn, '__name__', 'task')} did not finish within {timeout}s")
+
+    def cancel_session(self, session_id: str) -> int:
+        """Cancel a session's tasks that have not started; returns how many were cancelled"""
+        with self._lock:
+            pending = list(self._sessions.get(session_id, ()))
+        return sum(1 for future in pending if future.cancel())
+
+    def reap(self) -> int:
+        """Cancel queued tasks of Streamlit sessions that have ended"""
+        if not Runtime.exists():
+            return 0
+        runtime = Runtime.instance()
+        with self._lock:
+            sessions = list(self._sessions)
+        return sum(self.cancel_session(session) for session in sessions
+                   if not runtime.is_active_session(session))
+
+    def _start_reaper(self):
+        if self._reaper and self._reaper.is_alive():
+            return
+        with self._lock:
+            if self._reaper and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="task-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._stop.wait(self.reap_seconds):
+            try:
+                cancelled = self.reap()
+                if cancelled:
+                    logger.info(f"Cancelled {cancelled} tasks of ended sessions")
+            except Exception as e:
+                logger.warning(f"Task reaper failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-pool task counts, current load and sessions with queued work"""
+        stats: Dict[str, Any] = {}
+        with self._counts_lock:
+            for kind, counts in self._counts.items():
+                done = counts["completed"] + counts["failed"] + counts["cancelled"]
+                stats[kind] = {**counts, "pending": counts["submitted"] - done}
+        with self._lock:
+            stats["sessions"] = len(self._sessions)
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stop the reaper and both pools, cancelling tasks that have not started"""
+        self._stop.set()
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,131 @@
+import threading
+import time
+from typing import Dict, Any, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Thread-safe counters for a single pooled session"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.handshake_seconds = 0.0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connect(self, elapsed: float):
+        with self._lock:
+            self.connections_opened += 1
+            self.handshake_seconds += elapsed
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            opened = self.connections_opened
+            return {
+                "requests": self.requests,
+                "connections_opened": opened,
+                "connections_reused": max(self.requests - opened, 0),
+                "handshake_seconds": round(self.handshake_seconds, 6),
+                "avg_handshake_ms": round(self.handshake_seconds / opened * 1000, 3) if opened else 0.0
+            }
+
+
+def _timed_pool_classes(stats: PoolStats) -> Dict[str, type]:
+    """Build urllib3 pool classes whose connections report TCP+TLS setup time"""
+    class TimedHTTPConnection(HTTPConnection):
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            stats.record_connect(time.perf_counter() - start)
+
+    class TimedHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            stats.record_connect(time.perf_counter() - start)
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    return {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that keeps connections alive and records pool statistics"""
+    def __init__(self, stats: PoolStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _timed_pool_classes(self.stats)
+
+    def send(self, request, **kwargs):
+        self.stats.record_request()
+        return super().send(request, **kwargs)
+
+
+class SessionPool:
+    """Process-wide registry of keep-alive sessions, one per base URL"""
+    _sessions: Dict[str, requests.Session] = {}
+    _stats: Dict[str, PoolStats] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls, base_url: str, pool_connections: int = 10, pool_maxsize: int = 20,
+                    pool_block: bool = False, keep_alive: bool = True) -> requests.Session:
+        """Return the shared session for base_url, creating it on first use"""
+        key = base_url.rstrip("/")
+        session = cls._sessions.get(key)
+        if session is not None:
+            return session
+
+        with cls._lock:
+            session = cls._sessions.get(key)
+            if session is None:
+                stats = PoolStats()
+                adapter = PooledAdapter(
+                    stats,
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    pool_block=pool_block,
+                    max_retries=0
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                if not keep_alive:
+                    session.headers["Connection"] = "close"
+                cls._sessions[key] = session
+                cls._stats[key] = stats
+                logger.info(f"Created pooled session for {key} (maxsize={pool_maxsize}, block={pool_block})")
+        return session
+
+    @classmethod
+    def stats(cls, base_url: Optional[str] = None) -> Dict[str, Any]:
+        """Connection statistics for one base URL, or all of them keyed by URL"""
+        if base_url is not None:
+            stats = cls._stats.get(base_url.rstrip("/"))
+            return stats.snapshot() if stats else PoolStats().snapshot()
+        return {key: stats.snapshot() for key, stats in list(cls._stats.items())}
+
+    @classmethod
+    def close_all(cls):
+        """Close every pooled session and forget their statistics"""
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions.clear()
+            cls._stats.clear()
@@ -0,0 +1,154 @@
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from .executor import TaskExecutor
+from .validators import Validators
+import logging
+
+logger = logging.getLogger(__name__)
+
+ENCODERS = {
+    "webp": ("WEBP", {"method": 4}),
+    "jpeg": ("JPEG", {"optimize": True, "progressive": True})
+}
+
+
+def render_variants(data: bytes, widths: Sequence[int], formats: Sequence[str],
+                    quality: int = 80) -> Tuple[Tuple[int, int], Dict[str, bytes]]:
+    """Decode once and encode every (width, format) thumbnail.
+
+    Runs in a worker process. JPEG sources are decoded with `draft()`, which
+    lets libjpeg scale down by 1/2..1/8 during decoding, so a 12 MP photo is
+    never fully materialised just to make a 640 px thumbnail.
+    """
+    from PIL import Image  # deferred: only decoding needs it, not app startup
+    img = Image.open(io.BytesIO(data))
+    if img.format not in ('JPEG', 'PNG'):
+        raise ValueError("Only JPEG and PNG images are supported")
+    original = img.size
+    largest = min(max(widths), original[0])
+    img.draft('RGB', (largest, max(1, round(original[1] * largest / original[0]))))
+    img = img.convert('RGB')
+
+    variants = {}
+    for width in sorted(widths, reverse=True):
+        width = min(width, original[0])
+        height = max(1, round(original[1] * width / original[0]))
+        # Each step shrinks the previous, already smaller, image
+        if img.size != (width, height):
+            img = img.resize((width, height), Image.LANCZOS, reducing_gap=2.0)
+        for fmt in formats:
+            encoder, options = ENCODERS[fmt]
+            out = io.BytesIO()
+            img.save(out, encoder, quality=quality, **options)
+            variants[f"{width}.{fmt}"] = out.getvalue()
+    return original, variants
+
+
+class ImagePipeline:
+    """Validates uploads and stores fixed-width thumbnails in a content-addressed tree.
+
+    Images live under `<root>/<sha256[:2]>/<sha256>/` named `<width>.<format>`
+    next to a `manifest.json`, so re-uploading the same bytes is free and
+    files can be cached forever. Decoding and encoding happen in the CPU pool
+    of `executor`, whose `cpu_workers` sizes it; without one they run inline.
+    """
+    def __init__(self, root: Union[str, Path], widths: Sequence[int] = (160, 320, 640),
+                 formats: Sequence[str] = ("webp", "jpeg"), quality: int = 80,
+                 max_size: int = 5 * 1024 * 1024, executor: Optional[TaskExecutor] = None):
+        unknown = [fmt for fmt in formats if fmt not in ENCODERS]
+        if unknown:
+            raise ValueError(f"Unsupported thumbnail formats: {', '.join(unknown)}")
+        self.root = Path(root)
+        self.widths = tuple(sorted(widths))
+        self.formats = tuple(formats)
+        self.quality = quality
+        self.max_size = max_size
+        self.executor = executor
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def manifest(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Stored manifest for a content hash, if the image was ingested"""
+        try:
+            return json.loads((self._dir(digest) / "manifest.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def ingest_async(self, file: Union[bytes, str]) -> Future:
+        """Validate and queue an upload; the Future resolves to its manifest"""
+        data = Validators.image_bytes(file, self.max_size)
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self.manifest(digest)
+        if existing is not None:
+            future: Future = Future()
+            future.set_result(existing)
+            return future
+
+        if self.executor is not None:
+            render = self.executor.submit(
+                TaskExecutor.CPU, render_variants, data, self.widths, self.formats, self.quality
+            )
+        else:
+            render = Future()
+            try:
+                render.set_result(render_variants(data, self.widths, self.formats, self.quality))
+            except Exception as e:
+                render.set_exception(e)
+
+        result: Future = Future()
+
+        def store(done: Future):
+            try:
+                result.set_result(self._store(digest, len(data), *done.result()))
+            except Exception as e:
+                result.set_exception(e if isinstance(e, ValueError) else ValueError(f"Invalid image file: {str(e)}"))
+
+        render.add_done_callback(store)
+        return result
+
+    def ingest(self, file: Union[bytes, str], timeout: Optional[float] = 60) -> Dict[str, Any]:
+        """Validate an upload and store its thumbnails, returning the manifest"""
+        return self.ingest_async(file).result(timeout)
+
+    def _store(self, digest: str, original_bytes: int, size: Tuple[int, int],
+               variants: Dict[str, bytes]) -> Dict[str, Any]:
+        directory = self._dir(digest)
+        directory.mkdir(parents=True, exist_ok=True)
+        files = {}
+        for name, payload in variants.items():
+            path = directory / name
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+            files[name] = len(payload)
+
+        manifest = {
+            "hash": digest,
+            "width": size[0],
+            "height": size[1],
+            "original_bytes": original_bytes,
+            "widths": sorted({int(name.split(".")[0]) for name in variants}),
+            "formats": list(self.formats),
+            "files": files
+        }
+        tmp = directory / "manifest.json.tmp"
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, directory / "manifest.json")
+        return manifest
+
+    def path(self, manifest: Dict[str, Any], width: int, fmt: str = "webp") -> Path:
+        """File for the smallest stored variant at least `width` wide (or the largest)"""
+        widths = manifest["widths"]
+        chosen = next((w for w in widths if w >= width), widths[-1])
+        return self._dir(manifest["hash"]) / f"{chosen}.{fmt}"
+
+    def srcset(self, manifest: Dict[str, Any], fmt: str = "webp") -> List[Tuple[Path, int]]:
+        """(path, width) pairs for responsive <img srcset> markup"""
+        return [(self._dir(manifest["hash"]) / f"{w}.{fmt}", w) for w in manifest["widths"]]
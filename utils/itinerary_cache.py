@@ -0,0 +1,191 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from .db import ConnectionManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ItineraryCache:
+    """Persistent cache of generated itineraries keyed on normalised request parameters.
+
+    Results live in the `itinerary_cache` table next to `itineraries`, expire
+    after `ttl_seconds`, and the least recently used rows are evicted beyond
+    `max_entries`. Identical requests that arrive while one is still being
+    generated wait for that generation instead of starting their own.
+    """
+    _instances: Dict[str, "ItineraryCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db: ConnectionManager, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_inflight = 0
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS itinerary_cache (
+                    key TEXT PRIMARY KEY,
+                    city TEXT NOT NULL,
+                    days INTEGER NOT NULL,
+                    interests TEXT NOT NULL,
+                    budget TEXT NOT NULL,
+                    season TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    plan TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hits INTEGER DEFAULT 0
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_itinerary_cache_access
+                ON itinerary_cache (last_access)
+            """)
+
+    @classmethod
+    def for_path(cls, db_path: Union[str, Path], sqlite: Optional[Dict[str, Any]] = None,
+                 **settings) -> "ItineraryCache":
+        """Process-wide cache for a database file"""
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            cache = cls._instances.get(key)
+            if cache is None:
+                cache = cls(ConnectionManager.for_path(db_path, **(sqlite or {})), **settings)
+                cls._instances[key] = cache
+            return cache
+
+    @staticmethod
+    def normalize(city: str, days: int, interests: List[str], budget: str, season: str,
+                  model: str) -> Dict[str, Any]:
+        """Canonical form of a request: case, whitespace and interest order do not matter"""
+        return {
+            "city": " ".join(city.split()).lower(),
+            "days": int(days),
+            "interests": sorted({i.strip().lower() for i in interests or [] if i.strip()}),
+            "budget": budget.strip().lower(),
+            "season": season.strip().lower(),
+            "model": model
+        }
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """Content address of normalised parameters"""
+        canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached plan for a key, or None if missing or expired"""
+        now = time.time()
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT plan FROM itinerary_cache WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE itinerary_cache SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (now, key)
+            )
+        return row['plan']
+
+    def put(self, key: str, params: Dict[str, Any], plan: str):
+        """Store a plan, evicting expired and least recently used rows"""
+        now = time.time()
+        with self.db.connection() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO itinerary_cache
+                (key, city, days, interests, budget, season, model, plan, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    params['city'],
+                    params['days'],
+                    ','.join(params['interests']),
+                    params['budget'],
+                    params['season'],
+                    params['model'],
+                    plan,
+                    now,
+                    now
+                )
+            )
+            conn.execute("DELETE FROM itinerary_cache WHERE created_at <= ?", (now - self.ttl_seconds,))
+            conn.execute(
+                """
+                DELETE FROM itinerary_cache WHERE key IN (
+                    SELECT key FROM itinerary_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+    def get_or_generate(self, params: Dict[str, Any], generate: Callable[[], Tuple[str, bool]]) -> str:
+        """Return a cached plan or generate one, sharing in-flight work for identical requests.
+
+        `generate` returns (plan, cacheable); degraded results such as the
+        template fallback are passed through but not stored.
+        """
+        key = self.make_key(params)
+        try:
+            plan = self.get(key)
+        except Exception as e:
+            logger.warning(f"Itinerary cache read failed: {str(e)}")
+            plan = None
+        if plan is not None:
+            with self._lock:
+                self.hits += 1
+            return plan
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.shared_inflight += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            plan, cacheable = generate()
+            if cacheable:
+                try:
+                    self.put(key, params, plan)
+                except Exception as e:
+                    logger.warning(f"Itinerary cache write failed: {str(e)}")
+            future.set_result(plan)
+            return plan
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and stored entry count"""
+        with self.db.connection() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM itinerary_cache").fetchone()[0]
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared_inflight": self.shared_inflight,
+                "entries": entries
+            }
@@ -0,0 +1,235 @@
+import gc
+import os
+import resource
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .batching import MicroBatcher
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process in MB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024, 1)
+    except (OSError, ValueError):
+        # ru_maxrss is the peak, in KB on Linux
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _load_pipeline(model_name: str):
+    from transformers import pipeline
+    return pipeline("text2text-generation", model=model_name, device="cpu")
+
+
+class LocalModel:
+    """Process-wide, lazily loaded local text2text pipeline.
+
+    The model is built on the first `get()` (or by `warm_up()` in the
+    background), shared by every AIModule in the process, and released again
+    after `idle_unload_seconds` without use. `generate()` routes prompts
+    through a MicroBatcher so concurrent callers share padded batches.
+    """
+    _instances: Dict[str, "LocalModel"] = {}
+    _instances_lock = threading.Lock()
+    retry_after = 60.0
+
+    def __init__(self, model_name: str, idle_unload_seconds: float = 0,
+                 loader: Callable[[str], Any] = _load_pipeline, batch_max_size: int = 8,
+                 batch_max_wait_ms: float = 25, batch_queue_depth: int = 64):
+        self.model_name = model_name
+        self.idle_unload_seconds = idle_unload_seconds
+        self._loader = loader
+        self.batch_max_size = batch_max_size
+        self.batch_max_wait_ms = batch_max_wait_ms
+        self.batch_queue_depth = batch_queue_depth
+        self._batcher: Optional[MicroBatcher] = None
+        self._pipeline = None
+        self._lock = threading.Lock()
+        self._last_used = 0.0
+        self._load_error: Optional[str] = None
+        self._failed_at = 0.0
+        self._watcher: Optional[threading.Thread] = None
+        self.loads = 0
+        self.load_seconds = 0.0
+        self.rss_before_load_mb = 0.0
+        self.rss_after_load_mb = 0.0
+
+    @classmethod
+    def shared(cls, model_name: str, **settings) -> "LocalModel":
+        """The process-wide instance for a model name"""
+        with cls._instances_lock:
+            model = cls._instances.get(model_name)
+            if model is None:
+                model = cls(model_name, **settings)
+                cls._instances[model_name] = model
+            return model
+
+    @property
+    def loaded(self) -> bool:
+        return self._pipeline is not None
+
+    def get(self):
+        """Return the pipeline, loading it on first use; None if it cannot load"""
+        self._last_used = time.monotonic()
+        pipeline = self._pipeline
+        if pipeline is not None:
+            return pipeline
+
+        with self._lock:
+            if self._pipeline is not None:
+                return self._pipeline
+            if self._load_error and time.monotonic() - self._failed_at < self.retry_after:
+                return None
+
+            self.rss_before_load_mb = _rss_mb()
+            start = time.perf_counter()
+            try:
+                self._pipeline = self._loader(self.model_name)
+            except Exception as e:
+                self._load_error = str(e)
+                self._failed_at = time.monotonic()
+                logger.warning(f"Failed to load local model: {str(e)}")
+                return None
+
+            self.load_seconds = time.perf_counter() - start
+            self.rss_after_load_mb = _rss_mb()
+            self.loads += 1
+            self._load_error = None
+            self._last_used = time.monotonic()
+            logger.info(f"Loaded local model {self.model_name} in {self.load_seconds:.2f}s")
+            self._start_idle_watcher()
+            return self._pipeline
+
+    @property
+    def batcher(self) -> MicroBatcher:
+        if self._batcher is None:
+            with self._lock:
+                if self._batcher is None:
+                    self._batcher = MicroBatcher(
+                        self._generate_batch,
+                        max_batch_size=self.batch_max_size,
+                        max_wait_ms=self.batch_max_wait_ms,
+                        max_queue_depth=self.batch_queue_depth,
+                        name="local-model-batcher"
+                    )
+        return self._batcher
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Generate text for one prompt, batched with concurrent callers"""
+        return self.batcher(prompt, timeout)
+
+    def _generate_batch(self, prompts: List[str]) -> List[str]:
+        pipeline = self.get()
+        if pipeline is None:
+            raise RuntimeError(f"Local model unavailable: {self._load_error}")
+        outputs = pipeline(prompts, max_length=500, temperature=0.7, batch_size=len(prompts))
+        # Single-sequence outputs may come back wrapped in a one-element list
+        return [(out[0] if isinstance(out, list) else out)['generated_text'] for out in outputs]
+
+    def generate_stream(self, prompt: str, timeout: float = 60.0) -> Iterator[str]:
+        """Yield decoded text as the model produces tokens.
+
+        Streaming runs one prompt per generate call, outside the batcher,
+        since tokens must flow back to a single caller. Closing the iterator
+        early cancels generation at the next token.
+        """
+        pipeline = self.get()
+        if pipeline is None:
+            raise RuntimeError(f"Local model unavailable: {self._load_error}")
+
+        from transformers import TextIteratorStreamer
+        streamer = TextIteratorStreamer(pipeline.tokenizer, skip_prompt=True,
+                                        skip_special_tokens=True, timeout=timeout)
+        errors: List[Exception] = []
+        cancelled = threading.Event()
+
+        def run():
+            try:
+                # Checked by generate() after every token
+                pipeline(prompt, max_length=500, temperature=0.7, streamer=streamer,
+                         stopping_criteria=[lambda input_ids, scores, **kwargs: cancelled.is_set()])
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        worker = threading.Thread(target=run, name="local-model-stream", daemon=True)
+        worker.start()
+        try:
+            for text in streamer:
+                if text:
+                    yield text
+        finally:
+            # Also reached when the consumer abandons the stream (GeneratorExit)
+            cancelled.set()
+        worker.join()
+        if errors:
+            raise errors[0]
+
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """Load the model ahead of the first request"""
+        if self.loaded:
+            return None
+        if not background:
+            self.get()
+            return None
+        thread = threading.Thread(target=self.get, name="local-model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def unload(self):
+        """Drop the pipeline so its memory can be reclaimed"""
+        with self._lock:
+            if self._pipeline is None:
+                return
+            self._pipeline = None
+        gc.collect()
+        logger.info(f"Unloaded idle local model {self.model_name}")
+
+    def _start_idle_watcher(self):
+        if self.idle_unload_seconds <= 0 or (self._watcher and self._watcher.is_alive()):
+            return
+        self._watcher = threading.Thread(target=self._watch_idle, name="local-model-idle", daemon=True)
+        self._watcher.start()
+
+    def _watch_idle(self):
+        interval = max(min(self.idle_unload_seconds / 4, 30.0), 0.01)
+        while self.loaded:
+            time.sleep(interval)
+            if time.monotonic() - self._last_used >= self.idle_unload_seconds:
+                self.unload()
+
+    def stats(self) -> Dict[str, Any]:
+        """Load timing and memory figures for the admin view and benchmarks"""
+        return {
+            "model": self.model_name,
+            "loaded": self.loaded,
+            "loads": self.loads,
+            "load_seconds": round(self.load_seconds, 3),
+            "rss_before_load_mb": self.rss_before_load_mb,
+            "rss_after_load_mb": self.rss_after_load_mb,
+            "rss_now_mb": _rss_mb(),
+            "load_error": self._load_error,
+            "batching": self._batcher.stats() if self._batcher else None
+        }
+
+
+_worker_models: Dict[Tuple[int, str], LocalModel] = {}
+
+
+def generate_in_worker(model_name: str, prompt: str) -> str:
+    """Generate in a TaskExecutor CPU worker with that process's own copy of the model.
+
+    Keyed by pid so a forked worker never touches the parent's instance, whose
+    batcher thread and locks did not survive the fork. A worker runs one task
+    at a time, so prompts skip the batcher.
+    """
+    key = (os.getpid(), model_name)
+    model = _worker_models.get(key)
+    if model is None:
+        model = _worker_models[key] = LocalModel(model_name, loader=_load_pipeline)
+    return model._generate_batch([prompt])[0]
@@ -0,0 +1,256 @@
+"""Latency histograms, call counts and error rates for the hot paths.
+
+    with metrics.timer("corpus_request", method="GET"):
+        ...
+
+    @metrics.timed("storage", op="load_places", source="sqlite")
+    def _load_local_places(self): ...
+
+Each thread records into its own shard without taking a lock; shards are
+summed when a snapshot is taken, and shards of finished threads are folded
+into a retired total so short-lived request threads do not pile up.
+"""
+import bisect
+import functools
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, roughly 2.5x apart, from sub-millisecond SQLite reads to slow model calls
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "errors", "total")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+
+    def merge(self, other: "_Series"):
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+
+
+class _Timer:
+    __slots__ = ("registry", "key", "start")
+
+    def __init__(self, registry: "MetricsRegistry", key: SeriesKey):
+        self.registry = registry
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry._record(self.key, time.perf_counter() - self.start, exc_type is not None)
+        return False
+
+
+class MetricsRegistry:
+    """Process-wide collection of latency series keyed by name and labels"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[weakref.ref, Dict[SeriesKey, _Series]]] = []
+        self._retired: Dict[SeriesKey, _Series] = {}
+        self._keys: Dict[Tuple, SeriesKey] = {}
+
+    def _key(self, name: str, labels: Dict[str, Any]) -> SeriesKey:
+        # Call sites pass the same labels in the same order, so the raw items make a cheap cache key
+        raw = (name, tuple(labels.items()))
+        key = self._keys.get(raw)
+        if key is None:
+            key = self._keys[raw] = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        return key
+
+    def _record(self, key: SeriesKey, seconds: float, error: bool = False):
+        """Add one call to the calling thread's shard; no other thread ever writes to it"""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = _Series()
+        series.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        series.count += 1
+        series.total += seconds
+        if error:
+            series.errors += 1
+
+    def observe(self, name: str, seconds: float, error: bool = False, **labels: Any):
+        """Record one call that was timed elsewhere"""
+        self._record(self._key(name, labels), seconds, error)
+
+    def timer(self, name: str, **labels: Any) -> "_Timer":
+        """Context manager timing its block; an exception counts as an error and is re-raised"""
+        return _Timer(self, self._key(name, labels))
+
+    def timed(self, name: str, **labels: Any) -> Callable:
+        """Decorator form of `timer`"""
+        key = self._key(name, labels)
+
+        def decorate(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException:
+                    self._record(key, time.perf_counter() - start, True)
+                    raise
+                self._record(key, time.perf_counter() - start)
+                return result
+            return wrapper
+        return decorate
+
+    def snapshot(self) -> Dict[SeriesKey, _Series]:
+        """Sum of every shard; shards of finished threads are merged into the retired total"""
+        merged: Dict[SeriesKey, _Series] = {}
+        with self._lock:
+            live = []
+            for ref, shard in self._shards:
+                thread = ref()
+                alive = thread is not None and thread.is_alive()
+                target = merged if alive else self._retired
+                for key, series in list(shard.items()):
+                    target.setdefault(key, _Series()).merge(series)
+                if alive:
+                    live.append((ref, shard))
+            self._shards = live
+            for key, series in self._retired.items():
+                merged.setdefault(key, _Series()).merge(series)
+        return merged
+
+    def reset(self):
+        """Drop every recorded value (tests)"""
+        with self._lock:
+            for _, shard in self._shards:
+                shard.clear()
+            self._retired.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per series with count, error rate, mean and bucket-estimated percentiles"""
+        rows = []
+        for (name, labels), series in sorted(self.snapshot().items()):
+            rows.append({
+                "metric": name,
+                **dict(labels),
+                "count": series.count,
+                "error_rate": round(series.errors / series.count, 4) if series.count else 0.0,
+                "mean_ms": round(series.total / series.count * 1000, 3) if series.count else 0.0,
+                "p50_ms": _percentile_ms(series, 0.50),
+                "p95_ms": _percentile_ms(series, 0.95),
+                "p99_ms": _percentile_ms(series, 0.99)
+            })
+        return rows
+
+    def prometheus_text(self, prefix: str = "telangana_") -> str:
+        """Histograms and error counters in the Prometheus text exposition format"""
+        by_name: Dict[str, List[Tuple[Tuple[Tuple[str, str], ...], _Series]]] = {}
+        for (name, labels), series in sorted(self.snapshot().items()):
+            by_name.setdefault(name, []).append((labels, series))
+
+        lines = []
+        for name, entries in by_name.items():
+            metric = f"{prefix}{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, series in entries:
+                cumulative = 0
+                for bound, n in zip(BUCKETS + (float("inf"),), series.buckets):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{metric}_bucket{_labels(labels, le=le)} {cumulative}")
+                lines.append(f"{metric}_sum{_labels(labels)} {series.total:.6f}")
+                lines.append(f"{metric}_count{_labels(labels)} {series.count}")
+            lines.append(f"# TYPE {prefix}{name}_errors_total counter")
+            for labels, series in entries:
+                lines.append(f"{prefix}{name}_errors_total{_labels(labels)} {series.errors}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...], **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _percentile_ms(series: _Series, q: float) -> Optional[float]:
+    """Upper bound of the bucket holding the q-th call (None when it is past the last bound)"""
+    if not series.count:
+        return None
+    rank = q * series.count
+    seen = 0
+    for bound, n in zip(BUCKETS, series.buckets):
+        seen += n
+        if seen >= rank:
+            return bound * 1000
+    return None
+
+
+registry = MetricsRegistry()
+observe = registry.observe
+timer = registry.timer
+timed = registry.timed
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Expose /metrics for a Prometheus scraper, once per process"""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+            logger.info(f"Serving metrics on http://{host}:{_server.server_address[1]}/metrics")
+        return _server
+
+
+def shutdown():
+    """Stop the /metrics server (tests and shutdown)"""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
@@ -0,0 +1,277 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from .async_corpus_api import AsyncCorpusAPI
+from .corpus_api import CorpusAPI
+from .db import ConnectionManager
+from requests.exceptions import HTTPError
+from .resilience import CircuitOpenError, backoff_delay
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _is_rejection(error: Exception) -> bool:
+    """A 4xx the backend will repeat however often the write is resent (not 408 or 429)"""
+    if isinstance(error, HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return 400 <= status < 500 and status not in (408, 429)
+    return False
+
+
+class Outbox:
+    """Write-behind queue of Corpus writes stored next to the local data.
+
+    Callers enqueue inside the same transaction as their local insert, so a
+    write is either saved and queued or neither. A background worker posts
+    due entries in concurrent batches with an `Idempotency-Key` header,
+    reschedules transient failures with jittered exponential backoff and
+    moves entries to the `dead` status after `max_attempts` or on a
+    permanent (4xx) rejection.
+    """
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+
+    _instances: Dict[str, "Outbox"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db: ConnectionManager, batch_size: int = 20, max_attempts: int = 8,
+                 poll_seconds: float = 5.0, retry_base: float = 2.0, retry_cap: float = 600.0,
+                 sent_retention_seconds: float = 7 * 24 * 3600):
+        self.db = db
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self.sent_retention_seconds = sent_retention_seconds
+        self._api: Optional[CorpusAPI] = None
+        self._worker: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._drain_lock = threading.Lock()
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idempotency_key TEXT NOT NULL UNIQUE,
+                    collection TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    token TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_outbox_due
+                ON outbox (status, next_attempt_at)
+            """)
+
+    @classmethod
+    def for_path(cls, db_path: Union[str, Path], sqlite: Optional[Dict[str, Any]] = None,
+                 **settings) -> "Outbox":
+        """Process-wide outbox for a database file"""
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            outbox = cls._instances.get(key)
+            if outbox is None:
+                outbox = cls(ConnectionManager.for_path(db_path, **(sqlite or {})), **settings)
+                cls._instances[key] = outbox
+            return outbox
+
+    @classmethod
+    def close_all(cls):
+        """Stop every outbox worker (tests and shutdown)"""
+        with cls._instances_lock:
+            for outbox in cls._instances.values():
+                outbox.close()
+            cls._instances.clear()
+
+    def enqueue(self, conn: sqlite3.Connection, collection: str, payload: Dict[str, Any],
+                token: Optional[str] = None, idempotency_key: Optional[str] = None) -> str:
+        """Queue a write on the caller's connection so it commits with the local insert"""
+        key = idempotency_key or uuid.uuid4().hex
+        now = time.time()
+        conn.execute(
+            """
+            INSERT INTO outbox (idempotency_key, collection, payload, token, next_attempt_at, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (key, collection, json.dumps(payload), token, now, now)
+        )
+        return key
+
+    def enqueue_many(self, conn: sqlite3.Connection, collection: str, payloads: List[Dict[str, Any]],
+                     token: Optional[str] = None) -> int:
+        """Queue many writes on the caller's connection in one executemany"""
+        now = time.time()
+        conn.executemany(
+            """
+            INSERT INTO outbox (idempotency_key, collection, payload, token, next_attempt_at, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [(uuid.uuid4().hex, collection, json.dumps(payload), token, now, now) for payload in payloads]
+        )
+        return len(payloads)
+
+    def notify(self):
+        """Wake the worker so fresh writes go out without waiting for the next poll"""
+        self._wake.set()
+
+    def start(self, api: CorpusAPI):
+        """Run the background drain loop once per process"""
+        self._api = api
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="corpus-outbox", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            drained = {}
+            try:
+                drained = self.drain(self._api)
+            except Exception as e:
+                logger.warning(f"Outbox drain failed: {str(e)}")
+            if drained.get("claimed", 0) < self.batch_size:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def drain(self, api: CorpusAPI) -> Dict[str, int]:
+        """Send one batch of due entries; returns counts by outcome"""
+        counts = {"claimed": 0, "sent": 0, "retry": 0, "dead": 0}
+        if not api.available():
+            return counts
+
+        with self._drain_lock:
+            now = time.time()
+            with self.db.connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT * FROM outbox WHERE status = ? AND next_attempt_at <= ?
+                    ORDER BY id LIMIT ?
+                    """,
+                    (self.PENDING, now, self.batch_size)
+                ).fetchall()
+            counts["claimed"] = len(rows)
+            if not rows:
+                return counts
+
+            endpoints = api.config['endpoints']
+            client = AsyncCorpusAPI(api)
+            responses = client.run_sync(client.gather(
+                *(
+                    client.api_post(
+                        endpoints[row['collection']],
+                        data=json.loads(row['payload']),
+                        token=row['token'],
+                        headers={"Idempotency-Key": row['idempotency_key']}
+                    )
+                    for row in rows
+                ),
+                return_exceptions=True
+            ))
+
+            now = time.time()
+            sent, retry, dead = [], [], []
+            for row, response in zip(rows, responses):
+                if not isinstance(response, Exception):
+                    sent.append((now, row['id']))
+                elif isinstance(response, CircuitOpenError):
+                    # Backend marked down mid-batch: not this entry's fault, try again later
+                    retry.append((row['attempts'], now + self.poll_seconds, str(response), row['id']))
+                elif _is_rejection(response) or row['attempts'] + 1 >= self.max_attempts:
+                    logger.error(f"Outbox entry {row['idempotency_key']} dead-lettered: {str(response)}")
+                    dead.append((row['attempts'] + 1, str(response), row['id']))
+                else:
+                    delay = self.retry_base + backoff_delay(row['attempts'], self.retry_base, self.retry_cap)
+                    retry.append((row['attempts'] + 1, now + delay, str(response), row['id']))
+
+            with self.db.connection() as conn:
+                # Sent entries no longer need the bearer token
+                conn.executemany(
+                    "UPDATE outbox SET status = 'sent', sent_at = ?, token = NULL, last_error = NULL WHERE id = ?",
+                    sent
+                )
+                conn.executemany(
+                    "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                    retry
+                )
+                conn.executemany(
+                    "UPDATE outbox SET status = 'dead', attempts = ?, last_error = ? WHERE id = ?",
+                    dead
+                )
+                conn.execute(
+                    "DELETE FROM outbox WHERE status = 'sent' AND sent_at < ?",
+                    (now - self.sent_retention_seconds,)
+                )
+
+            counts.update(sent=len(sent), retry=len(retry), dead=len(dead))
+            return counts
+
+    def flush(self, api: CorpusAPI, max_batches: int = 100) -> Dict[str, int]:
+        """Drain due entries until none are left (CLI, shutdown and tests)"""
+        totals = {"claimed": 0, "sent": 0, "retry": 0, "dead": 0}
+        for _ in range(max_batches):
+            counts = self.drain(api)
+            for key, value in counts.items():
+                totals[key] += value
+            if counts["claimed"] < self.batch_size:
+                break
+        return totals
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Entries that will not be retried automatically"""
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, idempotency_key, collection, payload, attempts, last_error, created_at
+                FROM outbox WHERE status = 'dead' ORDER BY id LIMIT ?
+                """,
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def requeue_dead(self) -> int:
+        """Give dead-lettered entries a fresh set of attempts"""
+        with self.db.connection() as conn:
+            cursor = conn.execute(
+                "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'dead'",
+                (time.time(),)
+            )
+            count = cursor.rowcount
+        self.notify()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts by status and age of the oldest pending write"""
+        with self.db.connection() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+            oldest = conn.execute(
+                "SELECT MIN(created_at) FROM outbox WHERE status = 'pending'"
+            ).fetchone()[0]
+        return {
+            "pending": counts.get(self.PENDING, 0),
+            "sent": counts.get(self.SENT, 0),
+            "dead": counts.get(self.DEAD, 0),
+            "oldest_pending_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+            "worker_running": bool(self._worker and self._worker.is_alive())
+        }
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Stop the worker after its current batch"""
+        self._stop.set()
+        self._wake.set()
+        if self._worker and self._worker.is_alive():
+            self._worker.join(timeout)
+        self._worker = None
@@ -0,0 +1,267 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+import logging
+from requests.exceptions import HTTPError, RequestException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a sliding window of recent call outcomes.
+
+    The circuit opens once at least `min_calls` outcomes are in the window and
+    the failure rate reaches `failure_rate_threshold`. After `open_seconds` it
+    lets `half_open_max_calls` trial calls through: a success closes it, a
+    failure opens it again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, window_size: int = 20,
+                 min_calls: int = 5, open_seconds: float = 30.0, half_open_max_calls: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._window = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._trials = 0
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+        logger.warning(f"Circuit '{self.name}' opened")
+
+    def available(self) -> bool:
+        """Whether a call would currently be let through (does not reserve a trial)"""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state == self.CLOSED or (
+                self._state == self.HALF_OPEN and self._trials < self.half_open_max_calls
+            )
+
+    def before_call(self):
+        """Reserve permission for a call or raise CircuitOpenError"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"Circuit '{self.name}' is open; failing fast")
+
+    def record_success(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._window.clear()
+                logger.info(f"Circuit '{self.name}' closed")
+            self._window.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._window.append(False)
+            if self._state == self.CLOSED and len(self._window) >= self.min_calls:
+                failures = self._window.count(False)
+                if failures / len(self._window) >= self.failure_rate_threshold:
+                    self._open()
+
+    def release(self):
+        """Give back a half-open trial slot for a call that ended without an outcome"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._maybe_half_open()
+            calls = len(self._window)
+            return {
+                "state": self._state,
+                "window_calls": calls,
+                "failure_rate": round(self._window.count(False) / calls, 3) if calls else 0.0,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected
+            }
+
+
+class AdaptiveTimeout:
+    """Timeout derived from a high percentile of recent successful latencies"""
+    def __init__(self, initial: float, minimum: float = 1.0, maximum: Optional[float] = None,
+                 percentile: float = 0.99, multiplier: float = 3.0, window: int = 200, min_samples: int = 10):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum if maximum is not None else initial
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self._lock:
+            self._samples.append(latency)
+
+    def latency_percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(p * len(ordered)), len(ordered) - 1)]
+
+    def current(self) -> float:
+        """Timeout to use for the next call, in seconds"""
+        with self._lock:
+            enough = len(self._samples) >= self.min_samples
+        if not enough:
+            return self.initial
+        observed = self.latency_percentile(self.percentile) * self.multiplier
+        return max(self.minimum, min(self.maximum, observed))
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 4.0,
+                  rng: Callable[[], float] = random.random) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]"""
+    return rng() * min(cap, base * (2 ** attempt))
+
+
+def is_http_failure(error: Exception) -> bool:
+    """Transport errors, 5xx and 429 count against a backend; other 4xx are the caller's fault"""
+    if isinstance(error, HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, RequestException)
+
+
+class BackendGuard:
+    """Circuit breaker, adaptive timeout and jittered retries for one remote backend.
+
+    Guards are shared process-wide by name, so every client of a backend sees
+    the same circuit state and latency history.
+    """
+    _registry: Dict[str, "BackendGuard"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name: str, timeout: float = 30.0, min_timeout: float = 1.0,
+                 timeout_multiplier: float = 3.0, failure_rate: float = 0.5, window: int = 20,
+                 min_calls: int = 5, open_seconds: float = 30.0, backoff_base: float = 0.5,
+                 backoff_cap: float = 4.0):
+        self.name = name
+        self.breaker = CircuitBreaker(
+            name,
+            failure_rate_threshold=failure_rate,
+            window_size=window,
+            min_calls=min_calls,
+            open_seconds=open_seconds
+        )
+        self.timeout = AdaptiveTimeout(timeout, minimum=min_timeout, maximum=timeout,
+                                       multiplier=timeout_multiplier)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+    @classmethod
+    def get(cls, name: str, **settings) -> "BackendGuard":
+        """Process-wide guard for a backend name"""
+        with cls._registry_lock:
+            guard = cls._registry.get(name)
+            if guard is None:
+                guard = cls(name, **settings)
+                cls._registry[name] = guard
+            return guard
+
+    @classmethod
+    def all_stats(cls) -> Dict[str, Dict[str, Any]]:
+        with cls._registry_lock:
+            guards = dict(cls._registry)
+        return {name: guard.stats() for name, guard in guards.items()}
+
+    @classmethod
+    def reset_all(cls):
+        """Forget every guard (tests and config reloads)"""
+        with cls._registry_lock:
+            cls._registry.clear()
+
+    def available(self) -> bool:
+        return self.breaker.available()
+
+    @contextmanager
+    def track(self, is_failure: Callable[[Exception], bool] = lambda e: True,
+              record_latency: bool = True) -> Iterator[float]:
+        """Guard one call: yields the timeout to use and records the outcome"""
+        self.breaker.before_call()
+        start = time.perf_counter()
+        try:
+            yield self.timeout.current()
+        except Exception as e:
+            if is_failure(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        else:
+            self.breaker.record_success()
+            if record_latency:
+                self.timeout.record(time.perf_counter() - start)
+
+    def call(self, fn: Callable[[float], T], attempts: int = 1,
+             is_failure: Callable[[Exception], bool] = lambda e: True) -> T:
+        """Run fn(timeout) with the breaker, retrying backend failures with jittered backoff"""
+        for attempt in range(attempts):
+            try:
+                with self.track(is_failure) as timeout:
+                    return fn(timeout)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                if attempt == attempts - 1 or not is_failure(e):
+                    raise
+                if not self.breaker.available():
+                    raise CircuitOpenError(f"Circuit '{self.name}' opened while retrying") from e
+                time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_cap))
+        raise RuntimeError("unreachable")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.breaker.stats(),
+            "timeout_seconds": round(self.timeout.current(), 3),
+            "p50_ms": round((self.timeout.latency_percentile(0.5) or 0) * 1000, 1),
+            "p99_ms": round((self.timeout.latency_percentile(0.99) or 0) * 1000, 1)
+        }
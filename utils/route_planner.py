@@ -0,0 +1,255 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .storage import BBOX_JOIN, EARTH_RADIUS_KM, Storage
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def haversine_matrix(lat1: Sequence[float], lon1: Sequence[float],
+                     lat2: Sequence[float], lon2: Sequence[float]) -> np.ndarray:
+    """Great-circle distances in km from every point of the first set to every point of the second"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    dlat = lat2[None, :] - lat1[:, None]
+    dlon = lon2[None, :] - lon1[:, None]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1)[:, None] * np.cos(lat2)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class DistanceMatrix:
+    """Pairwise place distances (float32, km), grown a block at a time.
+
+    Rows are keyed by place id. Adding k places to n computes only the new
+    k x (n + k) block, and a place whose coordinates changed has just its row
+    and column recomputed. Past `max_places` the matrix starts over with the
+    places being requested.
+    """
+    def __init__(self, max_places: int = 4000):
+        self.max_places = max_places
+        self._lock = threading.Lock()
+        self._reset()
+
+    def clear(self):
+        """Forget every place and distance"""
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self._rows: Dict[str, int] = {}
+        self._coords = np.zeros((0, 2))
+        self._dist = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self.computed = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, needed: int):
+        capacity = self._dist.shape[0]
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 64)
+        dist = np.zeros((capacity, capacity), dtype=np.float32)
+        dist[:self._size, :self._size] = self._dist[:self._size, :self._size]
+        coords = np.zeros((capacity, 2))
+        coords[:self._size] = self._coords[:self._size]
+        self._dist, self._coords = dist, coords
+
+    def rows(self, ids: Sequence[str], lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Matrix rows for the given places, computing distances for new or moved ones"""
+        with self._lock:
+            return self._locate(ids, lats, lons)
+
+    def rows_and_submatrix(self, ids: Sequence[str], lats: np.ndarray,
+                           lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """rows() plus the distances between those places, taken under one lock so a reset cannot stale the rows"""
+        with self._lock:
+            rows = self._locate(ids, lats, lons)
+            return rows, self._dist[np.ix_(rows, rows)].astype(np.float64)
+
+    def _locate(self, ids: Sequence[str], lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        missing = sum(1 for place_id in ids if place_id not in self._rows)
+        if self._size + missing > self.max_places:
+            self._reset()
+        self._reserve(self._size + len(ids))
+
+        rows = np.empty(len(ids), dtype=np.int64)
+        for i, place_id in enumerate(ids):
+            row = self._rows.get(place_id)
+            if row is None:
+                row = self._rows[place_id] = self._size
+                self._size += 1
+                self._coords[row] = (np.nan, np.nan)
+            rows[i] = row
+
+        coords = np.column_stack([lats, lons])
+        stale = np.flatnonzero(np.any(self._coords[rows] != coords, axis=1))
+        if len(stale):
+            stale_rows = rows[stale]
+            self._coords[stale_rows] = coords[stale]
+            live = self._coords[:self._size]
+            block = haversine_matrix(coords[stale, 0], coords[stale, 1], live[:, 0], live[:, 1])
+            self._dist[stale_rows, :self._size] = block
+            self._dist[:self._size, stale_rows] = block.T
+            self.computed += block.size
+        return rows
+
+    def submatrix(self, rows: np.ndarray) -> np.ndarray:
+        """Distances between the given rows, in their order"""
+        with self._lock:
+            return self._dist[np.ix_(rows, rows)].astype(np.float64)
+
+
+def nearest_neighbour_tour(dist: np.ndarray) -> List[int]:
+    """Closed tour from node 0 that always moves to the closest unvisited node"""
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    tour = [0]
+    for _ in range(n - 1):
+        candidates = np.where(visited, np.inf, dist[tour[-1]])
+        nxt = int(np.argmin(candidates))
+        visited[nxt] = True
+        tour.append(nxt)
+    return tour + [0]
+
+
+def two_opt(tour: List[int], dist: np.ndarray, deadline: float) -> List[int]:
+    """Reverse tour segments while that shortens it, until no move helps or the deadline passes"""
+    tour = np.array(tour)
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(1, len(tour) - 2):
+            a, b = tour[i - 1], tour[i]
+            c, d = tour[i + 1:-1], tour[i + 2:]
+            # Gain of reversing tour[i..j] for every j at once
+            delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+            j = int(np.argmin(delta))
+            if delta[j] < -1e-9:
+                tour[i:i + j + 2] = tour[i:i + j + 2][::-1]
+                improved = True
+            if time.perf_counter() >= deadline:
+                break
+    return tour.tolist()
+
+
+def tour_length(tour: Sequence[int], dist: np.ndarray) -> float:
+    return float(sum(dist[a, b] for a, b in zip(tour, tour[1:])))
+
+
+class RoutePlanner:
+    """Deterministic itinerary engine over the stored places.
+
+    Picks the located places that match the trip's interests and season and
+    are closest to the starting city (found through the places R*Tree),
+    splits them into one cluster per day by bearing from the start (cutting
+    at the widest empty sector), and orders each day as a round trip with nearest-neighbour plus 2-opt within
+    `time_budget_ms`. Distances come from a shared `DistanceMatrix`.
+    """
+    def __init__(self, storage: Storage, per_day: int = 3, time_budget_ms: float = 50,
+                 max_matrix_places: int = 4000):
+        self.storage = storage
+        self.per_day = per_day
+        self.time_budget_ms = time_budget_ms
+        self.matrix = DistanceMatrix(max_matrix_places)
+
+    def _filters(self, interests: Sequence[str], season: Optional[str]) -> tuple:
+        clauses, args = [], []
+        if season and season.lower() != 'all':
+            clauses.append("(p.season = ? COLLATE NOCASE OR p.season = 'All')")
+            args.append(season)
+        if interests:
+            clauses.append(f"LOWER(p.category) IN ({', '.join('?' * len(interests))})")
+            args.extend(i.lower() for i in interests)
+        return "".join(f" AND {c}" for c in clauses), args
+
+    def _start(self, conn, city: str, where: str, args: list) -> Optional[tuple]:
+        row = conn.execute(
+            """
+            SELECT AVG(lat), AVG(lon) FROM places p
+            WHERE (district = ? COLLATE NOCASE OR name = ? COLLATE NOCASE) AND lat IS NOT NULL
+            """,
+            (city, city)
+        ).fetchone()
+        if row[0] is None:
+            # Unknown city: start from the middle of the matching places
+            row = conn.execute(f"SELECT AVG(lat), AVG(lon) FROM places p WHERE lat IS NOT NULL{where}", args).fetchone()
+        return None if row[0] is None else (row[0], row[1])
+
+    def _nearest(self, conn, start: tuple, wanted: int, where: str, args: list) -> List[Dict[str, Any]]:
+        """The `wanted` matching places closest to start, widening an R*Tree box until they are found"""
+        radius = 25.0
+        while True:
+            dlat = np.degrees(radius / EARTH_RADIUS_KM)
+            dlon = dlat / max(np.cos(np.radians(start[0])), 1e-6)
+            bbox = (start[0] - dlat, start[0] + dlat, start[1] - dlon, start[1] + dlon) * 2
+            rows = [dict(row) for row in conn.execute(
+                f"SELECT p.id, p.name, p.district, p.category, p.description, p.lat, p.lon "
+                f"{BBOX_JOIN}{where}",
+                (*bbox, *args)
+            ).fetchall()]
+            distances = haversine_matrix([start[0]], [start[1]], [r['lat'] for r in rows], [r['lon'] for r in rows])[0]
+            # Only places inside the inscribed circle are certainly nearer than anything outside the box
+            if (distances <= radius).sum() >= wanted or radius >= np.pi * EARTH_RADIUS_KM:
+                break
+            radius *= 2
+        order = np.argsort(distances, kind='stable')[:wanted]
+        return [{**rows[i], 'from_start_km': float(distances[i])} for i in order]
+
+    def _candidates(self, city: str, wanted: int, interests: Sequence[str],
+                    season: Optional[str]) -> tuple:
+        with self.storage.db.connection() as conn:
+            for filters in ((interests, season), ((), season)):
+                where, args = self._filters(*filters)
+                start = self._start(conn, city, where, args)
+                if start is not None:
+                    places = self._nearest(conn, start, wanted, where, args)
+                    if places:
+                        return start, places
+                # No place matches the interests: any place in season beats placeholders
+        return None, []
+
+    @staticmethod
+    def _split_by_bearing(lats: np.ndarray, lons: np.ndarray, start: tuple, days: int) -> List[np.ndarray]:
+        bearings = np.arctan2(lats - start[0], (lons - start[1]) * np.cos(np.radians(start[0])))
+        order = np.argsort(bearings, kind='stable')
+        gaps = np.diff(np.append(bearings[order], bearings[order[0]] + 2 * np.pi))
+        order = np.roll(order, -(int(np.argmax(gaps)) + 1))
+        return [chunk for chunk in np.array_split(order, days) if len(chunk)]
+
+    def plan(self, city: str, days: int, interests: Sequence[str] = (),
+             season: Optional[str] = None) -> Dict[str, Any]:
+        """Day-by-day round trips from the city; empty 'days' when no stored place has coordinates"""
+        started = time.perf_counter()
+        deadline = started + self.time_budget_ms / 1000
+        wanted = min(days * self.per_day, self.matrix.max_places)
+        start, pool = self._candidates(city, wanted, interests, season) if days >= 1 else (None, [])
+        if not pool:
+            return {'start': None, 'days': [], 'total_km': 0.0, 'solve_ms': 0.0}
+
+        lats = np.array([p['lat'] for p in pool], dtype=np.float64)
+        lons = np.array([p['lon'] for p in pool], dtype=np.float64)
+        from_start = np.array([p.pop('from_start_km') for p in pool])
+        _, between = self.matrix.rows_and_submatrix([p['id'] for p in pool], lats, lons)
+        plan_days = []
+        for day, members in enumerate(self._split_by_bearing(lats, lons, start, days), start=1):
+            # Node 0 is the starting city, node k is members[k - 1]
+            dist = np.zeros((len(members) + 1, len(members) + 1))
+            dist[1:, 1:] = between[np.ix_(members, members)]
+            dist[0, 1:] = dist[1:, 0] = from_start[members]
+            tour = two_opt(nearest_neighbour_tour(dist), dist, deadline)
+            plan_days.append({
+                'day': day,
+                'places': [pool[members[node - 1]] for node in tour[1:-1]],
+                'distance_km': round(tour_length(tour, dist), 1)
+            })
+
+        return {
+            'start': {'lat': start[0], 'lon': start[1]},
+            'days': plan_days,
+            'total_km': round(sum(d['distance_km'] for d in plan_days), 1),
+            'solve_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
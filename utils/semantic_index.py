@@ -0,0 +1,217 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+Encoder = Callable[[Sequence[str]], np.ndarray]
+
+
+class EmbeddingIndex:
+    """Append-only, memory-mapped float32 embedding index with cosine top-k search.
+
+    Vectors are L2-normalised and stored row-major in `vectors.f32`, with the
+    matching ids one per line in `ids.txt`, so a cold start maps the file
+    instead of re-embedding anything. Re-saving an id overwrites its row in
+    place. Above `ann_threshold` rows, queries first probe random-hyperplane
+    LSH buckets (Hamming distance <= 1) and only fall back to an exact scan
+    when too few candidates are found.
+    """
+    _instances: Dict[str, "EmbeddingIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, index_dir: Union[str, Path], model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 encoder: Optional[Encoder] = None, ann_bits: int = 12, ann_threshold: int = 50_000):
+        self.index_dir = Path(index_dir)
+        self.model_name = model_name
+        self.ann_bits = ann_bits
+        self.ann_threshold = ann_threshold
+        self._encoder = encoder
+        self._encoder_error: Optional[str] = None
+        self._lock = threading.RLock()
+        self._vectors_path = self.index_dir / "vectors.f32"
+        self._ids_path = self.index_dir / "ids.txt"
+        self._meta_path = self.index_dir / "meta.json"
+        self.dim: Optional[int] = None
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._mapped_size = -1
+        self._planes: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._buckets: Dict[int, List[int]] = {}
+
+    @classmethod
+    def for_dir(cls, index_dir: Union[str, Path], **kwargs) -> "EmbeddingIndex":
+        """Process-wide index for a directory"""
+        key = str(Path(index_dir).resolve())
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls(index_dir, **kwargs)
+                cls._instances[key] = index
+            return index
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._ids)
+
+    def _encode(self, texts: Sequence[str]) -> np.ndarray:
+        if self._encoder is None:
+            if self._encoder_error:
+                raise RuntimeError(self._encoder_error)
+            try:
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(self.model_name, device="cpu")
+            except Exception as e:
+                self._encoder_error = f"Embedding model unavailable: {str(e)}"
+                raise RuntimeError(self._encoder_error)
+            self._encoder = lambda batch: model.encode(list(batch), convert_to_numpy=True, show_progress_bar=False)
+
+        vectors = np.asarray(self._encoder(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _refresh(self):
+        """(Re)map the vector file if it was created or grew since the last look"""
+        if not self._vectors_path.exists():
+            return
+        size = self._vectors_path.stat().st_size
+        if size == self._mapped_size:
+            return
+
+        if self.dim is None:
+            self.dim = json.loads(self._meta_path.read_text())["dim"]
+        with open(self._ids_path, encoding="utf-8") as f:
+            ids = f.read().splitlines()
+        rows = size // (self.dim * 4)
+        ids = ids[:rows]
+
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(len(ids), self.dim)) if ids else None
+        self._ids = ids
+        self._rows = {place_id: i for i, place_id in enumerate(ids)}
+        self._mapped_size = size
+        self._codes = None
+
+    def upsert(self, items: Sequence[Tuple[str, str]]):
+        """Embed (id, text) pairs and append them, overwriting ids already indexed"""
+        items = list(dict(items).items())  # last write wins for repeated ids
+        if not items:
+            return
+        vectors = self._encode([text for _, text in items])
+
+        with self._lock:
+            self._refresh()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self.index_dir.mkdir(parents=True, exist_ok=True)
+                self._meta_path.write_text(json.dumps({"dim": self.dim, "model": self.model_name}))
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+
+            new_ids, new_rows = [], []
+            with open(self._vectors_path, "r+b" if self._vectors_path.exists() else "wb") as f:
+                for (place_id, _), vector in zip(items, vectors):
+                    row = self._rows.get(place_id)
+                    if row is not None:
+                        f.seek(row * self.dim * 4)
+                        f.write(vector.tobytes())
+                        if self._codes is not None:
+                            self._move_bucket(row, vector)
+                    else:
+                        new_ids.append(place_id)
+                        new_rows.append(vector)
+                f.seek(0, os.SEEK_END)
+                for vector in new_rows:
+                    f.write(vector.tobytes())
+
+            if new_ids:
+                with open(self._ids_path, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{place_id}\n" for place_id in new_ids))
+                # Remap to the grown file, keeping LSH codes current without a full rebuild
+                codes = self._codes
+                self._mapped_size = -1
+                self._refresh()
+                if codes is not None:
+                    self._extend_codes(codes, np.vstack(new_rows))
+
+    def search(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (id, cosine similarity) pairs for a free-text query"""
+        query = self._encode([text])[0]
+        return self.search_vector(query, k)
+
+    def search_vector(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (id, cosine similarity) pairs for a normalised query vector"""
+        with self._lock:
+            self._refresh()
+            vectors, ids = self._vectors, self._ids
+            if vectors is None or not ids:
+                return []
+
+            candidates = None
+            if len(ids) >= self.ann_threshold and self.ann_bits:
+                candidates = self._ann_candidates(query)
+                if len(candidates) < k:
+                    candidates = None
+
+        if candidates is None:
+            scores = vectors @ query
+            rows = np.arange(len(scores))
+        else:
+            rows = candidates
+            scores = vectors[rows] @ query
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(ids[rows[i]], float(scores[i])) for i in top]
+
+    # -- approximate nearest neighbours -----------------------------------
+
+    def _hyperplanes(self) -> np.ndarray:
+        if self._planes is None:
+            rng = np.random.default_rng(self.dim)
+            self._planes = rng.standard_normal((self.ann_bits, self.dim)).astype(np.float32)
+        return self._planes
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        bits = (vectors @ self._hyperplanes().T) > 0
+        return bits.astype(np.int64) @ (1 << np.arange(self.ann_bits, dtype=np.int64))
+
+    def _build_codes(self):
+        codes = np.empty(len(self._ids), dtype=np.int64)
+        chunk = 65_536
+        for start in range(0, len(codes), chunk):
+            codes[start:start + chunk] = self._hash(np.asarray(self._vectors[start:start + chunk]))
+        self._codes = codes
+        self._buckets = {}
+        for row, code in enumerate(codes.tolist()):
+            self._buckets.setdefault(code, []).append(row)
+
+    def _extend_codes(self, previous: np.ndarray, vectors: np.ndarray):
+        start = len(previous)
+        new_codes = self._hash(vectors)
+        self._codes = np.concatenate([previous, new_codes])
+        for offset, code in enumerate(new_codes.tolist()):
+            self._buckets.setdefault(code, []).append(start + offset)
+
+    def _move_bucket(self, row: int, vector: np.ndarray):
+        old_code = int(self._codes[row])
+        new_code = int(self._hash(vector[None, :])[0])
+        if old_code != new_code:
+            self._buckets[old_code].remove(row)
+            self._buckets.setdefault(new_code, []).append(row)
+            self._codes[row] = new_code
+
+    def _ann_candidates(self, query: np.ndarray) -> np.ndarray:
+        if self._codes is None:
+            self._build_codes()
+        code = int(self._hash(query[None, :])[0])
+        probes = [code] + [code ^ (1 << bit) for bit in range(self.ann_bits)]
+        rows = [row for probe in probes for row in self._buckets.get(probe, ())]
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
@@ -0,0 +1,256 @@
+import math
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from .db import ConnectionManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+Score = Tuple[str, float]
+
+POSITIVE_WORDS = frozenset("""
+    amazing awesome beautiful best breathtaking calm charming clean comfortable cool delightful
+    enjoy enjoyed enjoyable excellent fantastic fascinating fine friendly fun gorgeous good great
+    happy helpful impressive incredible lovely magnificent marvellous memorable nice peaceful
+    perfect pleasant recommend recommended relaxing scenic serene spectacular stunning superb
+    tasty thrilling wonderful worth worthwhile well-maintained love loved liked
+""".split())
+NEGATIVE_WORDS = frozenset("""
+    awful bad boring broken closed crowded dangerous dirty disappointed disappointing dull
+    expensive filthy hate hated horrible messy mediocre noisy overcrowded overpriced
+    overrated poor rude sad scam smelly terrible tiring ugly unsafe unpleasant unhelpful
+    waste worse worst rubbish littered neglected
+""".split())
+NEGATIONS = frozenset("not no never none nothing nor neither without hardly barely cannot".split())
+INTENSIFIERS = {"very": 1.5, "really": 1.5, "extremely": 1.8, "so": 1.3, "too": 1.3, "absolutely": 1.8,
+                "quite": 1.2, "somewhat": 0.6, "slightly": 0.5}
+TOKEN = re.compile(r"[a-z][a-z'-]*")
+
+
+def label_for(score: float, neutral_band: float = 0.05) -> str:
+    if score >= neutral_band:
+        return "Positive"
+    if score <= -neutral_band:
+        return "Negative"
+    return "Neutral"
+
+
+class LexiconScorer:
+    """Word-list sentiment with negation, intensifiers and 'but' contrast.
+
+    Scores are in [-1, 1]. Good enough to sort feedback on a CPU-only box
+    without model weights, and fast: tens of thousands of rows per second.
+    """
+    name = "lexicon"
+
+    def score_one(self, text: str) -> Score:
+        tokens = TOKEN.findall(text.lower().replace("n't", " not"))
+        total = 0.0
+        weight = 1.0
+        for i, token in enumerate(tokens):
+            if token == "but":
+                # The clause after "but" usually carries the verdict
+                total *= 0.5
+                weight = 1.5
+                continue
+            polarity = 1.0 if token in POSITIVE_WORDS else -1.0 if token in NEGATIVE_WORDS else 0.0
+            if not polarity:
+                continue
+            window = tokens[max(0, i - 3):i]
+            if any(w in NEGATIONS for w in window):
+                polarity *= -0.75
+            if i and tokens[i - 1] in INTENSIFIERS:
+                polarity *= INTENSIFIERS[tokens[i - 1]]
+            total += polarity * weight
+        score = total / math.sqrt(total * total + 4) if total else 0.0
+        return label_for(score), round(score, 4)
+
+    def score(self, texts: Sequence[str]) -> List[Score]:
+        return [self.score_one(text) for text in texts]
+
+
+def _load_classifier(model_name: str):
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=model_name, device="cpu")
+
+
+class TransformersScorer:
+    """Small CPU sentiment model scored in batches, falling back to the lexicon if it cannot load"""
+    def __init__(self, model_name: str, batch_size: int = 32,
+                 loader: Callable[[str], Any] = _load_classifier):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._loader = loader
+        self._pipeline = None
+        self._fallback: Optional[LexiconScorer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return "lexicon" if self._fallback else self.model_name
+
+    def _get(self):
+        if self._pipeline is None and self._fallback is None:
+            with self._lock:
+                if self._pipeline is None and self._fallback is None:
+                    try:
+                        self._pipeline = self._loader(self.model_name)
+                    except Exception as e:
+                        logger.warning(f"Sentiment model {self.model_name} unavailable, using lexicon: {str(e)}")
+                        self._fallback = LexiconScorer()
+        return self._pipeline
+
+    def score(self, texts: Sequence[str]) -> List[Score]:
+        pipeline = self._get()
+        if pipeline is None:
+            return self._fallback.score(texts)
+        results = []
+        for output in pipeline(list(texts), batch_size=self.batch_size, truncation=True):
+            label = output["label"].upper()
+            sign = 1 if label.startswith("POS") else -1 if label.startswith("NEG") else 0
+            # Binary models report confidence in 0.5..1; near 0.5 reads as neutral
+            score = sign * (2 * output["score"] - 1)
+            results.append((label_for(score, neutral_band=0.2), round(score, 4)))
+        return results
+
+
+class SentimentWorker:
+    """Background scorer for feedback rows that have not been classified yet.
+
+    Rows with `scored_at IS NULL` are picked up `batch_size` at a time (via a
+    partial index), scored with one model call and written back with a
+    single `executemany`. Saving feedback only pokes the worker, so writes
+    never wait on the model.
+    """
+    _instances: Dict[str, "SentimentWorker"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db: ConnectionManager, scorer: Any, batch_size: int = 64,
+                 poll_seconds: float = 5.0, on_change: Optional[Callable[[], None]] = None):
+        self.db = db
+        self.scorer = scorer
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.on_change = on_change
+        self._worker: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._score_lock = threading.Lock()
+        self.scored_total = 0
+        self.busy_seconds = 0.0
+        self.last_batch_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    @classmethod
+    def for_path(cls, db_path: Union[str, Path], scorer_factory: Callable[[], Any],
+                 sqlite: Optional[Dict[str, Any]] = None, **settings) -> "SentimentWorker":
+        """Process-wide worker for a database file"""
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            worker = cls._instances.get(key)
+            if worker is None:
+                worker = cls(ConnectionManager.for_path(db_path, **(sqlite or {})), scorer_factory(), **settings)
+                cls._instances[key] = worker
+            return worker
+
+    @classmethod
+    def close_all(cls):
+        """Stop every worker (tests and shutdown)"""
+        with cls._instances_lock:
+            for worker in cls._instances.values():
+                worker.close()
+            cls._instances.clear()
+
+    def notify(self):
+        """Wake the worker so new feedback is scored without waiting for the next poll"""
+        self._wake.set()
+
+    def start(self):
+        """Run the background scoring loop once per process"""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="feedback-sentiment", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            scored = 0
+            try:
+                scored = self.score_batch()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"Sentiment scoring failed: {str(e)}")
+            if scored < self.batch_size:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def score_batch(self) -> int:
+        """Score one batch of unscored feedback; returns the number of rows written"""
+        with self._score_lock:
+            with self.db.connection() as conn:
+                rows = conn.execute(
+                    "SELECT id, feedback FROM feedback WHERE scored_at IS NULL ORDER BY id LIMIT ?",
+                    (self.batch_size,)
+                ).fetchall()
+            if not rows:
+                return 0
+
+            start = time.perf_counter()
+            scores = self.scorer.score([row['feedback'] for row in rows])
+            now = time.time()
+            with self.db.connection() as conn:
+                # The text guard skips rows edited (e.g. by sync) while they were being scored
+                conn.executemany(
+                    """
+                    UPDATE feedback SET sentiment = ?, sentiment_score = ?, scored_at = ?
+                    WHERE id = ? AND feedback = ?
+                    """,
+                    [(label, score, now, row['id'], row['feedback']) for row, (label, score) in zip(rows, scores)]
+                )
+            elapsed = time.perf_counter() - start
+            self.scored_total += len(rows)
+            self.busy_seconds += elapsed
+            self.last_batch_ms = round(elapsed * 1000, 2)
+            self.last_error = None
+
+        if self.on_change:
+            self.on_change()
+        return len(rows)
+
+    def score_pending(self, max_batches: int = 1000) -> int:
+        """Score the whole backlog inline (CLI, tests and benchmarks)"""
+        total = 0
+        for _ in range(max_batches):
+            scored = self.score_batch()
+            total += scored
+            if scored < self.batch_size:
+                break
+        return total
+
+    def backlog(self) -> int:
+        with self.db.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM feedback WHERE scored_at IS NULL").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Backlog depth, throughput and model in use"""
+        return {
+            "backlog": self.backlog(),
+            "scored_total": self.scored_total,
+            "rows_per_sec": round(self.scored_total / self.busy_seconds, 1) if self.busy_seconds else 0.0,
+            "last_batch_ms": self.last_batch_ms,
+            "model": self.scorer.name,
+            "last_error": self.last_error,
+            "worker_running": bool(self._worker and self._worker.is_alive())
+        }
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Stop the worker after its current batch"""
+        self._stop.set()
+        self._wake.set()
+        if self._worker and self._worker.is_alive():
+            self._worker.join(timeout)
+        self._worker = None
@@ -0,0 +1,234 @@
+"""Visitor statistics kept as trigger-maintained aggregate tables.
+
+    python -m utils.stats show
+    python -m utils.stats rebuild
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional
+from .db import ConnectionManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Itinerary interests are stored comma-joined; this turns them into a JSON array for json_each.
+# json_quote escapes quotes, backslashes and control characters and never emits a comma of its own.
+_INTERESTS_JSON = """'[' || replace(json_quote({col}), ',', '","') || ']'"""
+
+_FEEDBACK_ADD = """
+    INSERT INTO feedback_place_stats (place, sentiment, count)
+    VALUES (new.place, COALESCE(new.sentiment, 'Neutral'), 1)
+    ON CONFLICT (place, sentiment) DO UPDATE SET count = count + 1;
+    INSERT INTO feedback_day_stats (day, sentiment, count)
+    VALUES (date(new.created_at), COALESCE(new.sentiment, 'Neutral'), 1)
+    ON CONFLICT (day, sentiment) DO UPDATE SET count = count + 1;
+"""
+_PLACE_KEY = "place = old.place AND sentiment = COALESCE(old.sentiment, 'Neutral')"
+_DAY_KEY = "day = date(old.created_at) AND sentiment = COALESCE(old.sentiment, 'Neutral')"
+_FEEDBACK_REMOVE = f"""
+    UPDATE feedback_place_stats SET count = count - 1 WHERE {_PLACE_KEY};
+    DELETE FROM feedback_place_stats WHERE {_PLACE_KEY} AND count <= 0;
+    UPDATE feedback_day_stats SET count = count - 1 WHERE {_DAY_KEY};
+    DELETE FROM feedback_day_stats WHERE {_DAY_KEY} AND count <= 0;
+"""
+_ITINERARY_ADD = f"""
+    INSERT INTO itinerary_stats (dimension, value, count)
+    SELECT dimension, value, 1 FROM (
+        SELECT 'start' AS dimension, new.start AS value
+        UNION ALL SELECT 'budget', new.budget
+        UNION ALL SELECT 'days', CAST(new.days AS TEXT)
+        UNION ALL SELECT 'day', date(new.created_at)
+        UNION ALL SELECT DISTINCT 'interest', trim(value) FROM json_each({_INTERESTS_JSON.format(col='new.interests')})
+    ) WHERE value IS NOT NULL AND value != ''
+    ON CONFLICT (dimension, value) DO UPDATE SET count = count + 1;
+"""
+_ITINERARY_KEYS = f"""(dimension, value) IN (
+    SELECT 'start', old.start
+    UNION ALL SELECT 'budget', old.budget
+    UNION ALL SELECT 'days', CAST(old.days AS TEXT)
+    UNION ALL SELECT 'day', date(old.created_at)
+    UNION ALL SELECT 'interest', trim(value) FROM json_each({_INTERESTS_JSON.format(col='old.interests')})
+)"""
+_ITINERARY_REMOVE = f"""
+    UPDATE itinerary_stats SET count = count - 1 WHERE {_ITINERARY_KEYS};
+    DELETE FROM itinerary_stats WHERE {_ITINERARY_KEYS} AND count <= 0;
+"""
+
+
+class VisitorStats:
+    """Dashboard counts that cost O(groups) to read instead of O(rows).
+
+    Feedback is counted per (place, sentiment) and per (day, sentiment), and
+    `itinerary_stats` holds one row per (dimension, value) for start city, budget,
+    trip length, day and each interest. Triggers on `feedback` and
+    `itineraries` keep both current for every writer (saves, sync, the
+    sentiment worker); `rebuild()` recomputes them from scratch.
+    """
+    def __init__(self, db: ConnectionManager):
+        self.db = db
+        with self.db.connection() as conn:
+            self._init_schema(conn)
+
+    @staticmethod
+    def _init_schema(conn: sqlite3.Connection):
+        existing = {row[0] for row in conn.execute(
+            """
+            SELECT name FROM sqlite_master
+            WHERE name IN ('feedback_place_stats', 'feedback_day_stats', 'itinerary_stats')
+            """
+        )}
+        # Triggers from before interests were quoted with json_quote choke on control characters
+        for (name,) in conn.execute(
+            """
+            SELECT name FROM sqlite_master
+            WHERE type = 'trigger' AND name LIKE 'itinerary_stats_%' AND sql NOT LIKE '%json_quote%'
+            """
+        ).fetchall():
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS feedback_place_stats (
+                place TEXT NOT NULL,
+                sentiment TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (place, sentiment)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS feedback_day_stats (
+                day TEXT NOT NULL,
+                sentiment TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (day, sentiment)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS itinerary_stats (
+                dimension TEXT NOT NULL,
+                value TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (dimension, value)
+            ) WITHOUT ROWID;
+            CREATE TRIGGER IF NOT EXISTS feedback_stats_insert AFTER INSERT ON feedback BEGIN
+                {_FEEDBACK_ADD}
+            END;
+            CREATE TRIGGER IF NOT EXISTS feedback_stats_update AFTER UPDATE OF place, sentiment, created_at ON feedback
+            WHEN old.place IS NOT new.place OR old.sentiment IS NOT new.sentiment
+              OR old.created_at IS NOT new.created_at BEGIN
+                {_FEEDBACK_REMOVE}
+                {_FEEDBACK_ADD}
+            END;
+            CREATE TRIGGER IF NOT EXISTS feedback_stats_delete AFTER DELETE ON feedback BEGIN
+                {_FEEDBACK_REMOVE}
+            END;
+            CREATE TRIGGER IF NOT EXISTS itinerary_stats_insert AFTER INSERT ON itineraries BEGIN
+                {_ITINERARY_ADD}
+            END;
+            CREATE TRIGGER IF NOT EXISTS itinerary_stats_delete AFTER DELETE ON itineraries BEGIN
+                {_ITINERARY_REMOVE}
+            END;
+        """)
+        if len(existing) < 3:
+            VisitorStats._fill(conn)
+
+    @staticmethod
+    def _fill(conn: sqlite3.Connection):
+        for table in ('feedback_place_stats', 'feedback_day_stats', 'itinerary_stats'):
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute("""
+            INSERT INTO feedback_place_stats (place, sentiment, count)
+            SELECT place, COALESCE(sentiment, 'Neutral'), COUNT(*) FROM feedback GROUP BY 1, 2
+        """)
+        conn.execute("""
+            INSERT INTO feedback_day_stats (day, sentiment, count)
+            SELECT date(created_at), COALESCE(sentiment, 'Neutral'), COUNT(*) FROM feedback GROUP BY 1, 2
+        """)
+        conn.execute(f"""
+            INSERT INTO itinerary_stats (dimension, value, count)
+            SELECT dimension, value, COUNT(*) FROM (
+                SELECT 'start' AS dimension, start AS value FROM itineraries
+                UNION ALL SELECT 'budget', budget FROM itineraries
+                UNION ALL SELECT 'days', CAST(days AS TEXT) FROM itineraries
+                UNION ALL SELECT 'day', date(created_at) FROM itineraries
+                UNION ALL SELECT 'interest', value FROM (
+                    SELECT DISTINCT i.id, trim(j.value) AS value
+                    FROM itineraries i, json_each({_INTERESTS_JSON.format(col='i.interests')}) j
+                )
+            ) WHERE value IS NOT NULL AND value != ''
+            GROUP BY dimension, value
+        """)
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Recompute every aggregate from the base tables (backfills, repairs)"""
+        start = time.perf_counter()
+        with self.db.connection() as conn:
+            self._fill(conn)
+            groups = conn.execute(
+                """
+                SELECT (SELECT COUNT(*) FROM feedback_place_stats) + (SELECT COUNT(*) FROM feedback_day_stats)
+                     + (SELECT COUNT(*) FROM itinerary_stats)
+                """
+            ).fetchone()[0]
+        return {"groups": groups, "seconds": round(time.perf_counter() - start, 3)}
+
+    def summary(self, top: int = 10, days: Optional[int] = 30) -> Dict[str, Any]:
+        """Totals, top places with their sentiment split, daily counts and popular trip choices"""
+        with self.db.connection() as conn:
+            by_sentiment = dict(conn.execute(
+                "SELECT sentiment, SUM(count) FROM feedback_day_stats GROUP BY sentiment"
+            ).fetchall())
+            places = conn.execute(
+                """
+                SELECT place, SUM(count) AS count,
+                       SUM(CASE WHEN sentiment = 'Positive' THEN count ELSE 0 END) AS positive,
+                       SUM(CASE WHEN sentiment = 'Negative' THEN count ELSE 0 END) AS negative
+                FROM feedback_place_stats GROUP BY place ORDER BY count DESC, place LIMIT ?
+                """,
+                (top,)
+            ).fetchall()
+            since = _days_ago(days) if days else ""
+            feedback_days = conn.execute(
+                "SELECT day, SUM(count) AS count FROM feedback_day_stats WHERE day >= ? GROUP BY day ORDER BY day",
+                (since,)
+            ).fetchall()
+            trips: Dict[str, List[Dict[str, Any]]] = {}
+            for dimension, value, count in conn.execute(
+                "SELECT dimension, value, count FROM itinerary_stats ORDER BY dimension, count DESC, value"
+            ):
+                trips.setdefault(dimension, []).append({"value": value, "count": count})
+
+        itinerary_days = [d for d in trips.get("day", []) if d["value"] >= since]
+        return {
+            "feedback_total": sum(by_sentiment.values()),
+            "by_sentiment": by_sentiment,
+            "top_places": [dict(row) for row in places],
+            "feedback_per_day": [dict(row) for row in feedback_days],
+            "itinerary_total": sum(d["count"] for d in trips.get("start", [])),
+            "itineraries_per_day": sorted(itinerary_days, key=lambda d: d["value"]),
+            "interests": trips.get("interest", [])[:top],
+            "budgets": trips.get("budget", [])[:top],
+            "trip_lengths": trips.get("days", [])[:top],
+            "start_cities": trips.get("start", [])[:top]
+        }
+
+
+def _days_ago(days: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(time.time() - days * 86400))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Visitor statistics aggregates")
+    parser.add_argument("command", choices=["show", "rebuild"])
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    from .storage import Storage
+    stats = Storage().stats
+    if args.command == "rebuild":
+        result = stats.rebuild()
+        print(f"rebuilt {result['groups']} groups in {result['seconds']}s", file=sys.stderr)
+    else:
+        print(json.dumps(stats.summary(args.top), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,138 @@
 import os
 import sqlite3
 import json
-from typing import Any, List, Dict, Optional, Union
+import base64
+import math
+import re
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Dict, Optional, Union
 # Add to the very top of storage.py
 from pathlib import Path
 import streamlit as st
 from .config import Config
 from .corpus_api import CorpusAPI
+from .async_corpus_api import AsyncCorpusAPI
+from .outbox import Outbox
+from .sync import SyncEngine
+from .images import ImagePipeline
+from .metrics import timed, timer
+from .sentiment import LexiconScorer, SentimentWorker, TransformersScorer
+from .stats import VisitorStats
+from .cache import TTLCache
+from .db import ConnectionManager
+from .decorators import rate_limited
+from .executor import TaskExecutor
 from .validators import Validators
 import logging
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_KM = 6371.0088
+
+# Candidate places for a bounding box through the places R*Tree, with the exact
+# coordinate check; takes (south, north, west, east) twice
+BBOX_JOIN = """
+    FROM places_rtree r JOIN places p ON p.rowid = r.id
+    WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ?
+      AND p.lat BETWEEN ? AND ? AND p.lon BETWEEN ? AND ?
+"""
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
 class Storage:
+    # Shared across Storage instances: Streamlit rebuilds them on every rerun
+    _cache: Optional[TTLCache] = None
+
+    # Map clusters are precomputed for these zoom levels; cells are a quarter of a map tile
+    GRID_MIN_ZOOM = 3
+    GRID_MAX_ZOOM = 12
+    GRID_CELLS_PER_TILE = 4
+
+    # Bulk loads drop the two insert triggers and index new rows set-wise instead
+    PLACES_FTS_INSERT_TRIGGER = """
+        CREATE TRIGGER IF NOT EXISTS places_fts_insert AFTER INSERT ON places BEGIN
+            INSERT INTO places_fts (rowid, name, description, district)
+            VALUES (new.rowid, new.name, new.description, new.district);
+        END
+    """
+    _GRID_ADD = """
+        INSERT INTO place_grid (zoom, gy, gx, count, sum_lat, sum_lon)
+        SELECT zoom, CAST((new.lat + 90.0) / cell AS INTEGER), CAST((new.lon + 180.0) / cell AS INTEGER),
+               1, new.lat, new.lon
+        FROM place_grid_levels WHERE new.lat IS NOT NULL AND new.lon IS NOT NULL
+        ON CONFLICT (zoom, gy, gx) DO UPDATE SET
+            count = count + 1, sum_lat = sum_lat + excluded.sum_lat, sum_lon = sum_lon + excluded.sum_lon;
+    """
+    _GRID_OLD_CELLS = """(zoom, gy, gx) IN (
+        SELECT zoom, CAST((old.lat + 90.0) / cell AS INTEGER), CAST((old.lon + 180.0) / cell AS INTEGER)
+        FROM place_grid_levels
+    )"""
+    _GRID_REMOVE = f"""
+        UPDATE place_grid SET count = count - 1, sum_lat = sum_lat - old.lat, sum_lon = sum_lon - old.lon
+        WHERE old.lat IS NOT NULL AND old.lon IS NOT NULL AND {_GRID_OLD_CELLS};
+        DELETE FROM place_grid WHERE count <= 0 AND {_GRID_OLD_CELLS};
+    """
+    PLACES_RTREE_INSERT_TRIGGER = f"""
+        CREATE TRIGGER IF NOT EXISTS places_rtree_insert AFTER INSERT ON places
+        WHEN new.lat IS NOT NULL AND new.lon IS NOT NULL BEGIN
+            INSERT INTO places_rtree VALUES (new.rowid, new.lat, new.lat, new.lon, new.lon);
+            {_GRID_ADD}
+        END
+    """
+
     def __init__(self):
         self.config = Config.get_app_config()
         self.api = CorpusAPI() if Config.get_corpus_config()['use_api'] else None
         self._init_local_storage()
+        if Storage._cache is None:
+            Storage._cache = TTLCache(
+                ttl=self.config['cache_ttl'],
+                stale_ttl=self.config['cache_stale_ttl'],
+                max_entries=self.config['cache_max_entries']
+            )
+        self.images = ImagePipeline(
+            Path(self.config['data_dir']) / 'images',
+            widths=self.config['image_widths'],
+            formats=self.config['image_formats'],
+            quality=self.config['image_quality'],
+            max_size=self.config['max_file_size'],
+            executor=TaskExecutor.shared()
+        )
+        self.outbox = self._init_outbox()
+        self.sync = self._init_sync()
+        self.sentiment = self._init_sentiment()
+        self.stats = VisitorStats(self.db)
+        self._semantic = None
+
+    @property
+    def semantic(self):
+        """Embedding index for semantic search, or None when disabled; numpy loads on first use"""
+        if self._semantic is None and self.config['semantic_search']:
+            from .semantic_index import EmbeddingIndex
+            self._semantic = EmbeddingIndex.for_dir(
+                Path(self.config['data_dir']) / 'embeddings',
+                model_name=Config.get_ai_config()['embedding_model'],
+                ann_threshold=self.config['ann_threshold']
+            )
+        return self._semantic
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the shared read cache"""
+        return self._cache.stats()
 
     def _init_local_storage(self):
         """Initialize local storage directory and database"""
         os.makedirs(self.config['data_dir'], exist_ok=True)
         self.db_path = Path(self.config['data_dir']) / 'app.db'
+        self.db = ConnectionManager.for_path(self.db_path, **self.config['sqlite'])
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS places (
                     id TEXT PRIMARY KEY,
@@ -38,6 +147,19 @@ class Storage:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            self._ensure_column(conn, 'places', 'thumbnails', 'TEXT')
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_places_filter
+                ON places (district, category, season, name, id)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_places_category
+                ON places (category, name, id)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_places_name
+                ON places (name, id)
+            """)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS feedback (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -47,6 +169,17 @@ class Storage:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            self._ensure_column(conn, 'feedback', 'remote_id', 'TEXT')
+            conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_remote_id
+                ON feedback (remote_id)
+            """)
+            self._ensure_column(conn, 'feedback', 'sentiment_score', 'REAL')
+            self._ensure_column(conn, 'feedback', 'scored_at', 'REAL')
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_feedback_unscored
+                ON feedback (id) WHERE scored_at IS NULL
+            """)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS itineraries (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -58,6 +191,246 @@ class Storage:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            self._init_search_index(conn)
+            self._init_spatial_index(conn)
+
+    @staticmethod
+    def _ensure_column(conn: sqlite3.Connection, table: str, column: str, declaration: str):
+        """Add a column to a table created by an older version of the schema"""
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+    def _init_sync(self) -> Optional[SyncEngine]:
+        """Delta sync of Corpus collections into the local tables; reads then come from the mirror"""
+        corpus = Config.get_corpus_config()
+        if self.api is None or not corpus['sync']:
+            return None
+        return SyncEngine.for_path(
+            self.db_path,
+            self.api,
+            sqlite=self.config['sqlite'],
+            interval_seconds=corpus['sync_interval_seconds'],
+            since_param=corpus['sync_since_param'],
+            on_change=lambda collection: Storage._cache and Storage._cache.invalidate(collection)
+        )
+
+    def _init_sentiment(self) -> SentimentWorker:
+        """Background scorer that fills in feedback sentiment after it is saved"""
+        ai = Config.get_ai_config()
+        model = ai['sentiment_model']
+        worker = SentimentWorker.for_path(
+            self.db_path,
+            lambda: TransformersScorer(model, batch_size=ai['sentiment_batch_size']) if model else LexiconScorer(),
+            sqlite=self.config['sqlite'],
+            batch_size=ai['sentiment_batch_size'],
+            poll_seconds=ai['sentiment_poll_seconds'],
+            on_change=lambda: Storage._cache and Storage._cache.invalidate('feedback')
+        )
+        if ai['sentiment_worker']:
+            worker.start()
+        return worker
+
+    def visitor_stats(self, top: int = 10, days: Optional[int] = 30) -> Dict[str, Any]:
+        """Dashboard aggregates read from the precomputed stats tables"""
+        return self.stats.summary(top, days)
+
+    def sentiment_stats(self) -> Dict[str, Any]:
+        """Unscored backlog, scoring throughput and the model in use"""
+        return self.sentiment.stats()
+
+    def sync_status(self) -> Dict[str, Dict[str, Any]]:
+        """Mirror lag and transfer totals per collection; empty without a sync engine"""
+        return self.sync.status() if self.sync is not None else {}
+
+    def _init_spatial_index(self, conn: sqlite3.Connection):
+        """R*Tree over place coordinates plus per-zoom cluster counts, kept in sync by triggers"""
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('places_rtree', 'place_grid')"
+        )}
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS places_rtree USING rtree(
+                id, min_lat, max_lat, min_lon, max_lon
+            )
+        """)
+        # One row per occupied grid cell per zoom level
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS place_grid_levels (
+                zoom INTEGER PRIMARY KEY,
+                cell REAL NOT NULL
+            )
+        """)
+        conn.executemany(
+            "INSERT OR IGNORE INTO place_grid_levels (zoom, cell) VALUES (?, ?)",
+            [(z, self._grid_cell(z)) for z in range(self.GRID_MIN_ZOOM, self.GRID_MAX_ZOOM + 1)]
+        )
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS place_grid (
+                zoom INTEGER NOT NULL,
+                gy INTEGER NOT NULL,
+                gx INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                sum_lat REAL NOT NULL,
+                sum_lon REAL NOT NULL,
+                PRIMARY KEY (zoom, gy, gx)
+            ) WITHOUT ROWID
+        """)
+        conn.executescript(f"""
+            {self.PLACES_RTREE_INSERT_TRIGGER};
+            CREATE TRIGGER IF NOT EXISTS places_rtree_update AFTER UPDATE OF lat, lon ON places
+            WHEN old.lat IS NOT new.lat OR old.lon IS NOT new.lon BEGIN
+                DELETE FROM places_rtree WHERE id = old.rowid;
+                INSERT INTO places_rtree
+                SELECT new.rowid, new.lat, new.lat, new.lon, new.lon
+                WHERE new.lat IS NOT NULL AND new.lon IS NOT NULL;
+                {self._GRID_REMOVE}
+                {self._GRID_ADD}
+            END;
+            CREATE TRIGGER IF NOT EXISTS places_rtree_delete AFTER DELETE ON places BEGIN
+                DELETE FROM places_rtree WHERE id = old.rowid;
+                {self._GRID_REMOVE}
+            END;
+        """)
+        # Backfill rows written before the indexes existed
+        if 'places_rtree' not in existing:
+            conn.execute("""
+                INSERT INTO places_rtree
+                SELECT rowid, lat, lat, lon, lon FROM places WHERE lat IS NOT NULL AND lon IS NOT NULL
+            """)
+        if 'place_grid' not in existing:
+            self._grid_add_rows(conn, 0)
+
+    @staticmethod
+    def _grid_add_rows(conn: sqlite3.Connection, after_rowid: int):
+        """Count places with rowid > after_rowid into the cluster grid in one statement"""
+        conn.execute(
+            """
+            INSERT INTO place_grid (zoom, gy, gx, count, sum_lat, sum_lon)
+            SELECT zoom, CAST((lat + 90.0) / cell AS INTEGER) AS gy, CAST((lon + 180.0) / cell AS INTEGER) AS gx,
+                   COUNT(*), SUM(lat), SUM(lon)
+            FROM places, place_grid_levels
+            WHERE places.rowid > ? AND lat IS NOT NULL AND lon IS NOT NULL
+            GROUP BY zoom, gy, gx
+            ON CONFLICT (zoom, gy, gx) DO UPDATE SET
+                count = count + excluded.count, sum_lat = sum_lat + excluded.sum_lat,
+                sum_lon = sum_lon + excluded.sum_lon
+            """,
+            (after_rowid,)
+        )
+
+    @contextmanager
+    def deferred_place_indexing(self, conn: sqlite3.Connection) -> Iterator[None]:
+        """Inside a transaction, index rows inserted in the block set-wise instead of per row.
+
+        The per-row FTS and spatial insert triggers are dropped for the block
+        and recreated afterwards. The drop happens inside a write transaction
+        (BEGIN IMMEDIATE when none is open yet), so other connections wait on
+        the lock instead of writing while the triggers are missing, and a
+        rollback restores them. If the block raises, the triggers are
+        recreated before the error propagates in case the caller commits
+        anyway. Updates still go through the update triggers.
+        """
+        if not conn.in_transaction:
+            # sqlite3 only opens a transaction before DML; DROP TRIGGER alone would autocommit
+            conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DROP TRIGGER IF EXISTS places_fts_insert")
+        conn.execute("DROP TRIGGER IF EXISTS places_rtree_insert")
+        high_water = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM places").fetchone()[0]
+        try:
+            yield
+        except BaseException:
+            try:
+                conn.execute(self.PLACES_FTS_INSERT_TRIGGER)
+                conn.execute(self.PLACES_RTREE_INSERT_TRIGGER)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to restore place index triggers: {str(e)}")
+            raise
+        conn.execute(
+            """
+            INSERT INTO places_fts (rowid, name, description, district)
+            SELECT rowid, name, description, district FROM places WHERE rowid > ?
+            """,
+            (high_water,)
+        )
+        conn.execute(
+            """
+            INSERT INTO places_rtree
+            SELECT rowid, lat, lat, lon, lon FROM places
+            WHERE rowid > ? AND lat IS NOT NULL AND lon IS NOT NULL
+            """,
+            (high_water,)
+        )
+        self._grid_add_rows(conn, high_water)
+        conn.execute(self.PLACES_FTS_INSERT_TRIGGER)
+        conn.execute(self.PLACES_RTREE_INSERT_TRIGGER)
+
+    def _init_outbox(self) -> Optional[Outbox]:
+        """Write-behind queue for Corpus writes; None when writes go straight to the API"""
+        corpus = Config.get_corpus_config()
+        if self.api is None or not corpus['write_behind']:
+            return None
+        outbox = Outbox.for_path(
+            self.db_path,
+            sqlite=self.config['sqlite'],
+            batch_size=corpus['outbox_batch_size'],
+            max_attempts=corpus['outbox_max_attempts'],
+            poll_seconds=corpus['outbox_poll_seconds']
+        )
+        if corpus['outbox_worker']:
+            outbox.start(self.api)
+        return outbox
+
+    def _init_search_index(self, conn: sqlite3.Connection):
+        """Create FTS5 indexes over places and feedback, kept in sync by triggers"""
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('places_fts', 'feedback_fts')"
+        )}
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+                name, description, district,
+                content='places', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS feedback_fts USING fts5(
+                feedback,
+                content='feedback', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        conn.execute(self.PLACES_FTS_INSERT_TRIGGER)
+        conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS places_fts_delete AFTER DELETE ON places BEGIN
+                INSERT INTO places_fts (places_fts, rowid, name, description, district)
+                VALUES ('delete', old.rowid, old.name, old.description, old.district);
+            END;
+            CREATE TRIGGER IF NOT EXISTS places_fts_update AFTER UPDATE ON places BEGIN
+                INSERT INTO places_fts (places_fts, rowid, name, description, district)
+                VALUES ('delete', old.rowid, old.name, old.description, old.district);
+                INSERT INTO places_fts (rowid, name, description, district)
+                VALUES (new.rowid, new.name, new.description, new.district);
+            END;
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_insert AFTER INSERT ON feedback BEGIN
+                INSERT INTO feedback_fts (rowid, feedback) VALUES (new.id, new.feedback);
+            END;
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_delete AFTER DELETE ON feedback BEGIN
+                INSERT INTO feedback_fts (feedback_fts, rowid, feedback) VALUES ('delete', old.id, old.feedback);
+            END;
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_update AFTER UPDATE OF feedback ON feedback BEGIN
+                INSERT INTO feedback_fts (feedback_fts, rowid, feedback) VALUES ('delete', old.id, old.feedback);
+                INSERT INTO feedback_fts (rowid, feedback) VALUES (new.id, new.feedback);
+            END;
+        """)
+        # Backfill rows written before the index existed
+        if 'places_fts' not in existing:
+            conn.execute("INSERT INTO places_fts (places_fts) VALUES ('rebuild')")
+        if 'feedback_fts' not in existing:
+            conn.execute("INSERT INTO feedback_fts (feedback_fts) VALUES ('rebuild')")
+
+    def _api_available(self) -> bool:
+        """Use the API only while its circuit is closed, so known outages fall back immediately"""
+        return self.api is not None and self.api.available()
 
     def _normalize_api_response(self, response: Union[Dict, List]) -> List[Dict[str, Any]]:
         """Normalize different API response formats"""
@@ -70,13 +443,21 @@ class Storage:
         return []
 
     def load_places(self, token: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Load places from API or local storage"""
-        if self.api:
+        """Load places through the read cache"""
+        return list(self._cache.get_or_load(('places', token), lambda: self._fetch_places(token)))
+
+    def _fetch_places(self, token: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Load places from the synced mirror, the API or local storage"""
+        if self.sync is not None:
+            self.sync.ensure_fresh('places', token)
+            return self._load_local_places()
+        if self._api_available():
             try:
-                response = self.api.api_get(
-                    Config.get_corpus_config()['endpoints']['places'],
-                    token=token
-                )
+                with timer("storage", op="load_places", source="api"):
+                    response = self.api.api_get(
+                        Config.get_corpus_config()['endpoints']['places'],
+                        token=token
+                    )
                 return self._normalize_api_response(response)
             except Exception as e:
                 logger.error(f"API Error: {str(e)}")
@@ -84,11 +465,68 @@ class Storage:
                 return self._load_local_places()
         return self._load_local_places()
 
+    def load_collections(self, collections: List[str], token: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Load several collections concurrently from API or local storage"""
+        local_loaders = {
+            'places': self._load_local_places,
+            'feedback': self._load_local_feedback
+        }
+        fetchers = {
+            'places': self._fetch_places,
+            'feedback': self._fetch_feedback
+        }
+        unknown = [name for name in collections if name not in local_loaders]
+        if unknown:
+            raise ValueError(f"Unknown collections: {', '.join(unknown)}")
+
+        results = {}
+        missing = []
+        for name in collections:
+            cached = self._cache.get((name, token))
+            if cached is not None:
+                results[name] = list(cached)
+            else:
+                missing.append(name)
+
+        if self.sync is not None:
+            for name in missing:
+                results[name] = self._store_cached(name, token, fetchers[name](token), fetchers[name])
+            return results
+
+        if not self._api_available():
+            for name in missing:
+                results[name] = self._store_cached(name, token, local_loaders[name](), fetchers[name])
+            return results
+
+        generations = {name: self._cache.generation(name) for name in missing}
+        endpoints = Config.get_corpus_config()['endpoints']
+        client = AsyncCorpusAPI(self.api)
+        responses = client.run_sync(client.gather(
+            *(client.api_get(endpoints[name], token=token) for name in missing),
+            return_exceptions=True
+        ))
+
+        for name, response in zip(missing, responses):
+            if isinstance(response, Exception):
+                logger.error(f"API Error: {str(response)}")
+                st.error(f"Failed to load {name} from API. Using local data.")
+                data = local_loaders[name]()
+            else:
+                data = self._normalize_api_response(response)
+            results[name] = self._store_cached(name, token, data, fetchers[name], generations.get(name))
+        return results
+
+    def _store_cached(self, collection: str, token: Optional[str], data: List[Dict[str, Any]],
+                      fetcher, generation: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Put a freshly loaded collection into the read cache"""
+        self._cache.set((collection, token), data, loader=lambda: fetcher(token), generation=generation)
+        return list(data)
+
+    @timed("storage", op="load_places", source="sqlite")
     def _load_local_places(self) -> List[Dict[str, Any]]:
         """Load places from local SQLite database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.db.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM places ORDER BY name")
                 return [dict(row) for row in cursor.fetchall()]
@@ -97,34 +535,309 @@ class Storage:
             st.error("Failed to load local places data.")
             return []
 
+    def query_places(self, district: Optional[str] = None, category: Optional[str] = None,
+                     season: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None,
+                     token: Optional[str] = None) -> Dict[str, Any]:
+        """Filtered, keyset-paginated places: {'items': [...], 'next_cursor': ...}"""
+        limit = max(1, min(int(limit), 500))
+        filters = {'district': district, 'category': category, 'season': season}
+        params = {k: v for k, v in filters.items() if v}
+        params['limit'] = limit
+        if cursor:
+            params['cursor'] = cursor
+
+        key = ('places', token, tuple(sorted(params.items())))
+        page = self._cache.get_or_load(key, lambda: self._fetch_place_page(params, token))
+        return {'items': list(page['items']), 'next_cursor': page['next_cursor']}
+
+    def _fetch_place_page(self, params: Dict[str, Any], token: Optional[str] = None) -> Dict[str, Any]:
+        """Query a page of places from the synced mirror, the API or local storage"""
+        if self.sync is not None:
+            self.sync.ensure_fresh('places', token)
+            return self._query_local_places(**params)
+        if self._api_available():
+            try:
+                with timer("storage", op="query_places", source="api"):
+                    response = self.api.api_get(
+                        Config.get_corpus_config()['endpoints']['places'],
+                        token=token,
+                        params=params
+                    )
+                next_cursor = None
+                if isinstance(response, dict):
+                    next_cursor = response.get('next_cursor') or response.get('next') or response.get('cursor')
+                return {'items': self._normalize_api_response(response), 'next_cursor': next_cursor}
+            except Exception as e:
+                logger.error(f"API Error: {str(e)}")
+                st.error("Failed to query places from API. Using local data.")
+        return self._query_local_places(**params)
+
+    @staticmethod
+    def _encode_cursor(name: str, place_id: str) -> str:
+        return base64.urlsafe_b64encode(json.dumps([name, place_id]).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> List[str]:
+        try:
+            name, place_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return [name, place_id]
+        except Exception:
+            raise ValueError("Invalid pagination cursor")
+
+    @timed("storage", op="query_places", source="sqlite")
+    def _query_local_places(self, district: Optional[str] = None, category: Optional[str] = None,
+                            season: Optional[str] = None, limit: int = 50,
+                            cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Filter and paginate places in SQLite using the (name, id) keyset"""
+        clauses, args = [], []
+        if district:
+            clauses.append("district = ?")
+            args.append(district)
+        if category:
+            clauses.append("category = ?")
+            args.append(category)
+        if season:
+            # Places tagged 'All' are open in every season
+            clauses.append("season IN (?, 'All')")
+            args.append(season)
+        if cursor:
+            clauses.append("(name, id) > (?, ?)")
+            args.extend(self._decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        try:
+            with self.db.connection() as conn:
+                rows = conn.execute(
+                    f"SELECT * FROM places {where} ORDER BY name, id LIMIT ?",
+                    (*args, limit + 1)
+                ).fetchall()
+        except Exception as e:
+            logger.error(f"Local storage error: {str(e)}")
+            st.error("Failed to query local places data.")
+            return {'items': [], 'next_cursor': None}
+
+        items = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = self._encode_cursor(last['name'], last['id'])
+        return {'items': items, 'next_cursor': next_cursor}
+
+    # R*Tree stores 32-bit floats with outward rounding, so the join re-checks exact coordinates
+    @timed("storage", op="places_in_bbox", source="sqlite")
+    def places_in_bbox(self, south: float, west: float, north: float, east: float,
+                       category: Optional[str] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        """Places whose coordinates fall inside a bounding box"""
+        args = [south, north, west, east, south, north, west, east]
+        extra = ""
+        if category:
+            extra = " AND p.category = ?"
+            args.append(category)
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                f"SELECT p.* {BBOX_JOIN}{extra} ORDER BY p.name, p.id LIMIT ?",
+                (*args, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    @timed("storage", op="places_within_radius", source="sqlite")
+    def places_within_radius(self, lat: float, lon: float, radius_km: float,
+                             limit: int = 50) -> List[Dict[str, Any]]:
+        """Places within radius_km of a point, nearest first, each with `distance_km`"""
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                f"SELECT p.* {BBOX_JOIN}",
+                (lat - dlat, lat + dlat, lon - dlon, lon + dlon) * 2
+            ).fetchall()
+        hits = []
+        for row in rows:
+            distance = haversine_km(lat, lon, row['lat'], row['lon'])
+            if distance <= radius_km:
+                hits.append({**dict(row), 'distance_km': round(distance, 3)})
+        hits.sort(key=lambda place: place['distance_km'])
+        return hits[:limit]
+
+    @classmethod
+    def _grid_cell(cls, zoom: int) -> float:
+        """Cluster cell size in degrees at a zoom level"""
+        return 360.0 / (2 ** zoom) / cls.GRID_CELLS_PER_TILE
+
+    @timed("storage", op="map_markers", source="sqlite")
+    def map_markers(self, south: float, west: float, north: float, east: float, zoom: int,
+                    max_markers: int = 200) -> Dict[str, Any]:
+        """Markers for a map viewport, capped at `max_markers` whatever the place count.
+
+        Up to zoom GRID_MAX_ZOOM clusters come from the trigger-maintained
+        `place_grid` table, so the work depends on the cells in view rather than
+        the places; closer in, the viewport is small enough to cluster on the
+        fly. Returns {'total', 'markers': [...], 'clusters': [{'lat', 'lon', 'count'}]}.
+        """
+        zoom = int(zoom)
+        bbox = (south, north, west, east) * 2
+        with self.db.connection() as conn:
+            if zoom > self.GRID_MAX_ZOOM:
+                total = conn.execute(f"SELECT COUNT(*) {BBOX_JOIN}", bbox).fetchone()[0]
+            else:
+                level = max(zoom, self.GRID_MIN_ZOOM)
+                while True:
+                    cell = self._grid_cell(level)
+                    cells = conn.execute(
+                        """
+                        SELECT count, sum_lat / count AS lat, sum_lon / count AS lon FROM place_grid
+                        WHERE zoom = ? AND gy BETWEEN ? AND ? AND gx BETWEEN ? AND ?
+                        """,
+                        (level, int((south + 90) / cell), int((north + 90) / cell),
+                         int((west + 180) / cell), int((east + 180) / cell))
+                    ).fetchall()
+                    if len(cells) <= max_markers or level == self.GRID_MIN_ZOOM:
+                        break
+                    level -= 1
+                # Edge cells may reach past the viewport, so this is an upper bound
+                total = sum(row['count'] for row in cells)
+                if total > max_markers:
+                    return {
+                        'total': total,
+                        'markers': [],
+                        'clusters': [dict(row) for row in cells]
+                    }
+
+            if total <= max_markers:
+                rows = conn.execute(
+                    f"SELECT p.id, p.name, p.category, p.lat, p.lon {BBOX_JOIN}", bbox
+                ).fetchall()
+                return {'total': len(rows), 'markers': [dict(row) for row in rows], 'clusters': []}
+
+            cell = self._grid_cell(zoom)
+            while True:
+                groups = conn.execute(
+                    f"""
+                    SELECT COUNT(*) AS count, AVG(p.lat) AS lat, AVG(p.lon) AS lon
+                    {BBOX_JOIN}
+                    GROUP BY CAST((p.lat + 90.0) / ? AS INTEGER), CAST((p.lon + 180.0) / ? AS INTEGER)
+                    """,
+                    (*bbox, cell, cell)
+                ).fetchall()
+                if len(groups) <= max_markers:
+                    break
+                cell *= 2
+        return {'total': total, 'markers': [], 'clusters': [dict(row) for row in groups]}
+
+    @rate_limited("write")
     def save_place(self, place: Dict[str, Any], token: Optional[str] = None) -> Dict[str, Any]:
-        """Save place to API or local storage"""
+        """Save place locally and queue it for Corpus, or post it directly without an outbox"""
         Validators.validate_place_data(place)
-        
-        if self.api:
+
+        if self.outbox is not None:
+            with self.db.connection() as conn:
+                result = self._save_local_place(place)
+                self.outbox.enqueue(conn, 'places', place, token)
+            self.outbox.notify()
+        elif self._api_available():
             try:
-                return self.api.api_post(
-                    Config.get_corpus_config()['endpoints']['places'],
-                    data=place,
-                    token=token
-                )
+                with timer("storage", op="save_place", source="api"):
+                    result = self.api.api_post(
+                        Config.get_corpus_config()['endpoints']['places'],
+                        data=place,
+                        token=token
+                    )
             except Exception as e:
                 logger.error(f"API Error: {str(e)}")
                 st.error("Failed to save place to API. Saving locally.")
-                return self._save_local_place(place)
-        return self._save_local_place(place)
+                result = self._save_local_place(place)
+        else:
+            result = self._save_local_place(place)
+
+        self._cache.invalidate('places')
+        self._index_places([place])
+        return result
+
+    def attach_image(self, place_id: str, file: Union[bytes, str]) -> Dict[str, Any]:
+        """Store thumbnails for an uploaded image and point the place at them"""
+        manifest = self.images.ingest(file)
+        reference = {key: manifest[key] for key in ('hash', 'widths', 'formats')}
+        with self.db.connection() as conn:
+            updated = conn.execute(
+                "UPDATE places SET thumbnails = ? WHERE id = ?",
+                (json.dumps(reference), place_id)
+            ).rowcount
+        if not updated:
+            raise ValueError(f"Unknown place: {place_id}")
+        self._cache.invalidate('places')
+        return manifest
+
+    def thumbnail_path(self, place: Dict[str, Any], width: int = 320, fmt: str = 'webp') -> Optional[Path]:
+        """Local thumbnail file for a place card, or None if no image was attached"""
+        if not place.get('thumbnails'):
+            return None
+        reference = json.loads(place['thumbnails'])
+        if fmt not in reference['formats']:
+            fmt = reference['formats'][0]
+        return self.images.path(reference, width, fmt)
+
+    @staticmethod
+    def _place_id(place: Dict[str, Any]) -> str:
+        return place.get('id', place['name'].lower().replace(' ', '-'))
+
+    def _index_places(self, places: List[Dict[str, Any]]):
+        """Embed places into the semantic index; failures never block the save"""
+        if self.semantic is None:
+            return
+        try:
+            self.semantic.upsert([
+                (
+                    self._place_id(place),
+                    f"{place['name']}. {place.get('category', '')} in {place.get('district', '')}. "
+                    f"{place.get('description', '')}"
+                )
+                for place in places
+            ])
+        except Exception as e:
+            logger.warning(f"Semantic indexing skipped: {str(e)}")
 
+    @timed("storage", op="semantic_search", source="index")
+    def semantic_search(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Places whose descriptions are closest in meaning to the query"""
+        if self.semantic is None or not query.strip():
+            return []
+        try:
+            matches = self.semantic.search(query, k)
+        except Exception as e:
+            logger.error(f"Semantic search error: {str(e)}")
+            st.error("Semantic search is temporarily unavailable.")
+            return []
+        if not matches:
+            return []
+
+        ids = [place_id for place_id, _ in matches]
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM places WHERE id IN ({', '.join('?' * len(ids))})", ids
+            ).fetchall()
+        by_id = {row['id']: dict(row) for row in rows}
+        return [
+            {**by_id[place_id], 'similarity': round(score, 4)}
+            for place_id, score in matches if place_id in by_id
+        ]
+
+    @timed("storage", op="save_place", source="sqlite")
     def _save_local_place(self, place: Dict[str, Any]) -> Dict[str, Any]:
         """Save place to local SQLite database"""
         try:
-            place_id = place.get('id', place['name'].lower().replace(' ', '-'))
-            
-            with sqlite3.connect(self.db_path) as conn:
+            place_id = self._place_id(place)
+
+            with self.db.connection() as conn:
                 conn.execute(
                     """
-                    INSERT OR REPLACE INTO places 
+                    INSERT INTO places
                     (id, name, district, category, season, description, lat, lon, image_url)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        name = excluded.name, district = excluded.district,
+                        category = excluded.category, season = excluded.season,
+                        description = excluded.description, lat = excluded.lat,
+                        lon = excluded.lon, image_url = excluded.image_url
                     """,
                     (
                         place_id,
@@ -143,14 +856,68 @@ class Storage:
             logger.error(f"Local storage error: {str(e)}")
             raise ValueError(f"Failed to save place locally: {str(e)}")
 
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Turn free text into an FTS5 prefix query, one quoted term per word"""
+        terms = re.findall(r"\w+", query or "", re.UNICODE)
+        return " ".join(f'"{term}"*' for term in terms)
+
+    @timed("storage", op="search", source="sqlite")
+    def search(self, query: str, scopes: tuple = ('places', 'feedback'), limit: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+        """Full-text search of the local store, best BM25 matches first.
+
+        Every word is prefix-matched and all must appear. Each hit carries a
+        `score` (lower is better) and a `snippet` with matches in **bold**.
+        """
+        match = self._fts_query(query)
+        results = {scope: [] for scope in scopes}
+        if not match:
+            return results
+
+        statements = {
+            'places': """
+                SELECT p.*, bm25(places_fts, 10.0, 1.0, 3.0) AS score,
+                       snippet(places_fts, -1, '**', '**', '…', 12) AS snippet
+                FROM places_fts JOIN places p ON p.rowid = places_fts.rowid
+                WHERE places_fts MATCH ? ORDER BY score LIMIT ?
+            """,
+            'feedback': """
+                SELECT f.*, bm25(feedback_fts) AS score,
+                       snippet(feedback_fts, 0, '**', '**', '…', 12) AS snippet
+                FROM feedback_fts JOIN feedback f ON f.id = feedback_fts.rowid
+                WHERE feedback_fts MATCH ? ORDER BY score LIMIT ?
+            """
+        }
+        unknown = [scope for scope in scopes if scope not in statements]
+        if unknown:
+            raise ValueError(f"Unknown search scopes: {', '.join(unknown)}")
+
+        try:
+            with self.db.connection() as conn:
+                for scope in scopes:
+                    rows = conn.execute(statements[scope], (match, limit)).fetchall()
+                    results[scope] = [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Search error: {str(e)}")
+            st.error("Search is temporarily unavailable.")
+        return results
+
     def load_feedback(self, token: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Load feedback from API or local storage"""
-        if self.api:
+        """Load feedback through the read cache"""
+        return list(self._cache.get_or_load(('feedback', token), lambda: self._fetch_feedback(token)))
+
+    def _fetch_feedback(self, token: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Load feedback from the synced mirror, the API or local storage"""
+        if self.sync is not None:
+            self.sync.ensure_fresh('feedback', token)
+            return self._load_local_feedback()
+        if self._api_available():
             try:
-                response = self.api.api_get(
-                    Config.get_corpus_config()['endpoints']['feedback'],
-                    token=token
-                )
+                with timer("storage", op="load_feedback", source="api"):
+                    response = self.api.api_get(
+                        Config.get_corpus_config()['endpoints']['feedback'],
+                        token=token
+                    )
                 return self._normalize_api_response(response)
             except Exception as e:
                 logger.error(f"API Error: {str(e)}")
@@ -158,11 +925,11 @@ class Storage:
                 return self._load_local_feedback()
         return self._load_local_feedback()
 
+    @timed("storage", op="load_feedback", source="sqlite")
     def _load_local_feedback(self) -> List[Dict[str, Any]]:
         """Load feedback from local SQLite database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.db.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM feedback ORDER BY created_at DESC")
                 return [dict(row) for row in cursor.fetchall()]
@@ -170,28 +937,42 @@ class Storage:
             logger.error(f"Local storage error: {str(e)}")
             return []
 
+    @rate_limited("write")
     def save_feedback(self, feedback: Dict[str, Any], token: Optional[str] = None) -> Dict[str, Any]:
-        """Save feedback to API or local storage"""
+        """Save feedback locally and queue it for Corpus, or post it directly without an outbox"""
         if not all(key in feedback for key in ['place', 'feedback']):
             raise ValueError("Feedback must contain 'place' and 'feedback' fields")
-        
-        if self.api:
+
+        if self.outbox is not None:
+            payload = dict(feedback)
+            with self.db.connection() as conn:
+                result = self._save_local_feedback(feedback)
+                self.outbox.enqueue(conn, 'feedback', payload, token)
+            self.outbox.notify()
+        elif self._api_available():
             try:
-                return self.api.api_post(
-                    Config.get_corpus_config()['endpoints']['feedback'],
-                    data=feedback,
-                    token=token
-                )
+                with timer("storage", op="save_feedback", source="api"):
+                    result = self.api.api_post(
+                        Config.get_corpus_config()['endpoints']['feedback'],
+                        data=feedback,
+                        token=token
+                    )
             except Exception as e:
                 logger.error(f"API Error: {str(e)}")
                 st.error("Failed to save feedback to API. Saving locally.")
-                return self._save_local_feedback(feedback)
-        return self._save_local_feedback(feedback)
+                result = self._save_local_feedback(feedback)
+        else:
+            result = self._save_local_feedback(feedback)
+
+        self._cache.invalidate('feedback')
+        self.sentiment.notify()
+        return result
 
+    @timed("storage", op="save_feedback", source="sqlite")
     def _save_local_feedback(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
         """Save feedback to local SQLite database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -210,28 +991,73 @@ class Storage:
             logger.error(f"Local storage error: {str(e)}")
             raise ValueError(f"Failed to save feedback locally: {str(e)}")
 
+    @rate_limited("write")
     def save_itinerary(self, itinerary: Dict[str, Any], token: Optional[str] = None) -> Dict[str, Any]:
-        """Save itinerary to API or local storage"""
+        """Save itinerary locally and queue it for Corpus, or post it directly without an outbox"""
         if not all(key in itinerary for key in ['start', 'days', 'interests', 'budget', 'plan']):
             raise ValueError("Itinerary missing required fields")
-        
-        if self.api:
+
+        if self.outbox is not None:
+            return self._save_queued_itineraries([itinerary], token)[0]
+        if self._api_available():
             try:
-                return self.api.api_post(
-                    Config.get_corpus_config()['endpoints']['itineraries'],
-                    data=itinerary,
-                    token=token
-                )
+                with timer("storage", op="save_itinerary", source="api"):
+                    return self.api.api_post(
+                        Config.get_corpus_config()['endpoints']['itineraries'],
+                        data=itinerary,
+                        token=token
+                    )
             except Exception as e:
                 logger.error(f"API Error: {str(e)}")
                 st.error("Failed to save itinerary to API. Saving locally.")
                 return self._save_local_itinerary(itinerary)
         return self._save_local_itinerary(itinerary)
 
+    @rate_limited("write", batch="itineraries")
+    def save_itineraries(self, itineraries: List[Dict[str, Any]], token: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Save several itineraries, queued for Corpus or posted to the API concurrently"""
+        for itinerary in itineraries:
+            if not all(key in itinerary for key in ['start', 'days', 'interests', 'budget', 'plan']):
+                raise ValueError("Itinerary missing required fields")
+
+        if self.outbox is not None:
+            return self._save_queued_itineraries(itineraries, token)
+        if not self._api_available():
+            return [self._save_local_itinerary(itinerary) for itinerary in itineraries]
+
+        endpoint = Config.get_corpus_config()['endpoints']['itineraries']
+        client = AsyncCorpusAPI(self.api)
+        responses = client.run_sync(client.gather(
+            *(client.api_post(endpoint, data=itinerary, token=token) for itinerary in itineraries),
+            return_exceptions=True
+        ))
+
+        results = []
+        for itinerary, response in zip(itineraries, responses):
+            if isinstance(response, Exception):
+                logger.error(f"API Error: {str(response)}")
+                st.error("Failed to save itinerary to API. Saving locally.")
+                results.append(self._save_local_itinerary(itinerary))
+            else:
+                results.append(response)
+        return results
+
+    def _save_queued_itineraries(self, itineraries: List[Dict[str, Any]], token: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Insert itineraries and their outbox entries in one transaction"""
+        with self.db.connection() as conn:
+            results = []
+            for itinerary in itineraries:
+                payload = dict(itinerary)
+                results.append(self._save_local_itinerary(itinerary))
+                self.outbox.enqueue(conn, 'itineraries', payload, token)
+        self.outbox.notify()
+        return results
+
+    @timed("storage", op="save_itinerary", source="sqlite")
     def _save_local_itinerary(self, itinerary: Dict[str, Any]) -> Dict[str, Any]:
         """Save itinerary to local SQLite database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -0,0 +1,272 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from .corpus_api import CorpusAPI
+from .db import ConnectionManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_records(response: Any) -> List[Dict[str, Any]]:
+    if isinstance(response, list):
+        return response
+    if isinstance(response, dict):
+        for key in ['data', 'items', 'results']:
+            if key in response and isinstance(response[key], list):
+                return response[key]
+    return []
+
+
+def _slug(name: str) -> str:
+    """Id a place gets when saved locally without one (matches Storage._place_id)"""
+    return name.lower().replace(' ', '-')
+
+
+def _place_row(record: Dict[str, Any]) -> Tuple:
+    return (
+        str(record.get('id') or _slug(record['name'])),
+        record['name'],
+        record.get('district'),
+        record.get('category'),
+        record.get('season') or 'All',
+        record.get('description') or '',
+        record.get('lat'),
+        record.get('lon'),
+        record.get('image_url') or ''
+    )
+
+
+class SyncEngine:
+    """Keeps the local SQLite tables a mirror of the Corpus collections.
+
+    Each sync asks only for changes since the stored high-water mark (the
+    largest `updated_at` seen) and sends the last ETag as If-None-Match, so
+    an unchanged collection costs one 304. Changes are upserted with
+    `executemany` in one transaction; records flagged `deleted` are removed.
+    Reads are served from the mirror and a stale collection is refreshed in
+    the background.
+    """
+    COLLECTIONS = ('places', 'feedback')
+
+    _instances: Dict[str, "SyncEngine"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db: ConnectionManager, api: CorpusAPI, interval_seconds: float = 60,
+                 since_param: str = "updated_since",
+                 on_change: Optional[Callable[[str], None]] = None):
+        self.db = db
+        self.api = api
+        self.interval_seconds = interval_seconds
+        self.since_param = since_param
+        self.on_change = on_change
+        self._locks = {name: threading.Lock() for name in self.COLLECTIONS}
+        self._refreshing: Dict[str, threading.Thread] = {}
+        self._refresh_lock = threading.Lock()
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    collection TEXT PRIMARY KEY,
+                    high_water TEXT,
+                    etag TEXT,
+                    last_synced_at REAL,
+                    last_attempt_at REAL,
+                    last_error TEXT,
+                    syncs INTEGER NOT NULL DEFAULT 0,
+                    rows_total INTEGER NOT NULL DEFAULT 0,
+                    bytes_total INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    @classmethod
+    def for_path(cls, db_path: Union[str, Path], api: CorpusAPI, sqlite: Optional[Dict[str, Any]] = None,
+                 **settings) -> "SyncEngine":
+        """Process-wide engine for a database file"""
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            engine = cls._instances.get(key)
+            if engine is None:
+                engine = cls(ConnectionManager.for_path(db_path, **(sqlite or {})), api, **settings)
+                cls._instances[key] = engine
+            return engine
+
+    @classmethod
+    def reset_all(cls):
+        """Forget every engine (tests and config reloads)"""
+        with cls._instances_lock:
+            cls._instances.clear()
+
+    def _state(self, collection: str) -> Dict[str, Any]:
+        with self.db.connection() as conn:
+            row = conn.execute("SELECT * FROM sync_state WHERE collection = ?", (collection,)).fetchone()
+        return dict(row) if row else {'collection': collection}
+
+    def sync(self, collection: str, token: Optional[str] = None) -> Dict[str, Any]:
+        """Pull changes for one collection into the mirror; returns what was applied"""
+        if collection not in self.COLLECTIONS:
+            raise ValueError(f"Unknown collection: {collection}")
+
+        with self._locks[collection]:
+            state = self._state(collection)
+            params = {self.since_param: state['high_water']} if state.get('high_water') else None
+            now = time.time()
+            try:
+                result = self.api.api_get_changes(
+                    self.api.config['endpoints'][collection],
+                    token=token,
+                    params=params,
+                    etag=state.get('etag')
+                )
+            except Exception as e:
+                with self.db.connection() as conn:
+                    conn.execute(
+                        """
+                        INSERT INTO sync_state (collection, last_attempt_at, last_error) VALUES (?, ?, ?)
+                        ON CONFLICT(collection) DO UPDATE SET
+                            last_attempt_at = excluded.last_attempt_at, last_error = excluded.last_error
+                        """,
+                        (collection, now, str(e))
+                    )
+                raise
+
+            records = [] if result['data'] is None else _normalize_records(result['data'])
+            high_water = max(
+                [str(r['updated_at']) for r in records if r.get('updated_at')] + [state.get('high_water') or ''],
+            ) or None
+            with self.db.connection() as conn:
+                applied = self._apply(conn, collection, records)
+                conn.execute(
+                    """
+                    INSERT INTO sync_state
+                    (collection, high_water, etag, last_synced_at, last_attempt_at, last_error,
+                     syncs, rows_total, bytes_total)
+                    VALUES (?, ?, ?, ?, ?, NULL, 1, ?, ?)
+                    ON CONFLICT(collection) DO UPDATE SET
+                        high_water = excluded.high_water, etag = excluded.etag,
+                        last_synced_at = excluded.last_synced_at, last_attempt_at = excluded.last_attempt_at,
+                        last_error = NULL, syncs = syncs + 1,
+                        rows_total = rows_total + excluded.rows_total,
+                        bytes_total = bytes_total + excluded.bytes_total
+                    """,
+                    (collection, high_water, result['etag'], now, now, applied['upserted'] + applied['deleted'],
+                     result['bytes'])
+                )
+
+        if (applied['upserted'] or applied['deleted']) and self.on_change:
+            self.on_change(collection)
+        return {'collection': collection, 'status': result['status'], 'bytes': result['bytes'], **applied}
+
+    def _apply(self, conn, collection: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        deleted = [r for r in records if r.get('deleted')]
+        live = [r for r in records if not r.get('deleted')]
+        if collection == 'places':
+            rows = [_place_row(r) for r in live if r.get('name')]
+            # Adopt local rows saved under their slug before Corpus assigned an id
+            conn.executemany(
+                """
+                UPDATE places SET id = ?1
+                WHERE id = ?2 AND name = ?3 AND district IS ?4 AND ?1 != ?2
+                  AND NOT EXISTS (SELECT 1 FROM places WHERE id = ?1)
+                """,
+                [(place_id, _slug(name), name, district) for place_id, name, district, *_ in rows]
+            )
+            conn.executemany(
+                """
+                INSERT INTO places
+                (id, name, district, category, season, description, lat, lon, image_url)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name, district = excluded.district,
+                    category = excluded.category, season = excluded.season,
+                    description = excluded.description, lat = excluded.lat,
+                    lon = excluded.lon, image_url = excluded.image_url
+                """,
+                rows
+            )
+            conn.executemany(
+                "DELETE FROM places WHERE id = ?",
+                [(str(r.get('id') or _slug(r['name'])),) for r in deleted]
+            )
+            return {'upserted': len(rows), 'deleted': len(deleted)}
+
+        rows = [
+            (str(r['id']), r['place'], r['feedback'], r.get('sentiment') or 'Neutral')
+            for r in live if r.get('id') is not None and r.get('place') and r.get('feedback')
+        ]
+        # Adopt local rows written before this device knew their remote id
+        conn.executemany(
+            """
+            UPDATE feedback SET remote_id = ? WHERE id = (
+                SELECT id FROM feedback
+                WHERE remote_id IS NULL AND place = ? AND feedback = ?
+                ORDER BY id LIMIT 1
+            ) AND NOT EXISTS (SELECT 1 FROM feedback WHERE remote_id = ?)
+            """,
+            [(remote_id, place, text, remote_id) for remote_id, place, text, _ in rows]
+        )
+        conn.executemany(
+            """
+            INSERT INTO feedback (remote_id, place, feedback, sentiment) VALUES (?, ?, ?, ?)
+            ON CONFLICT(remote_id) DO UPDATE SET
+                place = excluded.place, feedback = excluded.feedback,
+                -- Keep the local score unless the text changed, which queues it for rescoring
+                sentiment = CASE WHEN feedback.feedback = excluded.feedback AND feedback.scored_at IS NOT NULL
+                                 THEN feedback.sentiment ELSE excluded.sentiment END,
+                sentiment_score = CASE WHEN feedback.feedback = excluded.feedback
+                                       THEN feedback.sentiment_score END,
+                scored_at = CASE WHEN feedback.feedback = excluded.feedback THEN feedback.scored_at END
+            """,
+            rows
+        )
+        conn.executemany(
+            "DELETE FROM feedback WHERE remote_id = ?",
+            [(str(r['id']),) for r in deleted if r.get('id') is not None]
+        )
+        return {'upserted': len(rows), 'deleted': len(deleted)}
+
+    def ensure_fresh(self, collection: str, token: Optional[str] = None):
+        """Sync inline if the mirror was never filled, otherwise refresh in the background when stale"""
+        state = self._state(collection)
+        if not state.get('last_synced_at'):
+            try:
+                self.sync(collection, token)
+            except Exception as e:
+                logger.warning(f"Initial sync of {collection} failed: {str(e)}")
+            return
+        if time.time() - state['last_synced_at'] >= self.interval_seconds and self.api.available():
+            self._refresh_in_background(collection, token)
+
+    def _refresh_in_background(self, collection: str, token: Optional[str]):
+        with self._refresh_lock:
+            thread = self._refreshing.get(collection)
+            if thread and thread.is_alive():
+                return
+
+            def run():
+                try:
+                    self.sync(collection, token)
+                except Exception as e:
+                    logger.warning(f"Background sync of {collection} failed: {str(e)}")
+
+            thread = threading.Thread(target=run, name=f"corpus-sync-{collection}", daemon=True)
+            self._refreshing[collection] = thread
+            thread.start()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-collection lag, transfer totals and last error"""
+        now = time.time()
+        report = {}
+        for collection in self.COLLECTIONS:
+            state = self._state(collection)
+            synced = state.get('last_synced_at')
+            report[collection] = {
+                'high_water': state.get('high_water'),
+                'etag': state.get('etag'),
+                'lag_seconds': round(now - synced, 1) if synced else None,
+                'syncs': state.get('syncs', 0),
+                'rows_total': state.get('rows_total', 0),
+                'bytes_total': state.get('bytes_total', 0),
+                'last_error': state.get('last_error')
+            }
+        return report
@@ -1,9 +1,13 @@
 # utils/validators.py
 import re
-from typing import Optional, Union
-from PIL import Image
+from typing import TYPE_CHECKING, Optional, Union
+import base64
 import io
 
+if TYPE_CHECKING:
+    from PIL import Image
+    from .executor import TaskExecutor
+
 class Validators:
     @staticmethod
     def validate_email(email: str) -> bool:
@@ -27,24 +31,41 @@ class Validators:
         raise ValueError("Invalid contact format - must be email or Indian phone number")
 
     @staticmethod
-    def validate_image(file: Union[bytes, str], max_size: int = 5242880) -> Image.Image:
-        """Validate and process image upload"""
+    def image_bytes(file: Union[bytes, str], max_size: int = 5242880) -> bytes:
+        """Raw bytes of an upload (bytes or base64 data URL), enforcing the size limit"""
         if isinstance(file, str):
             # Handle base64 string
-            header, encoded = file.split(",", 1)
-            file = base64.b64decode(encoded)
+            try:
+                header, encoded = file.split(",", 1)
+                file = base64.b64decode(encoded)
+            except ValueError:
+                raise ValueError("Invalid base64 image data")
         
         if len(file) > max_size:
             raise ValueError(f"Image exceeds maximum size of {max_size//1024//1024}MB")
-        
+        return file
+
+    @staticmethod
+    def decode_image(data: bytes) -> "Image.Image":
+        """Fully decode JPEG or PNG bytes to RGB (picklable, so a worker process can run it)"""
+        from PIL import Image  # deferred: only decoding needs it, not app startup
         try:
-            img = Image.open(io.BytesIO(file))
+            img = Image.open(io.BytesIO(data))
             if img.format not in ['JPEG', 'PNG']:
                 raise ValueError("Only JPEG and PNG images are supported")
             return img.convert('RGB')
         except Exception as e:
             raise ValueError(f"Invalid image file: {str(e)}")
 
+    @staticmethod
+    def validate_image(file: Union[bytes, str], max_size: int = 5242880,
+                       executor: Optional["TaskExecutor"] = None) -> "Image.Image":
+        """Validate and process image upload, decoding in the executor's CPU pool when one is given"""
+        file = Validators.image_bytes(file, max_size)
+        if executor is not None:
+            return executor.run(executor.CPU, Validators.decode_image, file)
+        return Validators.decode_image(file)
+
     @staticmethod
     def validate_place_data(data: dict) -> dict:
         """Validate place submission data"""